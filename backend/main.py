@@ -2,24 +2,44 @@
 FastAPI Sunucu - Sistem Monitoring API
 """
 
-from fastapi import FastAPI, WebSocket, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncio
 import json
-from typing import Dict, List, Any
+import os
+import time
+from typing import Dict, List, Any, Optional
 
 from monitors.gpu_monitor import SystemMonitor
 from monitors.energy_monitor import EnergyCalculator
+from monitors.energy_integrator import EnergyIntegrator
+from monitors.tariff import TariffEngine
 from monitors.port_analyzer import PortAnalyzer
 from monitors.training_tracker import TrainingTracker
+from monitors.job_energy import JobEnergyAccountant
+from monitors.log_tailer import LogTailer
+from monitors.network_monitor import NetworkMonitor
+from services.scheduler import CollectorScheduler, Snapshot
+from services.history import MetricsHistory
+from services.tsdb import TimeSeriesStore
+from services.broadcast_hub import BroadcastHub, Subscriber, TOPIC_SOURCES
+from services.response_cache import ResponseCache
+from services.projection import FieldsMiddleware
+from services.openmetrics import OpenMetricsExporter, CONTENT_TYPE, CONTENT_TYPE_TEXT
+from services.perf import PerfMiddleware, registry as perf
+from services.wire import (
+    JSON, SUBPROTOCOLS, NegotiationMiddleware, WireResponse, encode_frame, negotiate_subprotocol
+)
 
 
 # FastAPI uygulaması
 app = FastAPI(
     title="System Monitor API",
     description="PC/GPU Monitoring, Energy Cost, Port Analysis, Training Tracker",
-    version="1.0.0"
+    version="1.0.0",
+    # Accept başlığına göre JSON / MessagePack / CBOR
+    default_response_class=WireResponse
 )
 
 # CORS
@@ -30,29 +50,195 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(NegotiationMiddleware)
+app.add_middleware(FieldsMiddleware)
+# En dışta: endpoint süreleri encode ve sıkıştırmayı da kapsar
+app.add_middleware(PerfMiddleware)
 
 # Monitor'ları başlat
 system_monitor = SystemMonitor()
 energy_calculator = EnergyCalculator()
 port_analyzer = PortAnalyzer()
-training_tracker = TrainingTracker()
+training_tracker = TrainingTracker(gpu_monitor=system_monitor.gpu_monitor)
+job_energy = JobEnergyAccountant(cpu_tdp_w=energy_calculator.CPU_TDP_W)
+log_tailer = LogTailer()
+network_monitor = NetworkMonitor()
+
+# Collector periyotları (saniye) - endpoint'ler sadece snapshot okur
+COLLECTOR_INTERVALS = {
+    "system": 1,
+    "energy": 1,
+    "ports": 5,
+    "training": 2,
+    "network": 1,
+}
+# Biriken metrik satırlarının diske yazılma periyodu (saniye)
+METRICS_FLUSH_INTERVAL = 10
+
+# HTTP isteğinin ilk snapshot'ı bekleyeceği en uzun süre (saniye); dolarsa 503
+SNAPSHOT_DEADLINE = 2.0
+
+# Kalıcı veri dizini (metrik segmentleri vb.)
+DATA_DIR = os.environ.get(
+    "SYSTEM_MONITOR_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
+METRICS_RETENTION_DAYS = float(os.environ.get("METRICS_RETENTION_DAYS", "30"))
+
+scheduler = CollectorScheduler()
+metrics_history = MetricsHistory()
+metrics_store = TimeSeriesStore(
+    os.path.join(DATA_DIR, "metrics"),
+    retention_days=METRICS_RETENTION_DAYS
+)
+energy_integrator = EnergyIntegrator(os.path.join(DATA_DIR, "energy.json"))
+tariff_engine = TariffEngine(
+    energy_calculator.electricity_price,
+    os.path.join(DATA_DIR, "tariffs.json")
+)
 
-# WebSocket bağlantıları
-active_connections: List[WebSocket] = []
 
-# Basit cache - 3 saniye boyunca aynı veriyi dön
-import time
-_system_cache = {"data": None, "timestamp": 0}
-_cache_duration = 3  # saniye
+def _collect_system() -> Dict[str, Any]:
+    """Sistem + GPU verisini topla"""
+    return system_monitor.to_dict()
+
+
+def _collect_energy() -> Optional[Dict[str, Any]]:
+    """Son sistem snapshot'ından enerji maliyetini hesapla"""
+    system = scheduler.get("system")
+    if system is None:
+        return None
+    # Anlık tahmin ve birikim aktif tarifenin şu anki bandıyla fiyatlanır
+    energy_calculator.set_electricity_price(tariff_engine.current_price(system.timestamp))
+    energy_integrator.add_sample(
+        system.timestamp,
+        energy_calculator.component_powers(system.data),
+        energy_calculator.electricity_price
+    )
+    energy_cost = energy_calculator.calculate_system_cost(system.data)
+    energy_dict = energy_calculator.to_dict(energy_cost)
+    energy_dict["tariff"] = tariff_engine.active
+    energy_dict["measured"] = energy_integrator.to_dict()
+    return energy_dict
+
+
+def _collect_ports() -> Dict[str, Any]:
+    """Port analizini topla"""
+    ports = port_analyzer.analyze_ports()
+    return port_analyzer.to_dict(ports)
+
+
+def _collect_training() -> Dict[str, Any]:
+    """Training job'larını topla, job başına enerjiyi ve log ilerlemesini işle"""
+    jobs = training_tracker.detect_training_processes()
+    log_tailer.update(jobs)
+    system = scheduler.get("system")
+    if system is not None:
+        gpu_powers = {
+            gpu["index"]: gpu["power"]["draw_w"] for gpu in system.data.get("gpus", [])
+        }
+        job_energy.update(
+            time.time(),
+            jobs,
+            training_tracker.gpu_monitor.process_index,
+            gpu_powers,
+            tariff_engine.current_price()
+        )
+    return training_tracker.to_dict(jobs)
+
+
+def _collect_network() -> Dict[str, Any]:
+    """Arayüz başına ağ hızlarını topla"""
+    return network_monitor.to_dict(network_monitor.sample())
+
+
+scheduler.register("system", _collect_system, COLLECTOR_INTERVALS["system"])
+scheduler.register("energy", _collect_energy, COLLECTOR_INTERVALS["energy"])
+scheduler.register("ports", _collect_ports, COLLECTOR_INTERVALS["ports"])
+scheduler.register("training", _collect_training, COLLECTOR_INTERVALS["training"])
+scheduler.register("network", _collect_network, COLLECTOR_INTERVALS["network"])
+
+
+def _system_metrics(system_data: Dict[str, Any]) -> Dict[str, float]:
+    """Sistem snapshot'ından geçmişe yazılacak düz metrikler"""
+    metrics = {
+        "cpu.percent": system_data["cpu"]["percent"],
+        "ram.percent": system_data["ram"]["percent"],
+        "ram.used_gb": system_data["ram"]["used_gb"],
+        "power.total_w": sum(energy_calculator.component_powers(system_data).values()),
+    }
+    for gpu in system_data.get("gpus", []):
+        prefix = f"gpu.{gpu['index']}"
+        metrics[f"{prefix}.utilization"] = gpu["utilization_percent"]
+        metrics[f"{prefix}.temperature"] = gpu["temperature_c"]
+        metrics[f"{prefix}.power_w"] = gpu["power"]["draw_w"]
+        metrics[f"{prefix}.memory_used_mb"] = gpu["memory"]["used_mb"]
+    return metrics
+
+
+def _record_history(snapshot: Snapshot):
+    """Yeni sistem snapshot'larını geçmişe ve kalıcı depoya ekle"""
+    if snapshot.name == "system":
+        metrics = _system_metrics(snapshot.data)
+        metrics_history.record(snapshot.timestamp, metrics)
+        metrics_store.append(snapshot.timestamp, metrics)
+
+
+scheduler.add_listener(_record_history)
+
+# WebSocket yayını: topic frame'leri snapshot başına bir kez serialize edilir
+broadcast_hub = BroadcastHub(scheduler)
+scheduler.add_listener(broadcast_hub.on_snapshot)
+
+# Snapshot'a dayalı GET yanıtları: ETag + versiyon başına bir kez encode/sıkıştırma
+response_cache = ResponseCache()
+
+# Prometheus /metrics: snapshot versiyonu başına bir kez render edilir
+metrics_exporter = OpenMetricsExporter(scheduler)
+
+
+# Snapshot üretmeyen periyodik işler (scheduler durumunda görünmez)
+background_tasks: List[asyncio.Task] = []
+
+
+async def _flush_metrics_store():
+    """Biriken metrik satırlarını periyodik olarak diske yaz"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(metrics_store.flush)
+        except Exception as e:
+            perf.error("flush", "metrics_store")
+            print(f"Metrik deposu yazılamadı: {e}")
 
 
 @app.on_event("startup")
 async def startup_event():
     """Startup event"""
+    perf.install_audit_hook()
+    perf.start()
+    scheduler.start()
+    background_tasks.append(asyncio.create_task(_flush_metrics_store(), name="metrics_store:flush"))
     print("✅ System Monitor API başladı")
     print("📊 Monitoring servisleri hazır")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event"""
+    await scheduler.stop()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await perf.stop()
+    await asyncio.to_thread(metrics_store.close)
+    await asyncio.to_thread(energy_integrator.save)
+    log_tailer.close()
+    if system_monitor.gpu_monitor.backend is not None:
+        system_monitor.gpu_monitor.backend.close()
+
+
 @app.get("/")
 async def root():
     """Ana sayfa"""
@@ -63,87 +249,119 @@ async def root():
         "endpoints": {
             "system": "/api/system",
             "energy": "/api/energy",
+            "tariffs": "/api/energy/tariffs",
+            "energy_cost": "/api/energy/cost",
             "ports": "/api/ports",
             "training": "/api/training",
+            "network": "/api/network",
+            "history": "/api/history",
             "ws": "/ws",
-            "health": "/health"
+            "health": "/health",
+            "metrics": "/metrics",
+            "perf": "/api/debug/perf"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Sağlık kontrolü"""
-    return {"status": "healthy"}
+    """Sağlık kontrolü (collector durumlarıyla)"""
+    return {"status": "healthy", "collectors": scheduler.status()}
+
+
+@app.get("/metrics")
+async def prometheus_metrics(request: Request):
+    """Prometheus / OpenMetrics exposition"""
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    return Response(
+        content=metrics_exporter.render(openmetrics),
+        media_type=CONTENT_TYPE if openmetrics else CONTENT_TYPE_TEXT
+    )
+
+
+@app.get("/api/debug/perf")
+async def get_perf_stats():
+    """Collector / endpoint / encode süreleri, hatalar, subprocess sayıları, event loop gecikmesi"""
+    return {
+        "status": "success",
+        "data": {
+            **perf.to_dict(),
+            "collectors": scheduler.status(),
+            "websocket": broadcast_hub.stats(),
+        }
+    }
 
 
 # ============ SISTEM MONITORING ============
 
+async def _latest(name: str) -> Snapshot:
+    """Son snapshot; collector SNAPSHOT_DEADLINE içinde ilk yayını yapmadıysa 503"""
+    snapshot = await scheduler.latest(name, SNAPSHOT_DEADLINE)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{name} verisi henüz hazır değil",
+            headers={"Retry-After": str(COLLECTOR_INTERVALS[name])}
+        )
+    return snapshot
+
+
 @app.get("/api/system")
-async def get_system_info():
-    """Sistem bilgisini al - 3 sn cache"""
+async def get_system_info(request: Request):
+    """Sistem bilgisini al - son snapshot"""
+    snapshot = await _latest("system")
     try:
-        now = time.time()
-        # Cache'de fresh veri var mı?
-        if _system_cache["data"] and (now - _system_cache["timestamp"]) < _cache_duration:
-            return {
-                "status": "success",
-                "data": _system_cache["data"],
-                "cached": True
-            }
-        
-        # Cache yok veya eski, yenile
-        system_data = system_monitor.to_dict()
-        _system_cache["data"] = system_data
-        _system_cache["timestamp"] = now
-        
-        return {
+        return response_cache.respond(request, "system", snapshot.version, lambda: {
             "status": "success",
-            "data": system_data,
-            "cached": False
-        }
+            "data": snapshot.data,
+            "cached": True,
+            "version": snapshot.version
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/system/gpu")
-async def get_gpu_info():
+async def get_gpu_info(request: Request):
     """Sadece GPU bilgisini al"""
+    snapshot = await _latest("system")
     try:
-        system_data = system_monitor.to_dict()
-        return {
+        system_data = snapshot.data
+        return response_cache.respond(request, "system/gpu", snapshot.version, lambda: {
             "status": "success",
             "data": system_data.get("gpus", [])
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/system/cpu")
-async def get_cpu_info():
+async def get_cpu_info(request: Request):
     """Sadece CPU bilgisini al"""
+    snapshot = await _latest("system")
     try:
-        system_data = system_monitor.to_dict()
-        return {
+        system_data = snapshot.data
+        return response_cache.respond(request, "system/cpu", snapshot.version, lambda: {
             "status": "success",
             "data": system_data.get("cpu", {})
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/system/memory")
-async def get_memory_info():
+async def get_memory_info(request: Request):
     """Sadece bellek bilgisini al"""
+    snapshot = await _latest("system")
     try:
-        system_data = system_monitor.to_dict()
-        return {
+        system_data = snapshot.data
+        return response_cache.respond(request, "system/memory", snapshot.version, lambda: {
             "status": "success",
             "data": {
                 "ram": system_data.get("ram", {}),
                 "disk": system_data.get("disk", {})
             }
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -151,25 +369,25 @@ async def get_memory_info():
 # ============ ENERJİ VE MALİYET ============
 
 @app.get("/api/energy")
-async def get_energy_cost():
+async def get_energy_cost(request: Request):
     """Enerji maliyetini hesapla"""
+    snapshot = await _latest("energy")
     try:
-        system_data = system_monitor.to_dict()
-        energy_cost = energy_calculator.calculate_system_cost(system_data)
-        energy_dict = energy_calculator.to_dict(energy_cost)
+        energy_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "energy", snapshot.version, lambda: {
             "status": "success",
             "data": energy_dict
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/energy/price")
 async def set_electricity_price(price_per_kwh: float):
-    """Elektrik fiyatını ayarla (TL/kWh)"""
+    """Elektrik fiyatını ayarla (TL/kWh) - sabit tarifeyi aktif yapar"""
     try:
+        tariff_engine.set_flat_price(price_per_kwh)
         energy_calculator.set_electricity_price(price_per_kwh)
         return {
             "status": "success",
@@ -179,84 +397,231 @@ async def set_electricity_price(price_per_kwh: float):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/energy/tariffs")
+async def get_tariffs():
+    """Tanımlı tarifeleri ve aktif tarifeyi al"""
+    return {
+        "status": "success",
+        "data": tariff_engine.to_dict()
+    }
+
+
+@app.post("/api/energy/tariffs")
+async def add_tariff(tariff: Dict[str, Any] = Body(...)):
+    """
+    Tarife ekle veya güncelle
+    
+    Örnek: {"name": "uc_zamanli", "versions": [{"effective_from": "2024-07-01",
+    "weekday": [{"start": 6, "end": 17, "price": 2.4, "label": "gündüz"},
+                {"start": 17, "end": 22, "price": 3.6, "label": "puant"},
+                {"start": 22, "end": 6, "price": 1.5, "label": "gece"}]}]}
+    """
+    try:
+        added = tariff_engine.add(tariff)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "status": "success",
+        "data": added.to_dict()
+    }
+
+
+@app.post("/api/energy/tariffs/active")
+async def set_active_tariff(name: str):
+    """Aktif tarifeyi seç"""
+    try:
+        tariff_engine.set_active(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen tarife: {name}")
+    return {
+        "status": "success",
+        "message": f"Aktif tarife: {name}"
+    }
+
+
+def _window_cost(range_s: int, names: List[str]) -> Dict[str, Any]:
+    """Son range_s saniyenin ölçülen tüketimini tarifelere göre fiyatla"""
+    metrics_store.flush()
+    end = time.time()
+    first = TariffEngine.hour_origin(end - range_s)
+    # Gerçek örnek zamanlarıyla trapez; uzun boşluklar EnergyIntegrator gibi atlanır
+    hour_starts, integrals, covered = metrics_store.integrate(
+        "power.total_w", first, end, 3600, energy_integrator.max_gap_s
+    )
+    energy_wh = [watt_seconds / 3600 for watt_seconds in integrals]
+    return {
+        "start": first,
+        "end": end,
+        "coverage": round(min(1.0, covered / (end - first)), 4),
+        "tariffs": tariff_engine.cost(hour_starts, energy_wh, names),
+    }
+
+
+@app.get("/api/energy/cost")
+async def get_window_cost(
+    range_s: int = Query(604800, alias="range", gt=0),
+    tariff: Optional[str] = None
+):
+    """
+    Geçmiş pencerenin maliyeti (ör. ?range=604800&tariff=A,B: geçen hafta
+    A ve B tarifeleriyle ne tutardı)
+    """
+    names = tariff.split(",") if tariff else [tariff_engine.active]
+    unknown = [name for name in names if name not in tariff_engine.tariffs]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen tarife: {', '.join(unknown)}")
+    
+    try:
+        cost = await asyncio.to_thread(_window_cost, range_s, names)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Henüz kayıtlı güç verisi yok")
+    return {
+        "status": "success",
+        "data": cost
+    }
+
+
 # ============ PORT ANALİZİ ============
 
 @app.get("/api/ports")
-async def analyze_ports():
+async def analyze_ports(request: Request):
     """Portları analiz et"""
+    snapshot = await _latest("ports")
     try:
-        ports = port_analyzer.analyze_ports()
-        ports_dict = port_analyzer.to_dict(ports)
+        ports_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "ports", snapshot.version, lambda: {
             "status": "success",
             "data": ports_dict
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/ports/listening")
-async def get_listening_ports():
+async def get_listening_ports(request: Request):
     """Dinlemede olan portları al"""
+    snapshot = await _latest("ports")
     try:
-        ports = port_analyzer.analyze_ports()
-        ports_dict = port_analyzer.to_dict(ports)
+        ports_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "ports/listening", snapshot.version, lambda: {
             "status": "success",
             "data": ports_dict.get("listening_ports", [])
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/ports/established")
-async def get_established_connections():
+async def get_established_connections(request: Request):
     """Kurulu bağlantıları al"""
+    snapshot = await _latest("ports")
     try:
-        ports = port_analyzer.analyze_ports()
-        ports_dict = port_analyzer.to_dict(ports)
+        ports_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "ports/established", snapshot.version, lambda: {
             "status": "success",
             "data": ports_dict.get("established_connections", [])
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/ports/foreign")
-async def get_foreign_connections():
+async def get_foreign_connections(request: Request):
     """Dışarıdan bağlantıları al (güvenlik uyarısı)"""
+    snapshot = await _latest("ports")
     try:
-        ports = port_analyzer.analyze_ports()
-        ports_dict = port_analyzer.to_dict(ports)
+        ports_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "ports/foreign", snapshot.version, lambda: {
             "status": "success",
             "data": {
                 "foreign_connections": ports_dict.get("foreign_connections", []),
                 "alert": ports_dict.get("foreign_alert", False)
             }
-        }
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============ AĞ ARAYÜZLERİ ============
+
+@app.get("/api/network")
+async def get_network_stats(request: Request):
+    """Arayüz başına rx/tx hızlarını al"""
+    snapshot = await _latest("network")
+    try:
+        network_dict = snapshot.data
+        
+        return response_cache.respond(request, "network", snapshot.version, lambda: {
+            "status": "success",
+            "data": network_dict
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============ METRİK GEÇMİŞİ ============
+
+@app.get("/api/history")
+async def get_metric_history(
+    metric: Optional[str] = None,
+    range_s: int = Query(3600, alias="range", gt=0),
+    step: Optional[int] = Query(None, gt=0)
+):
+    """
+    Metrik geçmişini al (metric verilmezse mevcut metrikleri listele)
+    
+    Bellekteki geçmiş aralığı kapsamıyorsa (ör. yeniden başlatma sonrası)
+    kalıcı depodan okunur.
+    """
+    if metric is None:
+        metrics = set(metrics_history.metrics()) | set(metrics_store.metrics())
+        return {
+            "status": "success",
+            "data": {"metrics": sorted(metrics)}
+        }
+    
+    series = None
+    if not metrics_history.covers(metric, range_s):
+        now = time.time()
+        try:
+            series = await asyncio.to_thread(
+                metrics_store.query, metric, now - range_s, now, step
+            )
+            series["source"] = "disk"
+        except KeyError:
+            # Henüz diske yazılmamış yeni metrik
+            pass
+    
+    if series is None:
+        try:
+            series = metrics_history.query(metric, range_s, step)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Bilinmeyen metrik: {metric}")
+        series["source"] = "memory"
+    
+    return {
+        "status": "success",
+        "data": series
+    }
+
+
 # ============ TRAİNİNG JOB TRACKER ============
 
 @app.get("/api/training")
-async def get_training_jobs():
+async def get_training_jobs(request: Request):
     """Devam eden training job'larını al"""
+    snapshot = await _latest("training")
     try:
-        jobs = training_tracker.detect_training_processes()
-        jobs_dict = training_tracker.to_dict(jobs)
+        jobs_dict = snapshot.data
         
-        return {
+        return response_cache.respond(request, "training", snapshot.version, lambda: {
             "status": "success",
             "data": jobs_dict
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -311,102 +676,103 @@ async def resume_training_job(pid: int):
 
 # ============ WEBSOCKET REAL-TIME ============
 
+async def _periodic_frames(subscriber: Subscriber, interval: float):
+    """interval:N - composite frame'i N saniyede bir client kuyruğuna koy"""
+    while True:
+        subscriber.offer(await broadcast_hub.composite_frame("periodic", subscriber.media_type))
+        await asyncio.sleep(interval)
+
+
+def _topic_list(argument: str) -> List[str]:
+    return [topic.strip() for topic in argument.split(",") if topic.strip()]
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket real-time monitoring"""
-    await websocket.accept()
-    active_connections.append(websocket)
-    
+    """
+    WebSocket real-time monitoring
+
+    Komutlar:
+        subscribe:a,b / unsubscribe:a   Topic aboneliği (system, gpu, energy, ports, training, network)
+        stream:a,b                      Delta modu: keyframe + değişen yollar (seq numaralı)
+        resync / resync:a               Stream topic'leri için güncel keyframe
+        <topic> / all                   Son snapshot'ı bir kez gönder
+        interval:N                      N saniyede bir tüm veriler (interval:0 durdurur)
+
+    Komutlar her zaman text frame'dir. "msgpack" veya "cbor" subprotocol'ü
+    anlaşılırsa sunucu mesajları binary frame olarak o formatta gelir.
+    """
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    media_type = SUBPROTOCOLS.get(subprotocol, JSON)
+    send = websocket.send_text if media_type == JSON else websocket.send_bytes
+    subscriber = broadcast_hub.connect(send, media_type)
+    periodic: Optional[asyncio.Task] = None
+
+    def reply(message: Dict[str, Any]):
+        subscriber.offer(encode_frame(message, media_type))
+
     try:
         while True:
             # Client'ten mesaj al
             data = await websocket.receive_text()
-            
-            if data == "system":
-                # Sistem verisini gönder
-                system_data = system_monitor.to_dict()
-                await websocket.send_json({
-                    "type": "system",
-                    "data": system_data
-                })
-            
-            elif data == "energy":
-                # Enerji maliyetini gönder
-                system_data = system_monitor.to_dict()
-                energy_cost = energy_calculator.calculate_system_cost(system_data)
-                energy_dict = energy_calculator.to_dict(energy_cost)
-                await websocket.send_json({
-                    "type": "energy",
-                    "data": energy_dict
-                })
-            
-            elif data == "ports":
-                # Port bilgisini gönder
-                ports = port_analyzer.analyze_ports()
-                ports_dict = port_analyzer.to_dict(ports)
-                await websocket.send_json({
-                    "type": "ports",
-                    "data": ports_dict
-                })
-            
-            elif data == "training":
-                # Training jobs'ları gönder
-                jobs = training_tracker.detect_training_processes()
-                jobs_dict = training_tracker.to_dict(jobs)
-                await websocket.send_json({
-                    "type": "training",
-                    "data": jobs_dict
-                })
-            
+
+            if data in TOPIC_SOURCES:
+                # Son snapshot'ın hazır frame'i
+                snapshot = await scheduler.latest(TOPIC_SOURCES[data], broadcast_hub.COMPOSITE_DEADLINE)
+                if snapshot is None:
+                    reply({"type": "error", "message": f"{data} verisi henüz hazır değil"})
+                else:
+                    subscriber.offer(broadcast_hub.topic_frame(data, media_type))
+
             elif data == "all":
                 # Tüm verileri gönder
-                system_data = system_monitor.to_dict()
-                energy_cost = energy_calculator.calculate_system_cost(system_data)
-                ports = port_analyzer.analyze_ports()
-                jobs = training_tracker.detect_training_processes()
-                
-                await websocket.send_json({
-                    "type": "all",
-                    "data": {
-                        "system": system_data,
-                        "energy": energy_calculator.to_dict(energy_cost),
-                        "ports": port_analyzer.to_dict(ports),
-                        "training": training_tracker.to_dict(jobs)
-                    }
-                })
-            
+                subscriber.offer(await broadcast_hub.composite_frame("all", media_type))
+
+            elif data.partition(":")[0] in ("subscribe", "unsubscribe", "stream", "resync"):
+                command, _, argument = data.partition(":")
+                topics = _topic_list(argument)
+                try:
+                    if command == "subscribe":
+                        active = broadcast_hub.subscribe(subscriber, topics)
+                    elif command == "stream":
+                        active = broadcast_hub.stream(subscriber, topics)
+                    elif command == "resync":
+                        active = broadcast_hub.resync(subscriber, topics or None)
+                    else:
+                        active = broadcast_hub.unsubscribe(subscriber, topics)
+                    reply({"type": command, "topics": active})
+                except ValueError as e:
+                    reply({"type": "error", "message": str(e)})
+
             elif data.startswith("interval:"):
-                # Periyodik gönderim
+                # Periyodik gönderim (client başına tek task)
                 try:
-                    interval = int(data.split(":")[1])
-                    while True:
-                        system_data = system_monitor.to_dict()
-                        energy_cost = energy_calculator.calculate_system_cost(system_data)
-                        ports = port_analyzer.analyze_ports()
-                        jobs = training_tracker.detect_training_processes()
-                        
-                        await websocket.send_json({
-                            "type": "periodic",
-                            "data": {
-                                "system": system_data,
-                                "energy": energy_calculator.to_dict(energy_cost),
-                                "ports": port_analyzer.to_dict(ports),
-                                "training": training_tracker.to_dict(jobs)
-                            }
-                        })
-                        
-                        await asyncio.sleep(interval)
+                    interval = float(data.split(":")[1])
+                    if interval < 0:
+                        raise ValueError(interval)
                 except (ValueError, IndexError):
-                    await websocket.send_json({
+                    reply({
                         "type": "error",
                         "message": "Geçersiz interval format: interval:saniye"
                     })
-    
+                    continue
+                if periodic is not None:
+                    periodic.cancel()
+                    periodic = None
+                if interval > 0:
+                    periodic = asyncio.create_task(_periodic_frames(subscriber, interval))
+                reply({"type": "interval", "interval": interval})
+
     except Exception as e:
+        if not isinstance(e, WebSocketDisconnect):
+            perf.error("websocket", type(e).__name__)
         print(f"WebSocket hatası: {e}")
-    
+
     finally:
-        active_connections.remove(websocket)
+        if periodic is not None:
+            periodic.cancel()
+        await broadcast_hub.disconnect(subscriber)
 
 
 # ============ SİSTEM YÖNETİMİ ============
@@ -438,5 +804,7 @@ if __name__ == "__main__":
         log_level="info",
         timeout_keep_alive=5,
         limit_concurrency=1000,  # Çok fazla concurrent istek
-        backlog=2048
+        backlog=2048,
+        ws="websockets",
+        ws_per_message_deflate=True  # Hücresel bağlantıda WebSocket frame sıkıştırma
     )
@@ -3,14 +3,49 @@ Monitors Paketi
 """
 
 from .gpu_monitor import SystemMonitor, GPUMonitor
+from .gpu_backends import (
+    GPUBackend, NVMLBackend, NvidiaSmiBackend, FakeGPUBackend, create_gpu_backend
+)
+from .gpu_process_index import GPUProcessIndex
+from .cpu_sampler import CPUSampler
 from .energy_monitor import EnergyCalculator
+from .energy_integrator import EnergyIntegrator
+from .tariff import Tariff, TariffEngine
 from .port_analyzer import PortAnalyzer
+from .proc_net import ProcNetReader
+from .sock_diag import SockDiagCollector
+from .socket_inode_index import SocketInodeIndex
+from .address_classifier import AddressClassifier
+from .process_cache import ProcessCache
+from .training_classifier import TrainingClassifier
 from .training_tracker import TrainingTracker
+from .job_energy import JobEnergyAccountant
+from .log_tailer import LogTailer
+from .network_monitor import NetworkMonitor
 
 __all__ = [
     'SystemMonitor',
     'GPUMonitor',
+    'GPUBackend',
+    'NVMLBackend',
+    'NvidiaSmiBackend',
+    'FakeGPUBackend',
+    'create_gpu_backend',
+    'GPUProcessIndex',
+    'CPUSampler',
     'EnergyCalculator',
+    'EnergyIntegrator',
+    'Tariff',
+    'TariffEngine',
     'PortAnalyzer',
+    'ProcNetReader',
+    'SockDiagCollector',
+    'SocketInodeIndex',
+    'AddressClassifier',
+    'ProcessCache',
+    'TrainingClassifier',
     'TrainingTracker',
+    'JobEnergyAccountant',
+    'LogTailer',
+    'NetworkMonitor',
 ]
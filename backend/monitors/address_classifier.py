@@ -0,0 +1,113 @@
+"""
+Adres Sınıflandırma Modülü
+IP adreslerini derlenmiş CIDR tablolarıyla kategoriye ayırır
+(loopback, private, tailscale, link-local, public)
+"""
+
+import ipaddress
+import socket
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+PUBLIC = 'public'
+UNKNOWN = 'unknown'
+
+# Varsayılan ağlar; en uzun prefix kazanır (tailscale ULA'sı private'ı ezer)
+DEFAULT_NETWORKS: Dict[str, List[str]] = {
+    'loopback': ['127.0.0.0/8', '::1/128'],
+    'private': ['10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', 'fc00::/7'],
+    'tailscale': ['100.64.0.0/10', 'fd7a:115c:a1e0::/48'],
+    'link-local': ['169.254.0.0/16', 'fe80::/10'],
+    'unspecified': ['0.0.0.0/32', '::/128'],
+}
+
+_IPV4_MAPPED_PREFIX = b'\x00' * 10 + b'\xff\xff'
+
+
+class AddressClassifier:
+    """
+    Longest-prefix-match sınıflandırıcı
+
+    Her adres ailesi için prefix uzunluğu başına bir hash tablosu tutulur
+    (düzleştirilmiş prefix trie); bir adres en fazla farklı prefix
+    uzunluğu sayısı kadar dict araması ile sınıflandırılır. Sık görülen
+    adresler LRU cache'ten döner.
+    """
+
+    def __init__(self, networks: Dict[str, List[str]] = None, cache_size: int = 8192):
+        """
+        Args:
+            networks: kategori -> CIDR listesi, verilmezse DEFAULT_NETWORKS
+            cache_size: LRU cache boyutu
+        """
+        self.networks = networks if networks is not None else DEFAULT_NETWORKS
+        self._tables: Dict[int, List[Tuple[int, int, Dict[int, str]]]] = self._compile(self.networks)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @staticmethod
+    def _compile(networks: Dict[str, List[str]]) -> Dict[int, List[Tuple[int, int, Dict[int, str]]]]:
+        """
+        CIDR listesini prefix uzunluğuna göre gruplanmış tablolara derle
+
+        Returns:
+            {4: [(shift, prefixlen, {network >> shift: kategori}), ...], 6: [...]}
+            uzun prefix'ler önce gelir
+        """
+        by_length: Dict[int, Dict[int, Dict[int, str]]] = {4: {}, 6: {}}
+        for category, cidrs in networks.items():
+            for cidr in cidrs:
+                network = ipaddress.ip_network(cidr, strict=False)
+                shift = network.max_prefixlen - network.prefixlen
+                table = by_length[network.version].setdefault(network.prefixlen, {})
+                table[int(network.network_address) >> shift] = category
+
+        return {
+            version: [
+                (max_bits - prefixlen, prefixlen, tables[prefixlen])
+                for prefixlen in sorted(tables, reverse=True)
+            ]
+            for version, max_bits, tables in ((4, 32, by_length[4]), (6, 128, by_length[6]))
+        }
+
+    def _classify(self, address: str) -> str:
+        """Tek adresi sınıflandır (cache'siz)"""
+        packed, version = self._pack(address)
+        if packed is None:
+            return UNKNOWN
+
+        value = int.from_bytes(packed, 'big')
+        for shift, _, table in self._tables[version]:
+            category = table.get(value >> shift)
+            if category is not None:
+                return category
+        return PUBLIC
+
+    @staticmethod
+    def _pack(address: str):
+        """Adresi ağ byte sırasına çevir; IPv4-mapped IPv6 adresleri IPv4 sayılır"""
+        address = address.split('%')[0].strip('[]')
+        try:
+            return socket.inet_pton(socket.AF_INET, address), 4
+        except OSError:
+            pass
+        try:
+            packed = socket.inet_pton(socket.AF_INET6, address)
+        except OSError:
+            return None, 0
+        if packed[:12] == _IPV4_MAPPED_PREFIX:
+            return packed[12:], 4
+        return packed, 6
+
+    def classify_many(self, addresses: Iterable[str]) -> List[str]:
+        """Çok sayıda adresi toplu sınıflandır"""
+        classify = self.classify
+        return [classify(address) for address in addresses]
+
+    def is_local(self, address: str) -> bool:
+        """Adres yerel mi (public olmayan her kategori)"""
+        return self.classify(address) != PUBLIC
+
+    def cache_info(self):
+        """LRU cache istatistikleri"""
+        return self.classify.cache_info()
@@ -0,0 +1,143 @@
+"""
+CPU Sampler Modülü
+/proc/stat sayaçlarının farkından anlık CPU kullanımını hesaplar (uyumadan)
+"""
+
+import operator
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import psutil
+
+
+# /proc/stat'ta her satırın ilk 8 sütunu (guest zaten user içinde sayılır)
+STAT_COLUMNS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+NUM_COLUMNS = len(STAT_COLUMNS)
+
+USER, NICE, SYSTEM, IDLE, IOWAIT, IRQ, SOFTIRQ, STEAL = range(NUM_COLUMNS)
+
+
+@dataclass
+class CPUSample:
+    """CPU Kullanım Örneği"""
+    percent: float  # Toplam kullanım %
+    per_core: List[float]  # Çekirdek başına kullanım %
+    modes: Dict[str, float]  # user/system/iowait/irq/steal/idle dağılımı %
+
+
+class CPUSampler:
+    """Delta tabanlı, bloklamayan CPU kullanım ölçer"""
+
+    def __init__(self, stat_path: str = '/proc/stat'):
+        self.stat_path = stat_path
+        self.available = os.path.exists(stat_path)
+        self._lock = threading.Lock()
+        self._prev: Optional[array] = None
+        self._last: Optional[CPUSample] = None
+
+        if self.available:
+            self._prev = self._read_counters()
+        else:
+            # /proc yoksa psutil'in kendi delta'sını başlat
+            psutil.cpu_percent(interval=None, percpu=True)
+            psutil.cpu_times_percent(interval=None)
+
+    def _read_counters(self) -> array:
+        """
+        /proc/stat'taki cpu satırlarını tek düz diziye oku
+
+        Returns:
+            [toplam satırı, cpu0, cpu1, ...] x STAT_COLUMNS uzunluğunda dizi
+        """
+        with open(self.stat_path, 'rb') as f:
+            data = f.read()
+
+        counters = array('q')
+        for line in data.split(b'\n'):
+            # cpu satırları dosyanın başında, ilk farklı satırda dur
+            if not line.startswith(b'cpu'):
+                break
+            fields = line.split()[1:NUM_COLUMNS + 1]
+            if len(fields) < NUM_COLUMNS:
+                fields.extend([b'0'] * (NUM_COLUMNS - len(fields)))
+            counters.extend(map(int, fields))
+        return counters
+
+    def sample(self) -> CPUSample:
+        """Önceki örnekten bu yana CPU kullanımını hesapla (anlık, uyumaz)"""
+        if not self.available:
+            return self._sample_psutil()
+
+        with self._lock:
+            current = self._read_counters()
+            prev = self._prev
+            self._prev = current
+
+            # CPU hotplug vb. durumda satır sayısı değişir, bir tur atla
+            if prev is None or len(prev) != len(current):
+                return self._last or self._empty_sample(len(current) // NUM_COLUMNS - 1)
+
+            # Tüm sayaçların farkı tek geçişte
+            delta = list(map(operator.sub, current, prev))
+            if sum(delta[:NUM_COLUMNS]) <= 0:
+                # İki okuma arasında tick ilerlemedi, son sonucu dön
+                return self._last or self._empty_sample(len(current) // NUM_COLUMNS - 1)
+
+            rows = [delta[i:i + NUM_COLUMNS] for i in range(0, len(delta), NUM_COLUMNS)]
+            busy = [self._busy_percent(row) for row in rows]
+            total = rows[0]
+            total_ticks = sum(total)
+
+            def share(*columns: int) -> float:
+                return round(sum(total[c] for c in columns) / total_ticks * 100, 2)
+
+            self._last = CPUSample(
+                percent=round(busy[0], 2),
+                per_core=[round(p, 1) for p in busy[1:]],
+                modes={
+                    'user': share(USER, NICE),
+                    'system': share(SYSTEM),
+                    'iowait': share(IOWAIT),
+                    'irq': share(IRQ, SOFTIRQ),
+                    'steal': share(STEAL),
+                    'idle': share(IDLE),
+                },
+            )
+            return self._last
+
+    @staticmethod
+    def _busy_percent(row: List[int]) -> float:
+        """Bir satırın meşgul yüzdesi (psutil ile aynı tanım: idle+iowait boşta)"""
+        total = sum(row)
+        if total <= 0:
+            return 0.0
+        return max(0.0, (total - row[IDLE] - row[IOWAIT]) / total * 100)
+
+    @staticmethod
+    def _empty_sample(core_count: int) -> CPUSample:
+        """Henüz delta yokken dönülecek boş örnek"""
+        return CPUSample(
+            percent=0.0,
+            per_core=[0.0] * max(core_count, 0),
+            modes={'user': 0.0, 'system': 0.0, 'iowait': 0.0, 'irq': 0.0, 'steal': 0.0, 'idle': 100.0},
+        )
+
+    def _sample_psutil(self) -> CPUSample:
+        """/proc olmayan sistemler için psutil (interval=None, bloklamaz)"""
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        times = psutil.cpu_times_percent(interval=None)
+        return CPUSample(
+            percent=round(sum(per_core) / len(per_core), 2) if per_core else 0.0,
+            per_core=[round(p, 1) for p in per_core],
+            modes={
+                'user': round(times.user + getattr(times, 'nice', 0.0), 2),
+                'system': round(times.system, 2),
+                'iowait': round(getattr(times, 'iowait', 0.0), 2),
+                'irq': round(getattr(times, 'irq', 0.0) + getattr(times, 'softirq', 0.0), 2),
+                'steal': round(getattr(times, 'steal', 0.0), 2),
+                'idle': round(times.idle, 2),
+            },
+        )
@@ -0,0 +1,180 @@
+"""
+Enerji Entegrasyon Modülü
+Ardışık güç örneklerini trapez yöntemiyle Wh'e çevirip bileşen başına
+bugün / bu ay / açılıştan beri tüketimi biriktirir
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import psutil
+
+
+@dataclass
+class EnergyBucket:
+    """Bir dönemin birikmiş tüketimi"""
+    key: str  # Dönem anahtarı ("2024-05-01", "2024-05", boot zamanı)
+    wh: Dict[str, float] = field(default_factory=dict)  # Bileşen -> Wh
+    cost: float = 0.0  # TL
+
+    def reset(self, key: str):
+        self.key = key
+        self.wh = {}
+        self.cost = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'period': self.key,
+            'kwh': round(sum(self.wh.values()) / 1000, 4),
+            'cost_try': round(self.cost, 2),
+            'components_kwh': {name: round(wh / 1000, 4) for name, wh in sorted(self.wh.items())},
+        }
+
+
+class EnergyIntegrator:
+    """
+    Ölçülen güçten enerji biriktirici
+
+    Her örnek O(1): önceki örnekle arasındaki süre boyunca gücün iki uç
+    değerin ortalaması olduğu varsayılır. max_gap'ten uzun boşluklar
+    (servis kapalıyken, uyku) hiç sayılmaz; bilinmeyen tüketim tahmin edilmez.
+    """
+
+    # Bu süreden uzun aralıklar entegre edilmez (saniye)
+    MAX_GAP_S = 30.0
+
+    # Sayaçların diske yazılma aralığı (saniye)
+    SAVE_INTERVAL_S = 60.0
+
+    def __init__(self, state_path: Optional[str] = None, max_gap_s: Optional[float] = None):
+        """
+        Args:
+            state_path: Sayaçların saklandığı JSON dosyası (None: kalıcı değil)
+            max_gap_s: Entegre edilecek en uzun örnek aralığı
+        """
+        self.state_path = state_path
+        self.max_gap_s = max_gap_s or self.MAX_GAP_S
+        self.boot_key = str(int(psutil.boot_time()))
+
+        self.today = EnergyBucket(key='')
+        self.month = EnergyBucket(key='')
+        self.since_boot = EnergyBucket(key=self.boot_key)
+        self.total = EnergyBucket(key='total')
+
+        self._last_timestamp: Optional[float] = None
+        self._last_powers: Dict[str, float] = {}
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+        self._load()
+
+    # ---------- kalıcılık ----------
+
+    def _load(self):
+        """Kayıtlı sayaçları oku; açılış değiştiyse since_boot sıfırdan başlar"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            for name in ('today', 'month', 'since_boot', 'total'):
+                saved = state.get(name)
+                if saved:
+                    setattr(self, name, EnergyBucket(
+                        key=saved['key'], wh=dict(saved['wh']), cost=saved['cost']
+                    ))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Enerji sayaçları okunamadı: {e}")
+
+        if self.since_boot.key != self.boot_key:
+            self.since_boot.reset(self.boot_key)
+
+    def save(self):
+        """Sayaçları atomik olarak diske yaz (tmp dosya + rename)"""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                name: {'key': bucket.key, 'wh': dict(bucket.wh), 'cost': bucket.cost}
+                for name, bucket in (('today', self.today), ('month', self.month),
+                                     ('since_boot', self.since_boot), ('total', self.total))
+            }
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Enerji sayaçları yazılamadı: {e}")
+
+    # ---------- entegrasyon ----------
+
+    def add_sample(self, timestamp: float, powers: Dict[str, float], price_per_kwh: float):
+        """
+        Yeni güç örneğini ekle
+
+        Args:
+            timestamp: Örnek zamanı (unix)
+            powers: Bileşen -> Watt
+            price_per_kwh: Bu aralık için geçerli kWh fiyatı
+        """
+        with self._lock:
+            previous_ts = self._last_timestamp
+            previous = self._last_powers
+            if previous_ts is not None and timestamp <= previous_ts:
+                return  # Aynı snapshot ikinci kez geldi
+
+            self._last_timestamp = timestamp
+            self._last_powers = dict(powers)
+
+            local = datetime.fromtimestamp(timestamp)
+            day_key = local.strftime('%Y-%m-%d')
+            month_key = local.strftime('%Y-%m')
+            if self.today.key != day_key:
+                self.today.reset(day_key)
+            if self.month.key != month_key:
+                self.month.reset(month_key)
+
+            if previous_ts is None:
+                return
+            elapsed = timestamp - previous_ts
+            if elapsed > self.max_gap_s:
+                return
+
+            hours = elapsed / 3600
+            interval_wh = 0.0
+            for name, power in powers.items():
+                before = previous.get(name)
+                if before is None:
+                    continue  # Yeni bileşen, bir sonraki aralıktan itibaren sayılır
+                wh = (before + power) / 2 * hours
+                interval_wh += wh
+                for bucket in (self.today, self.month, self.since_boot, self.total):
+                    bucket.wh[name] = bucket.wh.get(name, 0.0) + wh
+
+            cost = interval_wh / 1000 * price_per_kwh
+            for bucket in (self.today, self.month, self.since_boot, self.total):
+                bucket.cost += cost
+
+        if timestamp - self._last_save >= self.SAVE_INTERVAL_S:
+            self._last_save = timestamp
+            self.save()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Birikmiş tüketim ve maliyetler"""
+        with self._lock:
+            return {
+                'today': self.today.to_dict(),
+                'month': self.month.to_dict(),
+                'since_boot': self.since_boot.to_dict(),
+                'total': self.total.to_dict(),
+            }
@@ -47,6 +47,10 @@ class EnergyCalculator:
         'cpu_low': 65,
     }
     
+    # Tahmini CPU TDP'si ve GB başına RAM gücü (ölçüm olmadığında)
+    CPU_TDP_W = 95
+    RAM_W_PER_GB = 0.5
+    
     def __init__(self, electricity_price_per_kwh: Optional[float] = None):
         """
         Args:
@@ -89,6 +93,24 @@ class EnergyCalculator:
             'monthly_cost_try': round(monthly_consumption_kwh * self.electricity_price, 2),
         }
     
+    def component_powers(self, system_data: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Bileşen başına anlık güç (Watt)
+        
+        Args:
+            system_data: GPU Monitor'dan gelen sistem verisi
+        
+        Returns:
+            {"gpu.0": W, ..., "cpu": W, "ram": W}
+        """
+        powers = {
+            f"gpu.{gpu['index']}": gpu['power']['draw_w']
+            for gpu in system_data.get('gpus', [])
+        }
+        powers['cpu'] = self.CPU_TDP_W * (system_data['cpu']['percent'] / 100)
+        powers['ram'] = system_data['ram']['used_gb'] * self.RAM_W_PER_GB
+        return powers
+    
     def calculate_system_cost(self, system_data: Dict[str, Any]) -> EnergyCost:
         """
         Tüm sistem maliyetini hesapla
@@ -115,18 +137,18 @@ class EnergyCalculator:
             total_power_w += gpu_power_w
             components[f"GPU_{gpu['index']}_{gpu_name}"] = gpu_cost
         
+        powers = self.component_powers(system_data)
+        
         # CPU maliyeti (tahmini)
         cpu_percent = system_data['cpu']['percent']
-        # CPU'nun ortalama TDP'sini tahmin et
-        cpu_tdp_w = 95  # Ortalama CPU TDP
-        cpu_power_w = cpu_tdp_w * (cpu_percent / 100)
+        cpu_power_w = powers['cpu']
         
         cpu_cost = self.calculate_gpu_cost(cpu_power_w, cpu_percent)
         total_power_w += cpu_power_w
         components['CPU'] = cpu_cost
         
         # RAM maliyeti (tahmini - çok düşük)
-        ram_power_w = system_data['ram']['used_gb'] * 0.5  # GB başına ~0.5W
+        ram_power_w = powers['ram']
         ram_cost = self.calculate_gpu_cost(ram_power_w, 100)
         total_power_w += ram_power_w
         components['RAM'] = ram_cost
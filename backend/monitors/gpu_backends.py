@@ -0,0 +1,367 @@
+"""
+GPU Backend Modülü
+GPU verisini farklı kaynaklardan okuyan değiştirilebilir backend'ler:
+NVML (process içi), nvidia-smi (yedek) ve testler için sahte backend
+"""
+
+import math
+import os
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+
+@dataclass
+class GPUDevice:
+    """Backend'den okunan ham GPU ölçümü"""
+    index: int
+    uuid: str
+    name: str
+    memory_total: float  # MB
+    memory_used: float  # MB
+    memory_free: float  # MB
+    temperature: float  # Celsius
+    power_draw: float  # Watts
+    power_limit: float  # Watts
+    utilization: float  # %
+
+
+@dataclass
+class GPUProcess:
+    """GPU üzerindeki compute process"""
+    pid: int
+    name: str
+    gpu_uuid: str
+    gpu_index: Optional[int]
+    used_memory_mb: float
+    sm_utilization: Optional[float] = None  # % (destekleyen backend'lerde)
+
+
+class GPUBackend:
+    """GPU backend arayüzü"""
+
+    name = 'base'
+
+    def available(self) -> bool:
+        """Backend kullanılabilir mi (ilk çağrıda bağlantıyı kurar)"""
+        raise NotImplementedError
+
+    def get_devices(self) -> List[GPUDevice]:
+        """Tüm GPU'ların anlık ölçümü"""
+        raise NotImplementedError
+
+    def get_compute_processes(self) -> List[GPUProcess]:
+        """Tüm GPU'lardaki compute process'ler"""
+        raise NotImplementedError
+
+    def close(self):
+        """Backend kaynaklarını bırak"""
+        pass
+
+
+def _to_str(value: Any) -> str:
+    """pynvml eski sürümlerde bytes döner"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+class NVMLBackend(GPUBackend):
+    """NVML ile process içi GPU okuma, device handle'ları açık tutulur"""
+
+    name = 'nvml'
+
+    def __init__(self):
+        self._initialized = False
+        self._handles: List[Any] = []
+        self._uuids: List[str] = []
+        self._names: List[str] = []
+        self._uuid_to_index: Dict[str, int] = {}
+        self._process_names: Dict[int, str] = {}
+        self._utilization_timestamps: List[int] = []
+        self._utilization: List[Dict[int, float]] = []
+
+    def available(self) -> bool:
+        if self._initialized:
+            return True
+        if pynvml is None:
+            return False
+
+        try:
+            pynvml.nvmlInit()
+            count = pynvml.nvmlDeviceGetCount()
+            self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(count)]
+            # İsim ve UUID değişmez, bir kez oku
+            self._uuids = [_to_str(pynvml.nvmlDeviceGetUUID(h)) for h in self._handles]
+            self._names = [_to_str(pynvml.nvmlDeviceGetName(h)) for h in self._handles]
+            self._uuid_to_index = {uuid: i for i, uuid in enumerate(self._uuids)}
+            self._utilization_timestamps = [0] * count
+            self._utilization = [{} for _ in range(count)]
+            self._initialized = True
+        except pynvml.NVMLError as e:
+            print(f"NVML başlatılamadı: {e}")
+            return False
+
+        return True
+
+    @staticmethod
+    def _query(func, *args, default: Any = 0.0) -> Any:
+        """Desteklenmeyen alanlarda NVMLError yerine varsayılan dön"""
+        try:
+            return func(*args)
+        except pynvml.NVMLError:
+            return default
+
+    def get_devices(self) -> List[GPUDevice]:
+        devices = []
+        for index, handle in enumerate(self._handles):
+            memory = self._query(pynvml.nvmlDeviceGetMemoryInfo, handle, default=None)
+            utilization = self._query(pynvml.nvmlDeviceGetUtilizationRates, handle, default=None)
+
+            devices.append(GPUDevice(
+                index=index,
+                uuid=self._uuids[index],
+                name=self._names[index],
+                memory_total=memory.total / (1024 * 1024) if memory else 0.0,
+                memory_used=memory.used / (1024 * 1024) if memory else 0.0,
+                memory_free=memory.free / (1024 * 1024) if memory else 0.0,
+                temperature=float(self._query(
+                    pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU)),
+                power_draw=self._query(pynvml.nvmlDeviceGetPowerUsage, handle) / 1000,  # mW -> W
+                power_limit=self._query(pynvml.nvmlDeviceGetEnforcedPowerLimit, handle) / 1000,
+                utilization=float(utilization.gpu) if utilization else 0.0,
+            ))
+        return devices
+
+    def get_compute_processes(self) -> List[GPUProcess]:
+        processes = []
+        seen_pids = set()
+        for index, handle in enumerate(self._handles):
+            sm_utilization = self._process_utilization(index, handle)
+            for proc in self._query(pynvml.nvmlDeviceGetComputeRunningProcesses, handle, default=[]):
+                used_memory = proc.usedGpuMemory or 0  # Bazı sürücülerde None
+                processes.append(GPUProcess(
+                    pid=proc.pid,
+                    name=self._process_name(proc.pid),
+                    gpu_uuid=self._uuids[index],
+                    gpu_index=index,
+                    used_memory_mb=used_memory / (1024 * 1024),
+                    sm_utilization=sm_utilization.get(proc.pid),
+                ))
+                seen_pids.add(proc.pid)
+
+        # Çıkan process'lerin isim ve kullanım cache'ini temizle
+        for pid in list(self._process_names):
+            if pid not in seen_pids:
+                del self._process_names[pid]
+        for utilization in self._utilization:
+            for pid in [pid for pid in utilization if pid not in seen_pids]:
+                del utilization[pid]
+
+        return processes
+
+    def _process_utilization(self, index: int, handle: Any) -> Dict[int, float]:
+        """
+        Process başına SM kullanımı
+
+        Sürücü örnekleri bir halka tamponda tutar; son görülen timestamp
+        verildiğinde sadece yeni örnekler döner. Yeni örnek gelmeyen
+        process'lerde son değer kullanılır, böylece sık sorguda değerler
+        boşa düşmez. Fonksiyon pynvml'de yoksa (nvidia-ml-py3 7.352) boş döner;
+        güç o zaman GPU belleğine göre paylaştırılır.
+        """
+        query = getattr(pynvml, 'nvmlDeviceGetProcessUtilization', None)
+        if query is None:
+            return {}
+        samples = self._query(query, handle, self._utilization_timestamps[index], default=[])
+        utilization = self._utilization[index]
+        for sample in samples:
+            utilization[sample.pid] = float(sample.smUtil)
+            if sample.timeStamp > self._utilization_timestamps[index]:
+                self._utilization_timestamps[index] = sample.timeStamp
+        return utilization
+
+    def _process_name(self, pid: int) -> str:
+        """Process adını al (pid başına cache'li)"""
+        name = self._process_names.get(pid)
+        if name is None:
+            name = _to_str(self._query(pynvml.nvmlSystemGetProcessName, pid, default=''))
+            self._process_names[pid] = name
+        return name
+
+    def close(self):
+        if self._initialized:
+            try:
+                pynvml.nvmlShutdown()
+            except pynvml.NVMLError:
+                pass
+            self._initialized = False
+
+
+class NvidiaSmiBackend(GPUBackend):
+    """nvidia-smi CSV çıktısı ile okuma (NVML yoksa yedek)"""
+
+    name = 'nvidia-smi'
+
+    # Takılan sürücüde nvidia-smi dakikalarca dönmeyebilir (saniye)
+    COMMAND_TIMEOUT = 5
+
+    def __init__(self):
+        self._available: Optional[bool] = None
+        self._uuid_to_index: Dict[str, int] = {}
+
+    def available(self) -> bool:
+        if self._available is None:
+            try:
+                subprocess.run(['nvidia-smi', '-L'], capture_output=True, check=True,
+                               timeout=self.COMMAND_TIMEOUT)
+                self._available = True
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+                self._available = False
+        return self._available
+
+    def _query_csv(self, *args: str) -> List[List[str]]:
+        """nvidia-smi'yi çalıştır, CSV satırlarını parçala"""
+        result = subprocess.run(
+            ['nvidia-smi', *args, '--format=csv,noheader,nounits'],
+            capture_output=True, text=True, check=True, timeout=self.COMMAND_TIMEOUT
+        )
+        return [
+            [p.strip() for p in line.split(',')]
+            for line in result.stdout.strip().split('\n') if line
+        ]
+
+    def get_devices(self) -> List[GPUDevice]:
+        devices = []
+        for parts in self._query_csv(
+            '--query-gpu=index,uuid,name,memory.total,memory.used,memory.free,'
+            'temperature.gpu,power.draw,power.limit,utilization.gpu'
+        ):
+            if len(parts) < 10:
+                continue
+            try:
+                devices.append(GPUDevice(
+                    index=int(parts[0]),
+                    uuid=parts[1],
+                    name=parts[2],
+                    memory_total=float(parts[3]),
+                    memory_used=float(parts[4]),
+                    memory_free=float(parts[5]),
+                    temperature=_parse_float(parts[6]),
+                    power_draw=_parse_float(parts[7]),
+                    power_limit=_parse_float(parts[8]),
+                    utilization=_parse_float(parts[9]),
+                ))
+            except ValueError:
+                continue
+
+        self._uuid_to_index = {device.uuid: device.index for device in devices}
+        return devices
+
+    def get_compute_processes(self) -> List[GPUProcess]:
+        # Tüm GPU'lar için tek çağrı
+        processes = []
+        for parts in self._query_csv('--query-compute-apps=pid,process_name,gpu_uuid,used_memory'):
+            if len(parts) < 4:
+                continue
+            try:
+                processes.append(GPUProcess(
+                    pid=int(parts[0]),
+                    name=parts[1],
+                    gpu_uuid=parts[2],
+                    gpu_index=self._uuid_to_index.get(parts[2]),
+                    used_memory_mb=_parse_float(parts[3]),
+                ))
+            except ValueError:
+                continue
+        return processes
+
+
+def _parse_float(value: str) -> float:
+    """nvidia-smi boş veya '[N/A]' dönebilir"""
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+@dataclass
+class FakeGPUBackend(GPUBackend):
+    """GPU'suz makinelerde test ve benchmark için bellek içi backend"""
+
+    device_count: int = 2
+    memory_total: float = 24564.0  # MB
+    power_limit: float = 450.0  # W
+    processes: List[GPUProcess] = field(default_factory=list)
+
+    name = 'fake'
+
+    def available(self) -> bool:
+        return True
+
+    def get_devices(self) -> List[GPUDevice]:
+        # Zamanla yavaşça değişen, deterministik değerler
+        t = time.time()
+        devices = []
+        for index in range(self.device_count):
+            load = (math.sin(t / 30 + index) + 1) / 2  # 0..1
+            used = sum((p.used_memory_mb for p in self.processes if p.gpu_index == index), 0.0)
+            devices.append(GPUDevice(
+                index=index,
+                uuid=f'GPU-fake-{index:04d}',
+                name=f'Fake GPU {index}',
+                memory_total=self.memory_total,
+                memory_used=used,
+                memory_free=self.memory_total - used,
+                temperature=round(35 + 45 * load, 1),
+                power_draw=round(30 + (self.power_limit - 30) * load, 2),
+                power_limit=self.power_limit,
+                utilization=round(100 * load, 1),
+            ))
+        return devices
+
+    def get_compute_processes(self) -> List[GPUProcess]:
+        return list(self.processes)
+
+    def set_processes(self, processes: List[GPUProcess]):
+        """Sahte compute process listesini değiştir"""
+        self.processes = list(processes)
+
+
+def create_gpu_backend(name: Optional[str] = None) -> Optional[GPUBackend]:
+    """
+    GPU backend seç
+
+    Args:
+        name: "auto", "nvml", "nvidia-smi", "fake" veya "none".
+              Verilmezse GPU_BACKEND ortam değişkeni, o da yoksa "auto"
+
+    Returns:
+        Kullanılabilir backend, hiçbiri yoksa None
+    """
+    name = (name or os.environ.get('GPU_BACKEND', 'auto')).lower()
+
+    if name == 'none':
+        return None
+    if name == 'fake':
+        return FakeGPUBackend(device_count=int(os.environ.get('GPU_FAKE_COUNT', '2')))
+
+    candidates = {
+        'nvml': [NVMLBackend],
+        'nvidia-smi': [NvidiaSmiBackend],
+        'auto': [NVMLBackend, NvidiaSmiBackend],
+    }.get(name)
+    if candidates is None:
+        raise ValueError(f"Bilinmeyen GPU backend: {name}")
+
+    for backend_cls in candidates:
+        backend = backend_cls()
+        if backend.available():
+            return backend
+    return None
@@ -4,12 +4,16 @@ GPU, CPU, RAM, Sıcaklık verilerini toplar
 """
 
 import psutil
-import subprocess
-import json
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from .cpu_sampler import CPUSampler
+from .gpu_backends import GPUBackend, GPUDevice, create_gpu_backend
+from .gpu_process_index import GPUProcessIndex
+
 
 @dataclass
 class GPUInfo:
@@ -24,38 +28,52 @@ class GPUInfo:
     power_limit: float  # Watts
     utilization: float  # %
     compute_processes: List[Dict[str, Any]]
-
-
-@dataclass
-class SystemInfo:
-    """Sistem Bilgi Sınıfı"""
-    timestamp: str
-    cpu_percent: float
-    cpu_freq: float  # GHz
-    cpu_count: int
-    cpu_temp: float  # Celsius (eğer varsa)
-    ram_total: float  # GB
-    ram_used: float  # GB
-    ram_percent: float
-    disk_total: float  # GB
-    disk_used: float  # GB
-    disk_percent: float
-    gpus: List[GPUInfo]
+    uuid: str = ''
 
 
 class GPUMonitor:
     """NVIDIA GPU Monitoring"""
     
-    def __init__(self):
-        self.has_nvidia = self._check_nvidia()
+    def __init__(self, backend: Optional[GPUBackend] = None):
+        """
+        Args:
+            backend: GPU backend'i, verilmezse otomatik seçilir (NVML > nvidia-smi)
+        """
+        self.backend = backend if backend is not None else create_gpu_backend()
+        self.has_nvidia = self.backend is not None
+        self.process_index = GPUProcessIndex.empty()
+        self._devices: List[GPUDevice] = []
+        self._lock = threading.Lock()
     
-    def _check_nvidia(self) -> bool:
-        """NVIDIA GPU'su olup olmadığını kontrol et"""
-        try:
-            subprocess.run(['nvidia-smi'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+    def refresh(self) -> GPUProcessIndex:
+        """
+        Bir örnekleme turu: cihazları ve tüm compute process'leri tek
+        sorguda oku, process index'ini yenile
+        """
+        if not self.has_nvidia:
+            return self.process_index
+        
+        with self._lock:
+            devices = self.backend.get_devices()
+            processes = self.backend.get_compute_processes()
+            self._devices = devices
+            self.process_index = GPUProcessIndex.build(devices, processes)
+            return self.process_index
+    
+    def get_process_index(self, max_age: float = 2.0) -> GPUProcessIndex:
+        """
+        Son turun process index'ini al, max_age'den eskiyse yenile
+        
+        Args:
+            max_age: Kabul edilen en büyük index yaşı (saniye)
+        """
+        index = self.process_index
+        if index.age > max_age:
+            try:
+                index = self.refresh()
+            except Exception as e:
+                print(f"GPU process index yenilenemedi: {e}")
+        return index
     
     def get_gpu_info(self) -> List[GPUInfo]:
         """Tüm GPU'ların bilgisini al"""
@@ -64,45 +82,27 @@ class GPUMonitor:
         
         gpus = []
         try:
-            # nvidia-smi komutundan JSON çıktısı al
-            result = subprocess.run([
-                'nvidia-smi',
-                '--query-gpu=index,name,memory.total,memory.used,memory.free,temperature.gpu,power.draw,power.limit,utilization.gpu',
-                '--format=csv,noheader,nounits'
-            ], capture_output=True, text=True, check=True)
+            index = self.refresh()
             
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) < 9:
-                    continue
-                
-                gpu_index = int(parts[0])
-                gpu_name = parts[1]
-                memory_total = float(parts[2])
-                memory_used = float(parts[3])
-                memory_free = float(parts[4])
-                temperature = float(parts[5]) if parts[5] else 0.0
-                power_draw = float(parts[6]) if parts[6] else 0.0
-                power_limit = float(parts[7]) if parts[7] else 0.0
-                utilization = float(parts[8]) if parts[8] else 0.0
-                
-                # Compute processes'i al
-                compute_procs = self._get_compute_processes(gpu_index)
-                
+            for device in self._devices:
                 gpu = GPUInfo(
-                    index=gpu_index,
-                    name=gpu_name,
-                    memory_total=memory_total,
-                    memory_used=memory_used,
-                    memory_free=memory_free,
-                    temperature=temperature,
-                    power_draw=power_draw,
-                    power_limit=power_limit,
-                    utilization=utilization,
-                    compute_processes=compute_procs
+                    index=device.index,
+                    name=device.name,
+                    memory_total=device.memory_total,
+                    memory_used=device.memory_used,
+                    memory_free=device.memory_free,
+                    temperature=device.temperature,
+                    power_draw=device.power_draw,
+                    power_limit=device.power_limit,
+                    utilization=device.utilization,
+                    compute_processes=[
+                        {
+                            'pid': proc.pid,
+                            'name': proc.name,
+                            'memory_mb': proc.used_memory_mb
+                        } for proc in index.processes_on(device.index)
+                    ],
+                    uuid=device.uuid
                 )
                 gpus.append(gpu)
             
@@ -110,81 +110,26 @@ class GPUMonitor:
             print(f"GPU bilgisi alınamadı: {e}")
         
         return gpus
-    
-    def _get_compute_processes(self, gpu_index: int) -> List[Dict[str, Any]]:
-        """GPU üzerindeki compute process'lerini al"""
-        processes = []
-        try:
-            result = subprocess.run([
-                'nvidia-smi',
-                f'--id={gpu_index}',
-                '--query-compute-apps=pid,process_name,used_memory',
-                '--format=csv,noheader,nounits'
-            ], capture_output=True, text=True, check=True)
-            
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 3:
-                    try:
-                        processes.append({
-                            'pid': int(parts[0]),
-                            'name': parts[1],
-                            'memory_mb': float(parts[2])
-                        })
-                    except (ValueError, IndexError):
-                        pass
-        except Exception as e:
-            print(f"Compute processes alınamadı: {e}")
-        
-        return processes
 
 
 class SystemMonitor:
     """Sistem Monitoring"""
     
-    def __init__(self):
-        self.gpu_monitor = GPUMonitor()
+    # to_dict bölümleri (snapshot'taki sırayla)
+    SECTIONS = ('cpu', 'ram', 'disk', 'gpus')
     
-    def get_system_info(self) -> SystemInfo:
-        """Tüm sistem bilgisini al"""
-        # CPU bilgisi
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_freq = psutil.cpu_freq().current / 1000  # GHz
-        cpu_count = psutil.cpu_count()
-        cpu_temp = self._get_cpu_temp()
-        
-        # RAM bilgisi
-        ram = psutil.virtual_memory()
-        ram_total = ram.total / (1024**3)  # GB
-        ram_used = ram.used / (1024**3)  # GB
-        ram_percent = ram.percent
-        
-        # Disk bilgisi
-        disk = psutil.disk_usage('/')
-        disk_total = disk.total / (1024**3)  # GB
-        disk_used = disk.used / (1024**3)  # GB
-        disk_percent = disk.percent
-        
-        # GPU bilgisi
-        gpus = self.gpu_monitor.get_gpu_info()
-        
-        return SystemInfo(
-            timestamp=datetime.now().isoformat(),
-            cpu_percent=cpu_percent,
-            cpu_freq=cpu_freq,
-            cpu_count=cpu_count,
-            cpu_temp=cpu_temp,
-            ram_total=ram_total,
-            ram_used=ram_used,
-            ram_percent=ram_percent,
-            disk_total=disk_total,
-            disk_used=disk_used,
-            disk_percent=disk_percent,
-            gpus=gpus
-        )
+    # Bölüm / alt okuma -> yeniden okuma aralığı (saniye); listede olmayanlar her turda okunur
+    SECTION_MAX_AGE = {
+        'disk': 30.0,
+        'cpu_freq': 5.0,
+        'cpu_temp': 5.0,  # psutil.sensors_temperatures tüm hwmon'u gezer
+        'cpu_count': float('inf'),
+    }
+    
+    def __init__(self, gpu_backend: Optional[GPUBackend] = None):
+        self.gpu_monitor = GPUMonitor(gpu_backend)
+        self.cpu_sampler = CPUSampler()
+        self._sections: Dict[str, Tuple[float, Any]] = {}  # ad -> (monotonic, değer)
     
     def _get_cpu_temp(self) -> float:
         """CPU sıcaklığını al (Linux için)"""
@@ -203,44 +148,76 @@ class SystemMonitor:
             pass
         return 0.0
     
-    def to_dict(self) -> Dict[str, Any]:
-        """SystemInfo nesnesini dict'e çevir"""
-        info = self.get_system_info()
+    # ---------- bölümler ----------
+    
+    def _cached(self, name: str, func: Callable[[], Any]) -> Any:
+        """Bölüm değerini SECTION_MAX_AGE süresince yeniden kullan"""
+        max_age = self.SECTION_MAX_AGE.get(name, 0.0)
+        now = time.monotonic()
+        entry = self._sections.get(name)
+        if entry is not None and now - entry[0] < max_age:
+            return entry[1]
+        value = func()
+        self._sections[name] = (now, value)
+        return value
+    
+    def _collect_cpu(self) -> Dict[str, Any]:
+        cpu_sample = self.cpu_sampler.sample()
+        return {
+            'percent': cpu_sample.percent,
+            'per_core': cpu_sample.per_core,
+            'modes': cpu_sample.modes,
+            'freq_ghz': self._cached('cpu_freq', lambda: psutil.cpu_freq().current / 1000),
+            'count': self._cached('cpu_count', psutil.cpu_count),
+            'temp_c': self._cached('cpu_temp', self._get_cpu_temp)
+        }
+    
+    def _collect_ram(self) -> Dict[str, Any]:
+        ram = psutil.virtual_memory()
+        return {
+            'total_gb': round(ram.total / (1024**3), 2),
+            'used_gb': round(ram.used / (1024**3), 2),
+            'percent': ram.percent
+        }
+    
+    def _collect_disk(self) -> Dict[str, Any]:
+        disk = psutil.disk_usage('/')
         return {
-            'timestamp': info.timestamp,
-            'cpu': {
-                'percent': info.cpu_percent,
-                'freq_ghz': info.cpu_freq,
-                'count': info.cpu_count,
-                'temp_c': info.cpu_temp
-            },
-            'ram': {
-                'total_gb': round(info.ram_total, 2),
-                'used_gb': round(info.ram_used, 2),
-                'percent': info.ram_percent
-            },
-            'disk': {
-                'total_gb': round(info.disk_total, 2),
-                'used_gb': round(info.disk_used, 2),
-                'percent': info.disk_percent
-            },
-            'gpus': [
-                {
-                    'index': gpu.index,
-                    'name': gpu.name,
-                    'memory': {
-                        'total_mb': round(gpu.memory_total, 2),
-                        'used_mb': round(gpu.memory_used, 2),
-                        'free_mb': round(gpu.memory_free, 2),
-                        'percent': round((gpu.memory_used / gpu.memory_total * 100) if gpu.memory_total > 0 else 0, 2)
-                    },
-                    'temperature_c': gpu.temperature,
-                    'power': {
-                        'draw_w': round(gpu.power_draw, 2),
-                        'limit_w': round(gpu.power_limit, 2)
-                    },
-                    'utilization_percent': gpu.utilization,
-                    'compute_processes': gpu.compute_processes
-                } for gpu in info.gpus
-            ]
+            'total_gb': round(disk.total / (1024**3), 2),
+            'used_gb': round(disk.used / (1024**3), 2),
+            'percent': disk.percent
         }
+    
+    def _collect_gpus(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'index': gpu.index,
+                'uuid': gpu.uuid,
+                'name': gpu.name,
+                'memory': {
+                    'total_mb': round(gpu.memory_total, 2),
+                    'used_mb': round(gpu.memory_used, 2),
+                    'free_mb': round(gpu.memory_free, 2),
+                    'percent': round((gpu.memory_used / gpu.memory_total * 100) if gpu.memory_total > 0 else 0, 2)
+                },
+                'temperature_c': gpu.temperature,
+                'power': {
+                    'draw_w': round(gpu.power_draw, 2),
+                    'limit_w': round(gpu.power_limit, 2)
+                },
+                'utilization_percent': gpu.utilization,
+                'compute_processes': gpu.compute_processes
+            } for gpu in self.gpu_monitor.get_gpu_info()
+        ]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Sistem bilgisini dict olarak topla
+        
+        Her bölüm ayrı okunur; yavaş değişen okumalar SECTION_MAX_AGE
+        süresince yeniden kullanılır.
+        """
+        data: Dict[str, Any] = {'timestamp': datetime.now().isoformat()}
+        for name in self.SECTIONS:
+            data[name] = self._cached(name, getattr(self, f'_collect_{name}'))
+        return data
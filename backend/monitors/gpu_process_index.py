@@ -0,0 +1,69 @@
+"""
+GPU Process Index Modülü
+Her örnekleme turunda tek sorgudan kurulan pid -> GPU process eşlemesi
+"""
+
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from .gpu_backends import GPUDevice, GPUProcess
+
+
+@dataclass(frozen=True)
+class GPUProcessIndex:
+    """Bir turun değişmez GPU process index'i"""
+    timestamp: float  # time.time()
+    by_pid: Dict[int, List[GPUProcess]] = field(default_factory=dict)
+    by_gpu: Dict[int, List[GPUProcess]] = field(default_factory=dict)
+    uuid_to_index: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, devices: List[GPUDevice], processes: List[GPUProcess]) -> 'GPUProcessIndex':
+        """Cihaz ve process listesinden index kur"""
+        uuid_to_index = {device.uuid: device.index for device in devices}
+        by_pid: Dict[int, List[GPUProcess]] = {}
+        by_gpu: Dict[int, List[GPUProcess]] = {}
+
+        for proc in processes:
+            if proc.gpu_index is None:
+                proc = replace(proc, gpu_index=uuid_to_index.get(proc.gpu_uuid))
+            by_pid.setdefault(proc.pid, []).append(proc)
+            by_gpu.setdefault(proc.gpu_index, []).append(proc)
+
+        return cls(
+            timestamp=time.time(),
+            by_pid=by_pid,
+            by_gpu=by_gpu,
+            uuid_to_index=uuid_to_index,
+        )
+
+    @classmethod
+    def empty(cls) -> 'GPUProcessIndex':
+        """Hiç sorgu yapılmamış index (yaşı sonsuz kabul edilir)"""
+        return cls(timestamp=0.0)
+
+    @property
+    def age(self) -> float:
+        """Index'in yaşı (saniye)"""
+        return time.time() - self.timestamp
+
+    def lookup(self, pid: int) -> Optional[GPUProcess]:
+        """
+        Process'in ana GPU kaydını al
+
+        Birden fazla GPU kullanan process için en çok belleği kullandığı
+        GPU döner.
+        """
+        entries = self.by_pid.get(pid)
+        if not entries:
+            return None
+        return max(entries, key=lambda p: p.used_memory_mb)
+
+    def total_memory_mb(self, pid: int) -> float:
+        """Process'in tüm GPU'lardaki toplam belleği"""
+        return sum((p.used_memory_mb for p in self.by_pid.get(pid, [])), 0.0)
+
+    def processes_on(self, gpu_index: int) -> List[GPUProcess]:
+        """Bir GPU'daki compute process'ler"""
+        return self.by_gpu.get(gpu_index, [])
@@ -0,0 +1,127 @@
+"""
+Training Job Enerji Muhasebesi Modülü
+GPU güçlerini compute process'lere paylaştırıp job başına kWh ve maliyet biriktirir
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from .gpu_process_index import GPUProcessIndex
+from .training_tracker import TrainingJob
+
+
+JobKey = Tuple[int, float]  # (pid, create_time) - pid yeniden kullanımına karşı
+
+
+@dataclass
+class JobEnergy:
+    """Bir job'ın birikmiş tüketimi"""
+    first_seen: float
+    last_timestamp: float
+    power_w: float  # Son örnekteki payı
+    energy_wh: float = 0.0
+    cost: float = 0.0  # TL
+
+
+class JobEnergyAccountant:
+    """
+    Job başına enerji ve maliyet
+
+    Her GPU'nun ölçülen gücü o GPU'daki compute process'lere, sürücü
+    process başına SM kullanımı veriyorsa ona, vermiyorsa GPU belleğine
+    göre bölünür. Job'ın CPU payı, process CPU yüzdesinin tüm çekirdeklere
+    oranıyla CPU gücünden alınır. Her örnek O(job + GPU process) maliyetlidir.
+    """
+
+    # Bu süreden uzun örnek aralıkları entegre edilmez (saniye)
+    MAX_GAP_S = 30.0
+
+    def __init__(self, cpu_tdp_w: float, max_gap_s: Optional[float] = None):
+        """
+        Args:
+            cpu_tdp_w: Tam yükteki CPU gücü (EnergyCalculator.CPU_TDP_W)
+            max_gap_s: Entegre edilecek en uzun örnek aralığı
+        """
+        self.cpu_tdp_w = cpu_tdp_w
+        self.max_gap_s = max_gap_s or self.MAX_GAP_S
+        self.cpu_count = psutil.cpu_count() or 1
+        self.jobs: Dict[JobKey, JobEnergy] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def gpu_shares(gpu_processes: GPUProcessIndex,
+                   gpu_powers: Dict[int, float]) -> Dict[int, float]:
+        """
+        GPU güçlerini process'lere böl
+
+        Returns:
+            pid -> Watt (birden fazla GPU kullanan process için toplam)
+        """
+        shares: Dict[int, float] = {}
+        for gpu_index, power in gpu_powers.items():
+            processes = gpu_processes.processes_on(gpu_index)
+            if not processes or power <= 0:
+                continue
+
+            if all(p.sm_utilization is not None for p in processes):
+                weights = [p.sm_utilization for p in processes]
+            else:
+                weights = [p.used_memory_mb for p in processes]
+            total = sum(weights)
+            if total <= 0:
+                # Ağırlık bilgisi yok, eşit böl
+                weights = [1.0] * len(processes)
+                total = float(len(processes))
+
+            for proc, weight in zip(processes, weights):
+                shares[proc.pid] = shares.get(proc.pid, 0.0) + power * weight / total
+        return shares
+
+    def update(self, timestamp: float, jobs: List[TrainingJob],
+               gpu_processes: GPUProcessIndex, gpu_powers: Dict[int, float],
+               price_per_kwh: float):
+        """
+        Yeni örneği işle ve job'ların enerji alanlarını doldur
+
+        Args:
+            timestamp: Örnek zamanı (unix)
+            jobs: Bu turda tespit edilen training job'ları
+            gpu_processes: Aynı turun GPU process index'i
+            gpu_powers: GPU index -> ölçülen Watt
+            price_per_kwh: Bu aralık için geçerli kWh fiyatı
+        """
+        shares = self.gpu_shares(gpu_processes, gpu_powers)
+        seen = set()
+
+        with self._lock:
+            for job in jobs:
+                key = (job.pid, job.create_time)
+                seen.add(key)
+                power = shares.get(job.pid, 0.0)
+                power += self.cpu_tdp_w * job.cpu_percent / (100 * self.cpu_count)
+
+                energy = self.jobs.get(key)
+                if energy is None:
+                    energy = self.jobs[key] = JobEnergy(
+                        first_seen=timestamp, last_timestamp=timestamp, power_w=power
+                    )
+                else:
+                    elapsed = timestamp - energy.last_timestamp
+                    if 0 < elapsed <= self.max_gap_s:
+                        wh = (energy.power_w + power) / 2 * elapsed / 3600
+                        energy.energy_wh += wh
+                        energy.cost += wh / 1000 * price_per_kwh
+                    energy.last_timestamp = timestamp
+                    energy.power_w = power
+
+                job.power_w = power
+                job.energy_wh = energy.energy_wh
+                job.energy_cost = energy.cost
+                job.cost_per_hour = power / 1000 * price_per_kwh
+
+            # Çıkan job'ları bırak
+            for key in [key for key in self.jobs if key not in seen]:
+                del self.jobs[key]
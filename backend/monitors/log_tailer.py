@@ -0,0 +1,497 @@
+"""
+Training Log Takip Modülü
+Job'ların log ve TensorBoard event dosyalarını bulur, sadece sonlarına
+eklenen kayıtları okuyarak step, loss ve throughput çıkarır
+"""
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import re
+import struct
+from stat import S_ISREG
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import tfevents
+from .training_tracker import TrainingJob
+
+
+JobKey = Tuple[int, float]  # (pid, create_time)
+
+# inotify sabitleri (sys/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT = struct.Struct('=iIII')  # wd, mask, cookie, len
+
+# Metin loglarından değer çıkaran desenler (HF Trainer dict'leri, key=value, tqdm)
+_NUMBER = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+STEP_PATTERN = re.compile(
+    r'\b(?:global_step|step|iter(?:ation)?)\b[\'"]?\s*[:=]?\s*(\d+)|\b(\d+)/\d+\s*\[',
+    re.IGNORECASE
+)
+LOSS_PATTERN = re.compile(r'\b(?:train[_/])?loss[\'"]?\s*[:=]\s*' + _NUMBER, re.IGNORECASE)
+THROUGHPUT_PATTERN = re.compile(
+    r'\b(?:train_)?samples_per_second[\'"]?\s*[:=]\s*' + _NUMBER +
+    r'|' + _NUMBER + r'\s*(?:samples|img|images)/s(?:ec)?\b',
+    re.IGNORECASE
+)
+# tqdm'in it/s'i batch (adım) hızıdır, örnek hızı değil; yavaş döngüde s/it yazar
+STEP_RATE_PATTERN = re.compile(
+    r'\b(?:train_)?steps_per_second[\'"]?\s*[:=]\s*' + _NUMBER +
+    r'|' + _NUMBER + r'\s*it/s\b' +
+    r'|' + _NUMBER + r'\s*s/it\b',
+    re.IGNORECASE
+)
+
+# /proc/pid/fd'de log sayılacak dosyalar
+LOG_SUFFIXES = ('.log', '.txt', '.out', '.err')
+TFEVENTS_MARKER = 'tfevents'
+
+
+@dataclass
+class JobProgress:
+    """Loglardan çıkarılan son ilerleme"""
+    source: str
+    step: Optional[int] = None
+    loss: Optional[float] = None
+    samples_per_s: Optional[float] = None
+    steps_per_s: Optional[float] = None  # Logdaki it/s, yoksa step değişimlerinden
+    updated_at: Optional[float] = None  # unix
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'source': self.source,
+            'step': self.step,
+            'loss': round(self.loss, 6) if self.loss is not None else None,
+            'samples_per_s': round(self.samples_per_s, 2) if self.samples_per_s is not None else None,
+            'steps_per_s': round(self.steps_per_s, 3) if self.steps_per_s is not None else None,
+            'updated_at': self.updated_at,
+        }
+
+
+@dataclass
+class TrackedFile:
+    """Takip edilen dosya ve okuma durumu"""
+    path: str
+    is_tfevents: bool
+    inode: Optional[int] = None
+    offset: Optional[int] = None  # None: henüz okunmadı
+    partial: bytes = b''  # Yarım kalan satır / kayıt
+    needs_sync: bool = False  # Dosyanın ortasından başlandı, kayıt sınırı aranıyor
+    wd: Optional[int] = None
+    dirty: bool = True
+    progress: JobProgress = None
+    _step_mark: Optional[Tuple[int, float]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.progress is None:
+            self.progress = JobProgress(source=self.path)
+
+
+class Inotify:
+    """ctypes üzerinden minimal inotify"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def remove(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int]]:
+        """Bekleyen (wd, mask) olayları; bloklamaz"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, name_length = _EVENT.unpack_from(data, offset)
+                events.append((wd, mask))
+                offset += _EVENT.size + name_length
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogTailer:
+    """
+    Job başına log / event dosyası takibi
+
+    Dosyalar job'ın /proc/pid/fd'sindeki açık log dosyalarından ve cwd'ye
+    göre genişletilen glob'lardan bulunur. Değişiklikler inotify ile
+    (yoksa stat ile) fark edilir; her dosyada kaldığı byte offset'inden
+    okunur ve tur başına okuma READ_BUDGET ile sınırlıdır. İlk kez görülen
+    büyük dosyalarda sadece son INITIAL_TAIL_BYTES okunur, böylece maliyet
+    dosya boyutundan bağımsızdır.
+    """
+
+    DEFAULT_GLOBS = (
+        '{cwd}/*.log',
+        '{cwd}/runs/*/events.out.tfevents.*',
+        '{cwd}/lightning_logs/*/events.out.tfevents.*',
+    )
+
+    # Job başına dosya keşfi aralığı (saniye)
+    DISCOVERY_INTERVAL = 30.0
+    # Dosya başına tur başına en fazla okunacak byte
+    READ_BUDGET = 1024 * 1024
+    # İlk görülen dosyada okunacak son kısım
+    INITIAL_TAIL_BYTES = 64 * 1024
+    # Job başına en fazla takip edilen dosya
+    MAX_FILES_PER_JOB = 8
+
+    def __init__(self, globs: Optional[Iterable[str]] = None, proc_root: str = '/proc'):
+        """
+        Args:
+            globs: {cwd} yer tutuculu glob'lar; verilmezse TRAINING_LOG_GLOBS
+                   (virgülle ayrılmış), o da yoksa DEFAULT_GLOBS
+            proc_root: procfs kökü
+        """
+        if globs is None:
+            env_globs = os.environ.get('TRAINING_LOG_GLOBS')
+            globs = env_globs.split(',') if env_globs else self.DEFAULT_GLOBS
+        self.globs = [pattern.strip() for pattern in globs if pattern.strip()]
+        self.proc_root = proc_root
+
+        self.files: Dict[str, TrackedFile] = {}
+        self._job_files: Dict[JobKey, List[str]] = {}
+        self._discovered_at: Dict[JobKey, float] = {}
+        self._by_wd: Dict[int, TrackedFile] = {}
+        self._tick_time = 0.0
+        self._lock = threading.Lock()
+
+        try:
+            self._inotify: Optional[Inotify] = Inotify()
+        except (OSError, AttributeError) as e:
+            # AttributeError: inotify olmayan libc
+            print(f"inotify kullanılamıyor, stat ile takip edilecek: {e}")
+            self._inotify = None
+
+    # ---------- keşif ----------
+
+    def _discover(self, pid: int) -> List[str]:
+        """Process'in açık log dosyaları ve cwd glob eşleşmeleri"""
+        paths: List[str] = []
+        fd_dir = f'{self.proc_root}/{pid}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            fds = []
+        for fd in fds:
+            try:
+                target = os.readlink(f'{fd_dir}/{fd}')
+            except OSError:
+                continue
+            if not target.startswith('/') or target.endswith(' (deleted)') or target.startswith('/dev/'):
+                continue
+            name = os.path.basename(target)
+            # stdout/stderr bir dosyaya yönlendirildiyse adı ne olursa olsun log sayılır
+            if fd in ('1', '2') or TFEVENTS_MARKER in name or name.endswith(LOG_SUFFIXES):
+                paths.append(target)
+
+        if self.globs:
+            try:
+                cwd = os.readlink(f'{self.proc_root}/{pid}/cwd')
+            except OSError:
+                cwd = None
+            if cwd:
+                for pattern in self.globs:
+                    paths.extend(glob.glob(pattern.replace('{cwd}', glob.escape(cwd))))
+
+        # En son değişen dosyalar öncelikli
+        mtimes: Dict[str, float] = {}
+        for path in paths:
+            if path in mtimes:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                mtimes[path] = stat.st_mtime
+        return sorted(mtimes, key=mtimes.get, reverse=True)[:self.MAX_FILES_PER_JOB]
+
+    def _track(self, path: str) -> TrackedFile:
+        tracked = self.files.get(path)
+        if tracked is None:
+            tracked = self.files[path] = TrackedFile(
+                path=path, is_tfevents=TFEVENTS_MARKER in os.path.basename(path)
+            )
+            self._watch(tracked)
+        return tracked
+
+    def _watch(self, tracked: TrackedFile):
+        """Dosyaya inotify watch ekle (inotify yoksa stat ile takip sürer)"""
+        if self._inotify is None or tracked.wd is not None:
+            return
+        try:
+            tracked.wd = self._inotify.add(tracked.path)
+            self._by_wd[tracked.wd] = tracked
+        except OSError as e:
+            print(f"inotify watch eklenemedi ({tracked.path}): {e}")
+
+    def _untrack(self, path: str):
+        tracked = self.files.pop(path, None)
+        if tracked is not None and tracked.wd is not None:
+            self._by_wd.pop(tracked.wd, None)
+            self._inotify.remove(tracked.wd)
+
+    # ---------- okuma ----------
+
+    def _mark_changes(self):
+        """Değişen dosyaları dirty işaretle"""
+        if self._inotify is not None:
+            for wd, mask in self._inotify.read_events():
+                tracked = self._by_wd.get(wd)
+                if tracked is None:
+                    continue
+                tracked.dirty = True
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # Dosya silindi / taşındı (log rotation): yol yeni dosyada
+                    # yeniden açılınca watch tekrar eklenir, o zamana kadar stat
+                    self._by_wd.pop(wd, None)
+                    if mask & IN_MOVE_SELF:
+                        # Taşınan eski dosyanın watch'ı çekirdekte kalır
+                        self._inotify.remove(wd)
+                    if tracked.wd == wd:
+                        tracked.wd = None
+
+        for tracked in self.files.values():
+            if tracked.wd is None and not tracked.dirty:
+                # inotify yok veya watch düştü: stat ile kontrol
+                try:
+                    stat = os.stat(tracked.path)
+                except OSError:
+                    continue
+                if stat.st_ino != tracked.inode or stat.st_size != tracked.offset:
+                    tracked.dirty = True
+
+    def _read(self, tracked: TrackedFile):
+        """Dosyanın yeni eklenen kısmını bütçe dahilinde oku ve işle"""
+        tracked.dirty = False
+        try:
+            with open(tracked.path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if tracked.inode != stat.st_ino or (tracked.offset or 0) > stat.st_size:
+                    # Yeni dosya, rotation veya truncate: baştan (ya da sondan) başla
+                    tracked.inode = stat.st_ino
+                    tracked.offset = None
+                    tracked.partial = b''
+                    self._watch(tracked)
+
+                if tracked.offset is None:
+                    tracked.offset = max(0, stat.st_size - self.INITIAL_TAIL_BYTES)
+                    tracked.needs_sync = tracked.offset > 0
+
+                size = min(stat.st_size - tracked.offset, self.READ_BUDGET)
+                if size <= 0:
+                    return
+                data = os.pread(f.fileno(), size, tracked.offset)
+        except OSError:
+            return
+
+        tracked.offset += len(data)
+        if tracked.offset < stat.st_size:
+            tracked.dirty = True  # Bütçe bitti, sonraki turda devam
+
+        buffer = tracked.partial + data
+        if tracked.is_tfevents:
+            tracked.partial = self._parse_events(tracked, buffer)
+        else:
+            if tracked.needs_sync:
+                # Ortadan başlandı, ilk yarım satırı at
+                newline = buffer.find(b'\n')
+                if newline < 0:
+                    tracked.partial = b''
+                    return
+                buffer = buffer[newline + 1:]
+                tracked.needs_sync = False
+            tracked.partial = self._parse_text(tracked, buffer)
+
+    def _parse_text(self, tracked: TrackedFile, buffer: bytes) -> bytes:
+        """
+        Tam satırları sondan başa tara, her alanın en son değerini al
+
+        Returns:
+            Yarım kalan son satır
+        """
+        end = max(buffer.rfind(b'\n'), buffer.rfind(b'\r'))
+        if end < 0:
+            return buffer[-self.READ_BUDGET:]
+        text = buffer[:end].decode('utf-8', errors='replace')
+
+        step = loss = throughput = step_rate = None
+        for line in reversed(re.split(r'[\r\n]', text)):
+            if step is None:
+                match = STEP_PATTERN.search(line)
+                if match:
+                    step = int(match.group(1) or match.group(2))
+            if loss is None:
+                match = LOSS_PATTERN.search(line)
+                if match:
+                    loss = float(match.group(1))
+            if throughput is None:
+                match = THROUGHPUT_PATTERN.search(line)
+                if match:
+                    throughput = float(match.group(1) or match.group(2))
+            if step_rate is None:
+                match = STEP_RATE_PATTERN.search(line)
+                if match:
+                    if match.group(3) is not None:
+                        seconds = float(match.group(3))
+                        step_rate = 1 / seconds if seconds > 0 else None
+                    else:
+                        step_rate = float(match.group(1) or match.group(2))
+            if None not in (step, loss, throughput, step_rate):
+                break
+
+        self._update_progress(tracked, step, loss, throughput, step_rate)
+        return buffer[end + 1:]
+
+    def _parse_events(self, tracked: TrackedFile, buffer: bytes) -> bytes:
+        """
+        Tam TFRecord kayıtlarını işle
+
+        Returns:
+            Yarım kalan son kayıt
+        """
+        if tracked.needs_sync:
+            start = tfevents.find_record_start(buffer)
+            if start is None:
+                # Başlık iki okumaya bölünmüş olabilir, son byte'ları sakla
+                return buffer[-(tfevents.HEADER_SIZE - 1):]
+            buffer = buffer[start:]
+            tracked.needs_sync = False
+
+        step = loss = throughput = step_rate = None
+        consumed = 0
+        try:
+            for end, record in tfevents.iter_records(buffer):
+                consumed = end
+                event_step, scalars = tfevents.parse_event(record)
+                if not scalars:
+                    continue
+                for tag, value in scalars.items():
+                    lowered = tag.lower()
+                    if 'loss' in lowered and ('train' in lowered or loss is None
+                                              or lowered in ('loss', 'train/loss')):
+                        loss = value
+                    elif 'steps_per_sec' in lowered:
+                        step_rate = value
+                    elif 'samples_per_sec' in lowered or 'throughput' in lowered:
+                        throughput = value
+                if event_step is not None:
+                    step = event_step
+        except (ValueError, IndexError, struct.error) as e:
+            # Bozuk kayıt: tamponu at, sonraki turda yeni veriden devam
+            print(f"Event dosyası çözülemedi ({tracked.path}): {e}")
+            tracked.needs_sync = True
+            return b''
+
+        self._update_progress(tracked, step, loss, throughput, step_rate)
+        return buffer[consumed:]
+
+    def _update_progress(self, tracked: TrackedFile, step: Optional[int],
+                         loss: Optional[float], throughput: Optional[float],
+                         step_rate: Optional[float] = None):
+        if step is None and loss is None and throughput is None and step_rate is None:
+            return
+        # Turun zamanı: aynı turda güncellenen dosyalar eşit sayılır
+        now = self._tick_time
+        progress = tracked.progress
+        if step is not None:
+            if tracked._step_mark is not None and step > tracked._step_mark[0]:
+                previous_step, previous_time = tracked._step_mark
+                if now > previous_time:
+                    progress.steps_per_s = (step - previous_step) / (now - previous_time)
+            if tracked._step_mark is None or step != tracked._step_mark[0]:
+                tracked._step_mark = (step, now)
+            progress.step = step
+        if loss is not None:
+            progress.loss = loss
+        if throughput is not None:
+            progress.samples_per_s = throughput
+        if step_rate is not None:
+            # Logun kendi ölçtüğü hız, tur aralığından hesaplanandan doğru
+            progress.steps_per_s = step_rate
+        progress.updated_at = now
+
+    # ---------- tur ----------
+
+    def update(self, jobs: List[TrainingJob]):
+        """
+        Job'ların dosyalarını güncelle ve job.progress alanını doldur
+
+        Args:
+            jobs: Bu turda tespit edilen training job'ları
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tick_time = time.time()
+            current = {(job.pid, job.create_time): job for job in jobs}
+
+            for key in current:
+                if now - self._discovered_at.get(key, float('-inf')) >= self.DISCOVERY_INTERVAL:
+                    self._discovered_at[key] = now
+                    self._job_files[key] = self._discover(key[0])
+
+            for key in [key for key in self._job_files if key not in current]:
+                del self._job_files[key]
+                self._discovered_at.pop(key, None)
+
+            wanted: Set[str] = {path for paths in self._job_files.values() for path in paths}
+            for path in [path for path in self.files if path not in wanted]:
+                self._untrack(path)
+            for path in wanted:
+                self._track(path)
+
+            self._mark_changes()
+            for tracked in self.files.values():
+                if tracked.dirty:
+                    self._read(tracked)
+
+            for key, job in current.items():
+                candidates = [
+                    self.files[path].progress for path in self._job_files.get(key, [])
+                    if path in self.files and self.files[path].progress.updated_at is not None
+                ]
+                # En son güncellenen; eşitlikte keşif sırası (en yeni mtime)
+                job.progress = max(candidates, key=lambda p: p.updated_at) if candidates else None
+
+    def close(self):
+        """inotify fd'sini kapat"""
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+                self._by_wd.clear()
+                for tracked in self.files.values():
+                    tracked.wd = None
@@ -0,0 +1,166 @@
+"""
+Ağ Arayüzü Monitoring Modülü
+/proc/net/dev farklarından arayüz başına rx/tx hızlarını hesaplar
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import psutil
+
+
+# /proc/net/dev sütun sırası (arayüz adından sonra)
+_RX_BYTES, _RX_PACKETS, _RX_ERRORS, _RX_DROPS = 0, 1, 2, 3
+_TX_BYTES, _TX_PACKETS, _TX_ERRORS, _TX_DROPS = 8, 9, 10, 11
+
+COUNTER_NAMES = (
+    'rx_bytes', 'rx_packets', 'rx_errors', 'rx_drops',
+    'tx_bytes', 'tx_packets', 'tx_errors', 'tx_drops',
+)
+_COLUMNS = (_RX_BYTES, _RX_PACKETS, _RX_ERRORS, _RX_DROPS,
+            _TX_BYTES, _TX_PACKETS, _TX_ERRORS, _TX_DROPS)
+
+_WRAP_32 = 1 << 32
+
+
+@dataclass
+class InterfaceStats:
+    """Arayüz Bilgisi"""
+    name: str
+    counters: Dict[str, int]  # Kümülatif sayaçlar
+    rates: Dict[str, float]  # Saniye başına (ilk örnekte 0)
+    is_new: bool  # Bu örnekte ilk kez görüldü
+
+
+class NetworkMonitor:
+    """Arayüz başına ağ throughput'u"""
+
+    # Toplam hesabına katılmayacak arayüzler
+    EXCLUDED_FROM_TOTAL = ('lo',)
+    # 32 bit taşma kabul edilecek en yüksek hız (birim/saniye, 1 Gbit/s: 32 bit
+    # sayaçlı sürücüler eski donanımdadır); üstündeki düşüşler sıfırlanma sayılır
+    MAX_WRAP_RATE = 125e6
+
+    def __init__(self, dev_path: str = '/proc/net/dev'):
+        self.dev_path = dev_path
+        self.use_proc = os.path.exists(dev_path)
+        self._prev: Dict[str, Tuple[int, ...]] = {}
+        self._prev_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _read_counters(self) -> Dict[str, Tuple[int, ...]]:
+        """Arayüz -> COUNTER_NAMES sırasında sayaçlar"""
+        if not self.use_proc:
+            return {
+                name: (c.bytes_recv, c.packets_recv, c.errin, c.dropin,
+                       c.bytes_sent, c.packets_sent, c.errout, c.dropout)
+                for name, c in psutil.net_io_counters(pernic=True).items()
+            }
+
+        counters = {}
+        with open(self.dev_path, 'rb') as f:
+            lines = f.read().split(b'\n')[2:]  # İki başlık satırı
+        for line in lines:
+            name, sep, values = line.partition(b':')
+            if not sep:
+                continue
+            fields = values.split()
+            if len(fields) < 16:
+                continue
+            counters[name.strip().decode()] = tuple(int(fields[i]) for i in _COLUMNS)
+        return counters
+
+    def _delta(self, current: int, previous: int, elapsed: float) -> int:
+        """
+        Sayaç farkı; taşma ve sıfırlanmayı ele al
+
+        /proc/net/dev sayaçları güncel çekirdeklerde 64 bittir; düşüş çoğunlukla
+        arayüzün yeniden oluşturulmasıdır (docker/veth/tailscale). Bu durumda o
+        tur için fark 0 kabul edilir, sonraki tur yeni değerden devam eder.
+        32 bit taşma sadece düzeltilmiş fark aralık için makulse uygulanır.
+        """
+        delta = current - previous
+        if delta >= 0:
+            return delta
+        if previous < _WRAP_32:
+            wrapped = current + _WRAP_32 - previous
+            if wrapped <= self.MAX_WRAP_RATE * elapsed:
+                return wrapped
+        return 0
+
+    def sample(self) -> List[InterfaceStats]:
+        """Önceki örnekten bu yana arayüz hızlarını hesapla"""
+        with self._lock:
+            now = time.monotonic()
+            current = self._read_counters()
+            elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+
+            stats = []
+            for name, values in current.items():
+                previous = self._prev.get(name)
+                if previous is None or elapsed <= 0:
+                    rates = {key: 0.0 for key in COUNTER_NAMES}
+                else:
+                    rates = {
+                        key: self._delta(cur, prev, elapsed) / elapsed
+                        for key, cur, prev in zip(COUNTER_NAMES, values, previous)
+                    }
+                stats.append(InterfaceStats(
+                    name=name,
+                    counters=dict(zip(COUNTER_NAMES, values)),
+                    rates=rates,
+                    is_new=previous is None,
+                ))
+
+            # Kaybolan arayüzler (docker bridge, tailscale0 vb.) bu atamayla düşer
+            self._prev = current
+            self._prev_time = now
+            return stats
+
+    def to_dict(self, stats: List[InterfaceStats]) -> Dict[str, Any]:
+        """Arayüz istatistiklerini dict'e çevir"""
+        interfaces = []
+        total_rx = 0.0
+        total_tx = 0.0
+
+        for iface in stats:
+            rates = iface.rates
+            counters = iface.counters
+            interfaces.append({
+                'name': iface.name,
+                'is_new': iface.is_new,
+                'rx': {
+                    'bytes_per_s': round(rates['rx_bytes'], 2),
+                    'packets_per_s': round(rates['rx_packets'], 2),
+                    'errors_per_s': round(rates['rx_errors'], 2),
+                    'drops_per_s': round(rates['rx_drops'], 2),
+                    'total_bytes': counters['rx_bytes'],
+                    'errors': counters['rx_errors'],
+                    'drops': counters['rx_drops'],
+                },
+                'tx': {
+                    'bytes_per_s': round(rates['tx_bytes'], 2),
+                    'packets_per_s': round(rates['tx_packets'], 2),
+                    'errors_per_s': round(rates['tx_errors'], 2),
+                    'drops_per_s': round(rates['tx_drops'], 2),
+                    'total_bytes': counters['tx_bytes'],
+                    'errors': counters['tx_errors'],
+                    'drops': counters['tx_drops'],
+                },
+            })
+            if iface.name not in self.EXCLUDED_FROM_TOTAL:
+                total_rx += rates['rx_bytes']
+                total_tx += rates['tx_bytes']
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'interfaces': interfaces,
+            'total': {
+                'rx_bytes_per_s': round(total_rx, 2),
+                'tx_bytes_per_s': round(total_tx, 2),
+            },
+        }
@@ -8,8 +8,22 @@ import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import socket
-import re
+
+from .proc_net import ProcNetReader, SocketRecord
+from .sock_diag import SockDiagCollector
+from .socket_inode_index import SocketInodeIndex
+from .address_classifier import AddressClassifier, DEFAULT_NETWORKS, PUBLIC
+
+
+@lru_cache(maxsize=4096)
+def _service_name(port: int, protocol: str) -> str:
+    """(port, protokol) -> servis adı; getservbyport her çağrıda services dosyasını tarar"""
+    try:
+        return socket.getservbyport(port, protocol)
+    except OSError:
+        return f"Unknown_{port}"
 
 
 @dataclass
@@ -25,71 +39,140 @@ class PortInfo:
     received_bytes: int
     sent_bytes: int
     is_foreign: bool  # Dışarıdan bir IP mi?
+    inode: int = 0  # Çekirdek soket inode'u (biliniyorsa)
+    remote_category: Optional[str] = None  # loopback/private/tailscale/link-local/public
+    remote_port: Optional[int] = None
+    rtt_ms: Optional[float] = None  # Sadece TCP (sock_diag)
 
 
 class PortAnalyzer:
     """Port Analizi ve Ağ Monitoring"""
     
-    # Yerli subnet'ler (foreign olmayan)
-    LOCAL_SUBNETS = [
-        '127.0.0.1',
-        '127.0.0.0/8',
-        '192.168.0.0/16',
-        '10.0.0.0/8',
-        '172.16.0.0/12',
-        '169.254.0.0/16',  # Link-local
-        '::1',  # IPv6 loopback
-        'fe80::/10',  # IPv6 link-local
-        '::ffff:127.0.0.1',  # IPv6 mapped IPv4 loopback
-    ]
+    # Yerli ağlar (foreign olmayan), kategori -> CIDR listesi
+    LOCAL_SUBNETS = DEFAULT_NETWORKS
+    
+    # Karşı taraf belirtilmemiş (dinleyen soket) adresler
+    WILDCARD_ADDRESSES = {'*', '0.0.0.0', '::'}
     
-    def __init__(self):
+    # ss / netstat yedek komutları için süre sınırı (saniye)
+    COMMAND_TIMEOUT = 5
+    
+    def __init__(self, local_subnets: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            local_subnets: kategori -> CIDR listesi, verilmezse LOCAL_SUBNETS
+        """
         self.open_ports: Dict[int, PortInfo] = {}
+        self.sock_diag = SockDiagCollector()
+        self.proc_net = ProcNetReader()
+        self.inode_index = SocketInodeIndex()
+        self.address_classifier = AddressClassifier(local_subnets or self.LOCAL_SUBNETS)
     
     def analyze_ports(self) -> List[PortInfo]:
-        """Açık portları analiz et"""
-        ports = []
+        """
+        Açık portları analiz et
         
-        # netstat veya ss komutunu kullan
-        try:
-            ports.extend(self._analyze_with_ss())
-        except Exception as e:
-            print(f"ss komutu başarısız: {e}, netstat'a geçiliyor...")
+        Kaynaklar ucuzdan pahalıya sırayla denenir: netlink sock_diag
+        (bağlantı başına sayaçlar), /proc/net, ss, netstat. Sonrakine sadece
+        mevcut kaynak başarısız olursa geçilir.
+        """
+        for name, read in self._sources():
             try:
-                ports.extend(self._analyze_with_netstat())
-            except Exception as e2:
-                print(f"netstat de başarısız: {e2}")
+                return read()
+            except Exception as e:
+                print(f"Port analizi başarısız ({name}): {e}")
+        return []
+    
+    def _sources(self) -> List[tuple]:
+        """(ad, okuma fonksiyonu) listesi; kullanılamayan kaynaklar atlanır"""
+        sources = []
+        if self.sock_diag.available():
+            sources.append(('sock_diag', self._analyze_with_sock_diag))
+        if self.proc_net.available():
+            sources.append(('/proc/net', self._analyze_with_proc_net))
+        sources.append(('ss', self._analyze_with_ss))
+        sources.append(('netstat', self._analyze_with_netstat))
+        return sources
+    
+    def _analyze_with_sock_diag(self) -> List[PortInfo]:
+        """Netlink sock_diag ile port analizi (TCP sayaçları ve RTT dahil)"""
+        return self._analyze_records(self.sock_diag.read_sockets())
+    
+    def _analyze_with_proc_net(self) -> List[PortInfo]:
+        """/proc/net tablolarıyla port analizi"""
+        records = self.proc_net.read_sockets()
+        return self._analyze_records([r for r in records if r.state != 'TIME_WAIT'])
+    
+    def _analyze_records(self, records: List[SocketRecord]) -> List[PortInfo]:
+        """Çekirdekten okunan soket kayıtlarını PortInfo'ya çevir"""
+        # Sadece yeni/değişen process'lerin fd'leri taranır
+        self.inode_index.refresh(record.inode for record in records)
+        lookup = self.inode_index.lookup
+        categories = self.address_classifier.classify_many(record.remote_address for record in records)
+        return [
+            self._record_to_port(record, lookup(record.inode), category)
+            for record, category in zip(records, categories)
+        ]
+    
+    def _record_to_port(self, record: SocketRecord, owner: Optional[tuple],
+                        category: str) -> PortInfo:
+        """Soket kaydını PortInfo'ya çevir"""
+        remote_addr = record.remote_address
+        if record.remote_port == 0 and remote_addr in self.WILDCARD_ADDRESSES:
+            remote_addr = None
+            category = None
         
-        # Network istatistikleri ekle
-        self._add_network_stats(ports)
+        return PortInfo(
+            port=record.local_port,
+            protocol=record.protocol,
+            state=record.state,
+            pid=owner[0] if owner else None,
+            process_name=owner[1] if owner else None,
+            local_address=record.local_address,
+            remote_address=remote_addr,
+            received_bytes=record.received_bytes,
+            sent_bytes=record.sent_bytes,
+            is_foreign=category == PUBLIC,
+            inode=record.inode,
+            remote_category=category,
+            remote_port=record.remote_port if remote_addr is not None else None,
+            rtt_ms=record.rtt_ms
+        )
+    
+    @staticmethod
+    def _split_host_port(addr_port: str) -> tuple:
+        """
+        "host:port" ayır; IPv6 köşeli parantezlerini ve %scope ekini temizle
         
-        return ports
+        Örn: "[::1]:22" -> ("::1", "22"), "[fe80::1]%eth0:5353" -> ("fe80::1", "5353")
+        """
+        host, _, port = addr_port.rpartition(':')
+        host = host.split('%')[0].strip('[]')
+        return host, port
     
     def _analyze_with_ss(self) -> List[PortInfo]:
         """ss komutuyla port analizi"""
         ports = []
         
-        try:
-            # IPv4 TCP
-            result = subprocess.run(
-                ['ss', '-tlnp'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            ports.extend(self._parse_ss_output(result.stdout, 'tcp'))
-            
-            # IPv4 UDP
-            result = subprocess.run(
-                ['ss', '-ulnp'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            ports.extend(self._parse_ss_output(result.stdout, 'udp'))
-            
-        except Exception as e:
-            print(f"ss analizi hatası: {e}")
+        # IPv4 TCP
+        result = subprocess.run(
+            ['ss', '-tlnp'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.COMMAND_TIMEOUT
+        )
+        ports.extend(self._parse_ss_output(result.stdout, 'tcp'))
+        
+        # IPv4 UDP
+        result = subprocess.run(
+            ['ss', '-ulnp'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.COMMAND_TIMEOUT
+        )
+        ports.extend(self._parse_ss_output(result.stdout, 'udp'))
         
         return ports
     
@@ -115,7 +198,7 @@ class PortAnalyzer:
             # Port ve IP'yi çıkart
             try:
                 if ':' in local_addr_port:
-                    local_addr, port_str = local_addr_port.rsplit(':', 1)
+                    local_addr, port_str = self._split_host_port(local_addr_port)
                     port = int(port_str)
                 else:
                     continue
@@ -135,7 +218,9 @@ class PortAnalyzer:
                     pass
             
             # Dışarıdan bir IP mi?
-            remote_addr = remote_addr_port.split(':')[0] if ':' in remote_addr_port else remote_addr_port
+            remote_addr = self._split_host_port(remote_addr_port)[0] if ':' in remote_addr_port else remote_addr_port
+            if remote_addr in self.WILDCARD_ADDRESSES:
+                remote_addr = '*'
             is_foreign = not self._is_local_address(remote_addr) and remote_addr != '*'
             
             port_info = PortInfo(
@@ -158,25 +243,23 @@ class PortAnalyzer:
         """netstat komutuyla port analizi"""
         ports = []
         
-        try:
-            result = subprocess.run(
-                ['netstat', '-tlnp'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            ports.extend(self._parse_netstat_output(result.stdout, 'tcp'))
-            
-            result = subprocess.run(
-                ['netstat', '-ulnp'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            ports.extend(self._parse_netstat_output(result.stdout, 'udp'))
-            
-        except Exception as e:
-            print(f"netstat analizi hatası: {e}")
+        result = subprocess.run(
+            ['netstat', '-tlnp'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.COMMAND_TIMEOUT
+        )
+        ports.extend(self._parse_netstat_output(result.stdout, 'tcp'))
+        
+        result = subprocess.run(
+            ['netstat', '-ulnp'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.COMMAND_TIMEOUT
+        )
+        ports.extend(self._parse_netstat_output(result.stdout, 'udp'))
         
         return ports
     
@@ -240,51 +323,11 @@ class PortAnalyzer:
     
     def _is_local_address(self, ip: str) -> bool:
         """IP adresinin lokal olup olmadığını kontrol et"""
-        local_patterns = [
-            r'^127\.',
-            r'^192\.168\.',
-            r'^10\.',
-            r'^172\.(1[6-9]|2[0-9]|3[01])\.',
-            r'^169\.254\.',
-            r'^::1$',
-            r'^fe80:',
-            r'^::ffff:127\.',
-        ]
-        
-        for pattern in local_patterns:
-            if re.match(pattern, ip):
-                return True
-        
-        return False
-    
-    def _add_network_stats(self, ports: List[PortInfo]):
-        """Ağ istatistiklerini ekle"""
-        try:
-            # proc/net/dev'den ağ istatistiklerini al
-            with open('/proc/net/dev', 'r') as f:
-                for line in f:
-                    if 'bytes' in line:
-                        continue
-                    parts = line.split()
-                    if len(parts) >= 10:
-                        interface = parts[0].rstrip(':')
-                        recv_bytes = int(parts[1])
-                        sent_bytes = int(parts[9])
-                        
-                        # Port'lara ekle (basit tahmin)
-                        for port_info in ports:
-                            if port_info.port == 0:
-                                port_info.received_bytes = recv_bytes
-                                port_info.sent_bytes = sent_bytes
-        except Exception as e:
-            print(f"Ağ stats alınamadı: {e}")
+        return self.address_classifier.is_local(ip)
     
     def get_port_service_name(self, port: int, protocol: str = 'tcp') -> str:
-        """Port numarasından servis adını al"""
-        try:
-            return socket.getservbyport(port, protocol)
-        except OSError:
-            return f"Unknown_{port}"
+        """Port numarasından servis adını al (önbellekli)"""
+        return _service_name(port, protocol)
     
     def to_dict(self, ports: List[PortInfo]) -> Dict[str, Any]:
         """Port listesini dict'e çevir"""
@@ -301,10 +344,13 @@ class PortAnalyzer:
                 'process_name': port.process_name,
                 'local_address': port.local_address,
                 'remote_address': port.remote_address,
+                'remote_port': port.remote_port,
                 'service': self.get_port_service_name(port.port, port.protocol),
                 'is_foreign': port.is_foreign,
+                'remote_category': port.remote_category,
                 'received_bytes': port.received_bytes,
                 'sent_bytes': port.sent_bytes,
+                'rtt_ms': port.rtt_ms,
             }
             
             if port.is_foreign:
@@ -335,6 +381,7 @@ class PortAnalyzer:
                     'remote_address': p.remote_address,
                     'service': self.get_port_service_name(p.port, p.protocol),
                     'is_foreign': p.is_foreign,
+                    'remote_category': p.remote_category,
                 } for p in ports
             ]
         }
@@ -0,0 +1,166 @@
+"""
+/proc/net Soket Tablosu Modülü
+/proc/net/{tcp,tcp6,udp,udp6} dosyalarını fork etmeden doğrudan okur
+"""
+
+import os
+import socket
+import struct
+from binascii import unhexlify
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+
+# /proc/net/tcp durum kodları (include/net/tcp_states.h)
+TCP_STATES = {
+    b'01': 'ESTABLISHED',
+    b'02': 'SYN_SENT',
+    b'03': 'SYN_RECV',
+    b'04': 'FIN_WAIT1',
+    b'05': 'FIN_WAIT2',
+    b'06': 'TIME_WAIT',
+    b'07': 'CLOSE',
+    b'08': 'CLOSE_WAIT',
+    b'09': 'LAST_ACK',
+    b'0A': 'LISTEN',
+    b'0B': 'CLOSING',
+}
+
+# UDP'de bağlanmamış soket 07 (CLOSE) görünür, ss gibi UNCONN diyelim
+UDP_STATES = {**TCP_STATES, b'07': 'UNCONN'}
+
+# Sadece dinleyen soketler (ss -l eşdeğeri)
+LISTENING_STATES = {
+    'tcp': {b'0A'},
+    'udp': {b'07'},
+}
+
+PROC_NET_TABLES = [
+    ('tcp', socket.AF_INET, '/proc/net/tcp'),
+    ('tcp', socket.AF_INET6, '/proc/net/tcp6'),
+    ('udp', socket.AF_INET, '/proc/net/udp'),
+    ('udp', socket.AF_INET6, '/proc/net/udp6'),
+]
+
+_IPV6_WORDS = struct.Struct('<4I')
+_IPV6_WORDS_BE = struct.Struct('>4I')
+
+
+@dataclass
+class SocketRecord:
+    """Çekirdek soket tablosundaki tek kayıt"""
+    protocol: str  # tcp/udp
+    family: int  # socket.AF_INET / AF_INET6
+    state: str
+    local_address: str
+    local_port: int
+    remote_address: str
+    remote_port: int
+    inode: int
+    uid: int
+    received_bytes: int = 0  # Sadece sock_diag (tcp_info) doldurur
+    sent_bytes: int = 0
+    rtt_ms: Optional[float] = None
+
+
+class ProcNetReader:
+    """/proc/net soket tablolarını toplu okuyan parser"""
+
+    # Dosyalar tek seferde okunur, büyük tablolar için geniş buffer
+    READ_BUFFER = 1 << 18
+
+    def __init__(self, proc_root: str = '/proc'):
+        self.proc_root = proc_root
+        # Hex adres -> metin adres; aynı adresler çok tekrarlanır
+        self._address_cache: Dict[bytes, str] = {}
+
+    def available(self) -> bool:
+        """Bu sistemde /proc/net tabloları var mı"""
+        return os.path.exists(os.path.join(self.proc_root, 'net', 'tcp'))
+
+    def read_sockets(self, listening_only: bool = False,
+                     protocols: Iterable[str] = ('tcp', 'udp')) -> List[SocketRecord]:
+        """
+        Tüm soket tablolarını oku
+
+        Args:
+            listening_only: Sadece LISTEN (tcp) ve UNCONN (udp) soketler
+            protocols: Okunacak protokoller
+
+        Returns:
+            SocketRecord listesi
+        """
+        records: List[SocketRecord] = []
+        for protocol, family, path in PROC_NET_TABLES:
+            if protocol not in protocols:
+                continue
+            path = path.replace('/proc', self.proc_root, 1)
+            try:
+                with open(path, 'rb', buffering=self.READ_BUFFER) as f:
+                    data = f.read()
+            except FileNotFoundError:
+                # IPv6 kapalıysa tcp6/udp6 olmayabilir
+                continue
+            wanted = LISTENING_STATES[protocol] if listening_only else None
+            records.extend(self._parse_table(data, protocol, family, wanted))
+
+        # Cache'in sınırsız büyümesini engelle
+        if len(self._address_cache) > 65536:
+            self._address_cache.clear()
+
+        return records
+
+    def _parse_table(self, data: bytes, protocol: str, family: int,
+                     wanted_states: Optional[set]) -> List[SocketRecord]:
+        """Tek bir tablo dosyasının içeriğini parse et"""
+        states = TCP_STATES if protocol == 'tcp' else UDP_STATES
+        decode = self._decode_address
+        records = []
+
+        # İlk satır başlık
+        for line in data.split(b'\n')[1:]:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+
+            state = fields[3]
+            if wanted_states is not None and state not in wanted_states:
+                continue
+
+            local_hex, local_port_hex = fields[1].split(b':')
+            remote_hex, remote_port_hex = fields[2].split(b':')
+
+            records.append(SocketRecord(
+                protocol=protocol,
+                family=family,
+                state=states.get(state, state.decode()),
+                local_address=decode(local_hex, family),
+                local_port=int(local_port_hex, 16),
+                remote_address=decode(remote_hex, family),
+                remote_port=int(remote_port_hex, 16),
+                inode=int(fields[9]),
+                uid=int(fields[7]),
+            ))
+
+        return records
+
+    def _decode_address(self, hex_address: bytes, family: int) -> str:
+        """
+        Çekirdeğin hex adresini metne çevir
+
+        Adresler host byte order'da 32 bit kelimeler olarak yazılır;
+        IPv6 için dört kelimenin her biri ayrı ayrı çevrilmelidir.
+        """
+        address = self._address_cache.get(hex_address)
+        if address is not None:
+            return address
+
+        raw = unhexlify(hex_address)
+        if family == socket.AF_INET:
+            packed = raw[::-1]
+        else:
+            packed = _IPV6_WORDS_BE.pack(*_IPV6_WORDS.unpack(raw))
+        address = socket.inet_ntop(family, packed)
+
+        self._address_cache[hex_address] = address
+        return address
@@ -0,0 +1,124 @@
+"""
+Process Cache Modülü
+psutil.Process nesnelerini (pid, create_time) anahtarıyla turlar arasında
+saklar; CPU yüzdesi ve I/O hızları bekleme yapmadan önceki turdan hesaplanır
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import psutil
+
+
+ProcessKey = Tuple[int, float]  # (pid, create_time)
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class ProcessSample:
+    """Bir turdaki process ölçümü"""
+    cpu_percent: float  # Önceki turdan bu yana (ilk turda 0)
+    memory_mb: float
+    memory_percent: float
+    threads: int
+    io_read_mb: float  # Kümülatif
+    io_write_mb: float  # Kümülatif
+    io_read_mb_s: float  # Önceki turdan bu yana (ilk turda 0)
+    io_write_mb_s: float
+
+
+class _CacheEntry:
+    """Saklanan Process ve önceki I/O örneği"""
+
+    __slots__ = ('process', 'io_time', 'read_bytes', 'write_bytes')
+
+    def __init__(self, process: psutil.Process):
+        self.process = process
+        self.io_time: Optional[float] = None
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+
+class ProcessCache:
+    """
+    Turlar arası psutil.Process cache'i
+
+    psutil.Process.cpu_percent(interval=None) aynı nesnenin önceki
+    çağrısına göre fark hesapladığı için nesneler korunur; pid yeniden
+    kullanılırsa create_time farklı olduğundan yeni kayıt açılır.
+    """
+
+    def __init__(self):
+        self._entries: Dict[ProcessKey, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pid: int, create_time: float) -> psutil.Process:
+        """
+        Saklanan Process nesnesini al, yoksa oluştur
+
+        Raises:
+            psutil.NoSuchProcess: Process yok
+        """
+        key = (pid, create_time)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CacheEntry(psutil.Process(pid))
+            return entry.process
+
+    def sample(self, pid: int, create_time: float) -> ProcessSample:
+        """
+        Process'i tek oneshot() bloğunda ölç
+
+        Raises:
+            psutil.NoSuchProcess, psutil.AccessDenied
+        """
+        process = self.get(pid, create_time)
+        entry = self._entries[(pid, create_time)]
+        now = time.monotonic()
+
+        with process.oneshot():
+            cpu_percent = process.cpu_percent(interval=None)
+            memory_mb = process.memory_info().rss / _MB
+            memory_percent = process.memory_percent()
+            threads = process.num_threads()
+            try:
+                io = process.io_counters()
+                read_bytes, write_bytes = io.read_bytes, io.write_bytes
+            except (psutil.AccessDenied, AttributeError):
+                # AttributeError: io_counters olmayan platformlar
+                read_bytes, write_bytes = None, None
+
+        read_rate = write_rate = 0.0
+        if read_bytes is not None:
+            if entry.io_time is not None and now > entry.io_time:
+                elapsed = now - entry.io_time
+                read_rate = max(0, read_bytes - entry.read_bytes) / elapsed / _MB
+                write_rate = max(0, write_bytes - entry.write_bytes) / elapsed / _MB
+            entry.io_time = now
+            entry.read_bytes = read_bytes
+            entry.write_bytes = write_bytes
+
+        return ProcessSample(
+            cpu_percent=cpu_percent,
+            memory_mb=memory_mb,
+            memory_percent=memory_percent,
+            threads=threads,
+            io_read_mb=(read_bytes or 0) / _MB,
+            io_write_mb=(write_bytes or 0) / _MB,
+            io_read_mb_s=read_rate,
+            io_write_mb_s=write_rate,
+        )
+
+    def retain(self, alive: Iterable[ProcessKey]):
+        """Verilen anahtarlar dışındaki (çıkmış) process'leri bırak"""
+        alive = set(alive)
+        with self._lock:
+            for key in [key for key in self._entries if key not in alive]:
+                del self._entries[key]
@@ -0,0 +1,238 @@
+"""
+Netlink sock_diag Modülü
+NETLINK_SOCK_DIAG ile tüm TCP/UDP soketlerini tcp_info sayaçlarıyla birlikte
+fork etmeden çeker (ss'in kullandığı çekirdek arayüzü)
+"""
+
+import socket
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .proc_net import TCP_STATES, UDP_STATES, LISTENING_STATES, SocketRecord
+
+
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+INET_DIAG_INFO = 2
+
+# struct nlmsghdr
+_NLMSGHDR = struct.Struct('=IHHII')
+# struct inet_diag_req_v2 (sockid sıfır: filtre yok)
+_DIAG_REQ = struct.Struct('=BBBxI48x')
+# struct inet_diag_msg: family, state, timer, retrans, sport, dport (big endian),
+# src, dst, if, cookie[2], expires, rqueue, wqueue, uid, inode
+_DIAG_MSG_HEAD = struct.Struct('=BBBB')
+_DIAG_MSG_PORTS = struct.Struct('>HH')
+_DIAG_MSG_TAIL = struct.Struct('=16s16sIIIIIIII')
+_DIAG_MSG_SIZE = _DIAG_MSG_HEAD.size + _DIAG_MSG_PORTS.size + _DIAG_MSG_TAIL.size
+# struct rtattr
+_RTATTR = struct.Struct('=HH')
+
+# struct tcp_info alan offset'leri (include/uapi/linux/tcp.h)
+_TCPI_RTT = struct.Struct('=I')  # offset 68, mikrosaniye
+_TCPI_RTT_OFFSET = 68
+_TCPI_BYTES = struct.Struct('=QQ')  # bytes_acked, bytes_received
+_TCPI_BYTES_OFFSET = 120
+
+_TCP_STATE_NAMES = {int(code, 16): name for code, name in TCP_STATES.items()}
+_UDP_STATE_NAMES = {int(code, 16): name for code, name in UDP_STATES.items()}
+
+TCP_TIME_WAIT = 6
+TCP_LISTEN = 10
+ALL_STATES = 0xFFF
+
+
+def _align(length: int) -> int:
+    """NLMSG_ALIGN / RTA_ALIGN (4 byte)"""
+    return (length + 3) & ~3
+
+
+class SockDiagCollector:
+    """sock_diag netlink soketi üzerinden toplu soket dökümü"""
+
+    RECV_BUFFER = 1 << 20
+
+    # (protokol, aile, IPPROTO) - her biri tek dump isteği
+    QUERIES = [
+        ('tcp', socket.AF_INET, socket.IPPROTO_TCP),
+        ('tcp', socket.AF_INET6, socket.IPPROTO_TCP),
+        ('udp', socket.AF_INET, socket.IPPROTO_UDP),
+        ('udp', socket.AF_INET6, socket.IPPROTO_UDP),
+    ]
+
+    def __init__(self):
+        self._sock: Optional[socket.socket] = None
+        self._available: Optional[bool] = None
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._address_cache: Dict[bytes, str] = {}
+        # Çekirdeğin desteklemediği sorgular (bir kez loglanır, sonra atlanır)
+        self._disabled: Set[Tuple[str, int, int]] = set()
+
+    def available(self) -> bool:
+        """Netlink sock_diag kullanılabilir mi"""
+        if self._available is None:
+            try:
+                self._open()
+                self._available = True
+            except (OSError, AttributeError):
+                # AttributeError: AF_NETLINK olmayan platformlar
+                self._available = False
+        return self._available
+
+    def _open(self) -> socket.socket:
+        """Kalıcı netlink soketini aç"""
+        if self._sock is None:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RECV_BUFFER)
+            self._sock = sock
+        return self._sock
+
+    def close(self):
+        """Netlink soketini kapat"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def read_sockets(self, listening_only: bool = False,
+                     include_time_wait: bool = False) -> List[SocketRecord]:
+        """
+        Tüm TCP/UDP soketlerini tcp_info ile birlikte çek
+
+        Args:
+            listening_only: Sadece LISTEN (tcp) ve UNCONN (udp) soketler
+            include_time_wait: TIME_WAIT soketleri de dahil et
+
+        Returns:
+            SocketRecord listesi (TCP için byte sayaçları ve RTT dolu)
+
+        Raises:
+            OSError: Hiçbir sorgu desteklenmiyor (backend kapatılır)
+        """
+        records: List[SocketRecord] = []
+        with self._lock:
+            sock = self._open()
+            for query in self.QUERIES:
+                if query in self._disabled:
+                    continue
+                protocol, family, ipproto = query
+                if listening_only:
+                    states = 0
+                    for code in LISTENING_STATES[protocol]:
+                        states |= 1 << int(code, 16)
+                else:
+                    states = ALL_STATES
+                    if not include_time_wait:
+                        states &= ~(1 << TCP_TIME_WAIT)
+
+                ext = (1 << (INET_DIAG_INFO - 1)) if protocol == 'tcp' else 0
+                try:
+                    for payload in self._dump(sock, family, ipproto, states, ext):
+                        record = self._parse_message(payload, protocol)
+                        if record is not None:
+                            records.append(record)
+                except OSError as e:
+                    # Örn. IPv6 kapalı veya udp_diag modülü yüklü değil; her turda tekrar denenmez
+                    self._disabled.add(query)
+                    print(f"sock_diag {protocol}/{family} başarısız, devre dışı: {e}")
+
+            if len(self._disabled) == len(self.QUERIES):
+                self._available = False
+                self.close()
+                raise OSError("sock_diag hiçbir soket ailesini desteklemiyor")
+
+        if len(self._address_cache) > 65536:
+            self._address_cache.clear()
+
+        return records
+
+    def _dump(self, sock: socket.socket, family: int, ipproto: int,
+              states: int, ext: int) -> Iterator[memoryview]:
+        """Tek dump isteği gönder, gelen inet_diag_msg payload'larını üret"""
+        self._seq += 1
+        seq = self._seq
+        request = _DIAG_REQ.pack(family, ipproto, ext, states)
+        sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(request), SOCK_DIAG_BY_FAMILY,
+                                 NLM_F_REQUEST | NLM_F_DUMP, seq, 0) + request)
+
+        while True:
+            data = memoryview(sock.recv(self.RECV_BUFFER))
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, msg_type, _, msg_seq, _ = _NLMSGHDR.unpack_from(data, offset)
+                if length < _NLMSGHDR.size:
+                    return
+                if msg_seq == seq:
+                    if msg_type == NLMSG_DONE:
+                        return
+                    if msg_type == NLMSG_ERROR:
+                        errno = -struct.unpack_from('=i', data, offset + _NLMSGHDR.size)[0]
+                        raise OSError(errno, 'sock_diag dump hatası')
+                    if msg_type == SOCK_DIAG_BY_FAMILY:
+                        yield data[offset + _NLMSGHDR.size:offset + length]
+                offset += _align(length)
+
+    def _parse_message(self, payload: memoryview, protocol: str) -> Optional[SocketRecord]:
+        """inet_diag_msg + rtattr'ları SocketRecord'a çevir"""
+        if len(payload) < _DIAG_MSG_SIZE:
+            return None
+
+        family, state, _, _ = _DIAG_MSG_HEAD.unpack_from(payload, 0)
+        sport, dport = _DIAG_MSG_PORTS.unpack_from(payload, _DIAG_MSG_HEAD.size)
+        src, dst, _, _, _, _, _, _, uid, inode = _DIAG_MSG_TAIL.unpack_from(
+            payload, _DIAG_MSG_HEAD.size + _DIAG_MSG_PORTS.size)
+
+        state_names = _TCP_STATE_NAMES if protocol == 'tcp' else _UDP_STATE_NAMES
+        record = SocketRecord(
+            protocol=protocol,
+            family=family,
+            state=state_names.get(state, str(state)),
+            local_address=self._decode_address(src, family),
+            local_port=sport,
+            remote_address=self._decode_address(dst, family),
+            remote_port=dport,
+            inode=inode,
+            uid=uid,
+        )
+
+        # Dinleyen soketlerde tcp_info anlamsız (RTT 0, sayaç yok)
+        tcp_info = self._find_attribute(payload, INET_DIAG_INFO) if state != TCP_LISTEN else None
+        if tcp_info is not None:
+            if len(tcp_info) >= _TCPI_RTT_OFFSET + _TCPI_RTT.size:
+                record.rtt_ms = _TCPI_RTT.unpack_from(tcp_info, _TCPI_RTT_OFFSET)[0] / 1000
+            # bytes_acked/bytes_received eski çekirdeklerde yok (4.1 öncesi)
+            if len(tcp_info) >= _TCPI_BYTES_OFFSET + _TCPI_BYTES.size:
+                record.sent_bytes, record.received_bytes = _TCPI_BYTES.unpack_from(
+                    tcp_info, _TCPI_BYTES_OFFSET)
+
+        return record
+
+    @staticmethod
+    def _find_attribute(payload: memoryview, attr_type: int) -> Optional[memoryview]:
+        """inet_diag_msg sonrasındaki rtattr'lar arasında tipi ara"""
+        offset = _align(_DIAG_MSG_SIZE)
+        while offset + _RTATTR.size <= len(payload):
+            length, rta_type = _RTATTR.unpack_from(payload, offset)
+            if length < _RTATTR.size:
+                break
+            if rta_type == attr_type:
+                return payload[offset + _RTATTR.size:offset + length]
+            offset += _align(length)
+        return None
+
+    def _decode_address(self, raw: bytes, family: int) -> str:
+        """16 byte'lık adres alanını metne çevir"""
+        if family == socket.AF_INET:
+            raw = raw[:4]
+        address = self._address_cache.get(raw)
+        if address is None:
+            address = socket.inet_ntop(family, raw)
+            self._address_cache[raw] = address
+        return address
@@ -0,0 +1,179 @@
+"""
+Soket Inode Index Modülü
+Soket inode -> (pid, process adı) eşlemesini artımlı olarak günceller
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+@dataclass
+class _ProcessSockets:
+    """Bir process'in son taramada bulunan soketleri"""
+    create_time: int  # /proc/pid/stat starttime (clock tick)
+    name: str
+    inodes: Set[int] = field(default_factory=set)
+    scanned_at: float = 0.0  # time.monotonic()
+
+
+class SocketInodeIndex:
+    """
+    /proc/*/fd taramasını her seferinde baştan yapmayan soket sahibi index'i
+
+    Her yenilemede sadece yeni (veya pid'i yeniden kullanılmış) process'ler
+    taranır, çıkan process'ler silinir. Bulunamayan inode'lar varsa önce
+    soket sahibi olduğu bilinen process'ler, sonra diğerleri belirli
+    aralıklarla yeniden taranır.
+    """
+
+    # Soket sahibi process'leri en fazla bu sıklıkta yeniden tara (saniye)
+    SOCKET_OWNER_RESCAN_AGE = 2.0
+    # Soketi olmayan process'leri en fazla bu sıklıkta yeniden tara (saniye)
+    IDLE_RESCAN_AGE = 30.0
+
+    def __init__(self, proc_root: str = '/proc'):
+        self.proc_root = proc_root
+        self._processes: Dict[int, _ProcessSockets] = {}
+        self._owners: Dict[int, Tuple[int, str]] = {}
+        # Sahibi bulunamayan inode -> son deneme zamanı (başka netns, izin yok...)
+        self._unresolved: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.last_scanned = 0  # Son yenilemede fd'si taranan process sayısı
+
+    def lookup(self, inode: int) -> Optional[Tuple[int, str]]:
+        """Soket inode'unun sahibini al: (pid, process adı)"""
+        return self._owners.get(inode)
+
+    def refresh(self, wanted_inodes: Iterable[int] = ()):
+        """
+        Index'i güncelle
+
+        Args:
+            wanted_inodes: Sahibi çözülmesi gereken soket inode'ları
+        """
+        with self._lock:
+            self.last_scanned = 0
+            live_pids = {int(entry) for entry in os.listdir(self.proc_root) if entry.isdigit()}
+
+            # Çıkan process'leri sil
+            for pid in list(self._processes):
+                if pid not in live_pids:
+                    self._evict(pid)
+
+            # Yeni veya pid'i yeniden kullanılmış process'leri tara
+            for pid in live_pids:
+                create_time = self._read_start_time(pid)
+                if create_time is None:
+                    continue
+                entry = self._processes.get(pid)
+                if entry is None or entry.create_time != create_time:
+                    if entry is not None:
+                        self._evict(pid)
+                    self._scan(pid, create_time)
+
+            now = time.monotonic()
+            wanted = {inode for inode in wanted_inodes if inode}
+            missing = {
+                inode for inode in wanted
+                if inode not in self._owners
+                and now - self._unresolved.get(inode, -self.IDLE_RESCAN_AGE) >= self.IDLE_RESCAN_AGE
+            }
+            if missing:
+                self._resolve_missing(missing)
+
+            # Çözülemeyenleri bir süre tekrar deneme
+            self._unresolved = {
+                inode: tried for inode, tried in self._unresolved.items() if inode in wanted
+            }
+            for inode in missing:
+                self._unresolved[inode] = now
+
+    def _resolve_missing(self, missing: Set[int]):
+        """Bilinen process'leri yeniden tarayarak eksik inode'ları bul"""
+        now = time.monotonic()
+        # Önce soket sahibi process'ler (yeni soket açma olasılığı yüksek)
+        candidates = sorted(
+            self._processes.items(),
+            key=lambda item: (not item[1].inodes, item[1].scanned_at)
+        )
+        for pid, entry in candidates:
+            max_age = self.SOCKET_OWNER_RESCAN_AGE if entry.inodes else self.IDLE_RESCAN_AGE
+            if now - entry.scanned_at < max_age:
+                continue
+            self._scan(pid, entry.create_time)
+            missing.difference_update(self._processes[pid].inodes if pid in self._processes else ())
+            if not missing:
+                break
+
+    def _scan(self, pid: int, create_time: int):
+        """Tek process'in fd'lerini tara"""
+        self.last_scanned += 1
+        fd_dir = os.path.join(self.proc_root, str(pid), 'fd')
+        inodes: Set[int] = set()
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            fds = []  # Erişim yok; yine de kaydet ki her turda denenmesin
+
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            if target.startswith('socket:['):
+                inodes.add(int(target[8:-1]))
+
+        previous = self._processes.get(pid)
+        if previous is not None:
+            # Kapanan soketleri çıkar
+            for inode in previous.inodes - inodes:
+                if self._owners.get(inode, (None,))[0] == pid:
+                    del self._owners[inode]
+
+        # İsim sadece soketi olan process'ler için okunur
+        name = previous.name if previous is not None and previous.name else ''
+        if inodes and not name:
+            name = self._read_comm(pid)
+        for inode in inodes:
+            self._owners[inode] = (pid, name)
+
+        self._processes[pid] = _ProcessSockets(
+            create_time=create_time,
+            name=name,
+            inodes=inodes,
+            scanned_at=time.monotonic(),
+        )
+
+    def _evict(self, pid: int):
+        """Process'i ve soketlerini index'ten çıkar"""
+        entry = self._processes.pop(pid, None)
+        if entry is None:
+            return
+        for inode in entry.inodes:
+            if self._owners.get(inode, (None,))[0] == pid:
+                del self._owners[inode]
+
+    def _read_start_time(self, pid: int) -> Optional[int]:
+        """Process başlangıç zamanı (/proc/pid/stat 22. alan)"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'stat'), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # comm parantez içinde boşluk içerebilir, son ')' sonrasından say
+        fields = data[data.rfind(b')') + 2:].split()
+        try:
+            return int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    def _read_comm(self, pid: int) -> str:
+        """Process adını /proc/pid/comm'dan oku"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'comm'), 'rb') as f:
+                return f.read().strip().decode('utf-8', errors='replace')
+        except OSError:
+            return ''
@@ -0,0 +1,279 @@
+"""
+Elektrik Tarifesi Modülü
+Saat dilimli (gündüz / puant / gece), hafta içi / hafta sonu ayrımlı ve
+yürürlük tarihli tarifeler; saatlik enerji kovalarından maliyet hesabı
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+
+HOURS = 24
+FLAT_TARIFF = 'flat'
+
+
+def _compile_bands(bands: List[Dict[str, Any]]) -> Tuple[List[float], List[str]]:
+    """
+    Saat bantlarını 24 elemanlı fiyat ve etiket listelerine çevir
+
+    Her bant {"start": 6, "end": 17, "price": 2.5, "label": "gündüz"};
+    end hariçtir, start > end gece yarısını geçen bant demektir (22-6).
+    """
+    if not isinstance(bands, list):
+        raise ValueError("Saat bantları bir liste olmalı")
+    prices: List[Optional[float]] = [None] * HOURS
+    labels = [''] * HOURS
+    for band in bands:
+        if not isinstance(band, dict):
+            raise ValueError(f"Saat bandı bir nesne olmalı: {band!r}")
+        start, end = int(band['start']), int(band['end'])
+        price = float(band['price'])
+        if not (0 <= start < HOURS and 0 < end <= HOURS) or start == end:
+            raise ValueError(f"Geçersiz saat bandı: {start}-{end}")
+        if price < 0:
+            raise ValueError(f"Negatif fiyat: {price}")
+        hours = range(start, end) if start < end else list(range(start, HOURS)) + list(range(0, end))
+        for hour in hours:
+            if prices[hour] is not None:
+                raise ValueError(f"Çakışan saat bandı: {hour}:00")
+            prices[hour] = price
+            labels[hour] = band.get('label', f"{start}-{end}")
+
+    missing = [hour for hour, price in enumerate(prices) if price is None]
+    if missing:
+        raise ValueError(f"Tarife şu saatleri kapsamıyor: {missing}")
+    return prices, labels
+
+
+@dataclass
+class TariffVersion:
+    """Bir tarihten itibaren geçerli fiyatlar"""
+    effective_from: date
+    weekday_prices: List[float]
+    weekday_labels: List[str]
+    weekend_prices: List[float]
+    weekend_labels: List[str]
+    source: Dict[str, Any] = field(repr=False, default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TariffVersion':
+        weekday = _compile_bands(data['weekday'])
+        # Hafta sonu verilmezse hafta içi fiyatları geçerli
+        weekend = _compile_bands(data['weekend']) if data.get('weekend') else weekday
+        return cls(
+            effective_from=date.fromisoformat(data.get('effective_from', '1970-01-01')),
+            weekday_prices=weekday[0],
+            weekday_labels=weekday[1],
+            weekend_prices=weekend[0],
+            weekend_labels=weekend[1],
+            source=data,
+        )
+
+    def price(self, moment: datetime) -> Tuple[float, str]:
+        """Verilen yerel zamandaki fiyat ve bant etiketi"""
+        if moment.weekday() >= 5:
+            return self.weekend_prices[moment.hour], self.weekend_labels[moment.hour]
+        return self.weekday_prices[moment.hour], self.weekday_labels[moment.hour]
+
+
+@dataclass
+class Tariff:
+    """Yürürlük tarihine göre sıralı sürümleri olan tarife"""
+    name: str
+    versions: List[TariffVersion]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Tariff':
+        """
+        {"name": "tou", "versions": [{"effective_from": "2024-01-01",
+          "weekday": [bantlar], "weekend": [bantlar]}]}
+        Tek sürümlü tarife için "versions" yerine bantlar doğrudan verilebilir.
+        """
+        name = data.get('name')
+        if not name:
+            raise ValueError("Tarife adı gerekli")
+        raw_versions = data.get('versions') or [data]
+        if not isinstance(raw_versions, list) or not all(isinstance(v, dict) for v in raw_versions):
+            raise ValueError("Tarife sürümleri nesne listesi olmalı")
+        versions = sorted(
+            (TariffVersion.from_dict(version) for version in raw_versions),
+            key=lambda version: version.effective_from
+        )
+        return cls(name=name, versions=versions)
+
+    @classmethod
+    def flat(cls, price_per_kwh: float, name: str = FLAT_TARIFF) -> 'Tariff':
+        """Tüm saatlerde tek fiyat"""
+        return cls.from_dict({
+            'name': name,
+            'weekday': [{'start': 0, 'end': HOURS, 'price': price_per_kwh, 'label': 'sabit'}],
+        })
+
+    def version_at(self, day: date) -> TariffVersion:
+        """Gün için geçerli sürüm (ilk sürümden önceki günlerde ilk sürüm)"""
+        dates = [version.effective_from for version in self.versions]
+        return self.versions[max(0, bisect_right(dates, day) - 1)]
+
+    def price(self, moment: datetime) -> Tuple[float, str]:
+        return self.version_at(moment.date()).price(moment)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            # Tek sürümlü tanımda source tarifenin kendisidir; ad sürüme kopyalanmaz
+            'versions': [
+                {
+                    **{key: value for key, value in version.source.items() if key != 'name'},
+                    'effective_from': version.effective_from.isoformat(),
+                }
+                for version in self.versions
+            ],
+        }
+
+
+class TariffEngine:
+    """Tanımlı tarifeler, aktif tarife ve pencere maliyet hesabı"""
+
+    def __init__(self, default_price_per_kwh: float, state_path: Optional[str] = None):
+        """
+        Args:
+            default_price_per_kwh: Kayıt yoksa oluşturulacak sabit tarifenin fiyatı
+            state_path: Tarifelerin saklandığı JSON dosyası (None: kalıcı değil)
+        """
+        self.state_path = state_path
+        self.tariffs: Dict[str, Tariff] = {FLAT_TARIFF: Tariff.flat(default_price_per_kwh)}
+        self.active = FLAT_TARIFF
+        self._lock = threading.Lock()
+        self._load()
+
+    # ---------- kalıcılık ----------
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            for data in state.get('tariffs', []):
+                tariff = Tariff.from_dict(data)
+                self.tariffs[tariff.name] = tariff
+            if state.get('active') in self.tariffs:
+                self.active = state['active']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Tarifeler okunamadı: {e}")
+
+    def save(self):
+        """Tarifeleri atomik olarak diske yaz"""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                'active': self.active,
+                'tariffs': [tariff.to_dict() for tariff in self.tariffs.values()],
+            }
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Tarifeler yazılamadı: {e}")
+
+    # ---------- yönetim ----------
+
+    def add(self, data: Dict[str, Any]) -> Tariff:
+        """Tarife ekle / aynı adlıyı değiştir (ValueError: geçersiz tanım)"""
+        try:
+            tariff = Tariff.from_dict(data)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Eksik tarife alanı: {e}")
+        with self._lock:
+            self.tariffs[tariff.name] = tariff
+        self.save()
+        return tariff
+
+    def set_active(self, name: str):
+        """Aktif tarifeyi seç (KeyError: bilinmeyen tarife)"""
+        with self._lock:
+            if name not in self.tariffs:
+                raise KeyError(name)
+            self.active = name
+        self.save()
+
+    def set_flat_price(self, price_per_kwh: float):
+        """Sabit tarifeyi güncelleyip aktif yap (eski /api/energy/price davranışı)"""
+        with self._lock:
+            self.tariffs[FLAT_TARIFF] = Tariff.flat(price_per_kwh)
+            self.active = FLAT_TARIFF
+        self.save()
+
+    def get(self, name: Optional[str] = None) -> Tariff:
+        return self.tariffs[name or self.active]
+
+    def current_price(self, timestamp: Optional[float] = None) -> float:
+        """Aktif tarifenin şu anki kWh fiyatı"""
+        moment = datetime.fromtimestamp(timestamp) if timestamp is not None else datetime.now()
+        return self.get().price(moment)[0]
+
+    # ---------- maliyet ----------
+
+    @staticmethod
+    def hour_origin(timestamp: float) -> float:
+        """Zamanın içinde bulunduğu yerel saatin başlangıcı"""
+        return datetime.fromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0).timestamp()
+
+    def cost(self, hour_starts: List[float], energy_wh: List[float],
+             names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Saatlik enerji kovalarının maliyetini tarifelere göre hesapla
+
+        Örnek başına değil saatlik kova başına tek fiyat araması yapılır;
+        bir haftalık pencere 168 aramadır.
+
+        Args:
+            hour_starts: Yerel saat başlarına hizalı kova başlangıçları
+            energy_wh: Kova başına Wh
+            names: Tarife adları (varsayılan aktif tarife)
+
+        Returns:
+            Tarife adı -> {kwh, cost_try, bands: {etiket: {kwh, cost_try}}}
+        """
+        moments = [datetime.fromtimestamp(ts) for ts in hour_starts]
+        results = {}
+        for name in names or [self.active]:
+            tariff = self.get(name)
+            total_cost = 0.0
+            bands: Dict[str, Dict[str, float]] = {}
+            for moment, wh in zip(moments, energy_wh):
+                if not wh:
+                    continue
+                price, label = tariff.price(moment)
+                cost = wh / 1000 * price
+                total_cost += cost
+                band = bands.setdefault(label, {'kwh': 0.0, 'cost_try': 0.0})
+                band['kwh'] += wh / 1000
+                band['cost_try'] += cost
+            results[name] = {
+                'kwh': round(sum(energy_wh) / 1000, 4),
+                'cost_try': round(total_cost, 2),
+                'bands': {
+                    label: {'kwh': round(band['kwh'], 4), 'cost_try': round(band['cost_try'], 2)}
+                    for label, band in bands.items()
+                },
+            }
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'active': self.active,
+            'current_price_per_kwh': self.current_price(),
+            'tariffs': [tariff.to_dict() for tariff in self.tariffs.values()],
+        }
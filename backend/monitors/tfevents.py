@@ -0,0 +1,171 @@
+"""
+TensorBoard Event Dosyası Modülü
+tensorflow/tensorboard bağımlılığı olmadan TFRecord çerçevesini ve Event
+protobuf'ının ihtiyaç duyulan alanlarını (step, skaler değerler) çözer
+"""
+
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+
+# TFRecord: uint64 uzunluk, uint32 maskeli crc(uzunluk), veri, uint32 maskeli crc(veri)
+_HEADER = struct.Struct('<QI')
+HEADER_SIZE = _HEADER.size
+_FOOTER_SIZE = 4
+
+# Protobuf wire tipleri
+_VARINT, _FIXED64, _LENGTH, _FIXED32 = 0, 1, 2, 5
+
+# TensorProto dtype
+_DT_FLOAT, _DT_DOUBLE = 1, 2
+
+# Makul bir Event kaydının üst sınırı; daha büyüğü bozuk çerçeve sayılır
+MAX_RECORD_SIZE = 64 * 1024 * 1024
+
+
+def _crc32c_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _crc32c_table()
+
+
+def masked_crc32c(data: bytes) -> int:
+    """TFRecord'un maskeli CRC32C'si (sadece 8 byte'lık başlıklar için kullanılır)"""
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    crc ^= 0xFFFFFFFF
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+def find_record_start(buffer: bytes, start: int = 0) -> Optional[int]:
+    """
+    Dosyanın ortasından başlarken ilk geçerli kayıt başlığını bul
+
+    Uzunluk alanının CRC'si tutan ilk konum kabul edilir.
+    """
+    for position in range(start, len(buffer) - _HEADER.size + 1):
+        length, length_crc = _HEADER.unpack_from(buffer, position)
+        if length <= MAX_RECORD_SIZE and masked_crc32c(buffer[position:position + 8]) == length_crc:
+            return position
+    return None
+
+
+def iter_records(buffer: bytes) -> Iterator[Tuple[int, memoryview]]:
+    """
+    Tampondaki tam kayıtları üret
+
+    Yields:
+        (kaydın bittiği offset, kayıt verisi); yarım kalan son kayıt üretilmez
+    """
+    view = memoryview(buffer)
+    position = 0
+    while position + _HEADER.size <= len(buffer):
+        length, _ = _HEADER.unpack_from(buffer, position)
+        if length > MAX_RECORD_SIZE:
+            raise ValueError(f"Bozuk TFRecord uzunluğu: {length}")
+        end = position + _HEADER.size + length + _FOOTER_SIZE
+        if end > len(buffer):
+            return
+        yield end, view[position + _HEADER.size:position + _HEADER.size + length]
+        position = end
+
+
+def _varint(data: memoryview, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
+
+
+def _fields(data: memoryview) -> Iterator[Tuple[int, int, object]]:
+    """Protobuf mesajının alanlarını (numara, wire tipi, değer) üret"""
+    position = 0
+    end = len(data)
+    while position < end:
+        key, position = _varint(data, position)
+        number, wire = key >> 3, key & 7
+        if wire == _VARINT:
+            value, position = _varint(data, position)
+        elif wire == _FIXED64:
+            value = data[position:position + 8]
+            position += 8
+        elif wire == _LENGTH:
+            length, position = _varint(data, position)
+            value = data[position:position + length]
+            position += length
+        elif wire == _FIXED32:
+            value = data[position:position + 4]
+            position += 4
+        else:
+            raise ValueError(f"Desteklenmeyen wire tipi: {wire}")
+        yield number, wire, value
+
+
+def _tensor_scalar(tensor: memoryview) -> Optional[float]:
+    """TensorProto'dan tek skaler (float/double)"""
+    dtype = _DT_FLOAT
+    for number, wire, value in _fields(tensor):
+        if number == 1 and wire == _VARINT:
+            dtype = value
+        elif number == 4 and wire == _LENGTH:  # tensor_content
+            if dtype == _DT_DOUBLE and len(value) >= 8:
+                return struct.unpack_from('<d', value)[0]
+            if len(value) >= 4:
+                return struct.unpack_from('<f', value)[0]
+        elif number == 5:  # float_val (packed veya tekil)
+            if wire == _LENGTH and len(value) >= 4:
+                return struct.unpack_from('<f', value)[0]
+            if wire == _FIXED32:
+                return struct.unpack_from('<f', value)[0]
+        elif number == 6:  # double_val
+            if wire == _LENGTH and len(value) >= 8:
+                return struct.unpack_from('<d', value)[0]
+            if wire == _FIXED64:
+                return struct.unpack_from('<d', value)[0]
+    return None
+
+
+def parse_event(record: memoryview) -> Tuple[Optional[int], Dict[str, float]]:
+    """
+    Event mesajından step ve skaler değerleri çıkar
+
+    Event: 1 wall_time, 2 step, 5 summary
+    Summary.Value: 1 tag, 2 simple_value, 8 tensor
+
+    Returns:
+        (step veya None, {tag: değer})
+    """
+    step = None
+    scalars: Dict[str, float] = {}
+    for number, wire, value in _fields(record):
+        if number == 2 and wire == _VARINT:
+            step = value
+        elif number == 5 and wire == _LENGTH:
+            for summary_number, summary_wire, summary_value in _fields(value):
+                if summary_number != 1 or summary_wire != _LENGTH:
+                    continue
+                tag = None
+                scalar = None
+                for value_number, value_wire, field_value in _fields(summary_value):
+                    if value_number == 1 and value_wire == _LENGTH:
+                        tag = bytes(field_value).decode('utf-8', errors='replace')
+                    elif value_number == 2 and value_wire == _FIXED32:
+                        scalar = struct.unpack_from('<f', field_value)[0]
+                    elif value_number == 8 and value_wire == _LENGTH:
+                        scalar = _tensor_scalar(field_value)
+                if tag is not None and scalar is not None:
+                    scalars[tag] = scalar
+    return step, scalars
@@ -0,0 +1,255 @@
+"""
+Training Process Sınıflandırma Modülü
+Yapılandırılabilir kuralları tek regex'e derleyip process'leri sınıflandırır;
+kararlar (pid, create_time) başına cache'lenir
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from .gpu_process_index import GPUProcessIndex
+
+
+ProcessKey = Tuple[int, float]  # (pid, create_time)
+
+# Kurallar; TRAINING_RULES_FILE ortam değişkeniyle aynı yapıda JSON verilebilir
+DEFAULT_RULES: Dict[str, List[str]] = {
+    # Komut satırı (büyük/küçük harf duyarsız)
+    'cmdline': [
+        r'\btrain\w*\.py\b',
+        r'\b(torchrun|deepspeed|horovodrun|accelerate\s+launch)\b',
+        r'-m\s+torch\.distributed',
+        r'\b(pytorch_lightning|lightning\.fabric|ultralytics|fairseq-train|llamafactory)\b',
+        r'--(num_train_epochs|max_steps|epochs?)\b',
+    ],
+    # Çalıştırılabilir dosya yolu
+    'exe': [
+        r'/(torchrun|deepspeed|horovodrun)$',
+    ],
+    # Bu programlar asla training sayılmaz; komut satırının tamamına değil,
+    # çalıştırılan programa (yorumlayıcıda script / -m modülü) bakılır
+    'exclude': [
+        r'\b(jupyter|ipykernel\w*|tensorboard|pip[\d.]*|conda)\b',
+    ],
+    # maps / environ kontrolü yapılacak yorumlayıcılar (process adı)
+    'interpreters': [
+        r'^python[\d.]*$',
+    ],
+    # /proc/pid/maps içinde yüklü CUDA kütüphaneleri
+    'cuda_libs': [
+        r'libcudart\.so', r'libcublas\.so', r'libcudnn[\w]*\.so', r'libnccl\.so',
+        r'libtorch_cuda\.so', r'libtensorflow_framework\.so',
+    ],
+    # Ortamda bulunması GPU işi işareti olan değişkenler
+    'env': [
+        'CUDA_VISIBLE_DEVICES',
+    ],
+}
+
+
+@dataclass
+class Verdict:
+    """Bir process için sınıflandırma sonucu"""
+    is_training: bool
+    reason: str  # Eşleşen kural türü ("cmdline", "exe", "cuda_libs", "env", "gpu") veya ""
+    name: str
+    cmdline: str
+    checked_at: float  # time.monotonic()
+
+
+def _alternation(patterns: Iterable[str]) -> str:
+    """Desenleri tek alternation'a birleştir"""
+    return '|'.join(f'(?:{pattern})' for pattern in patterns)
+
+
+class TrainingClassifier:
+    """
+    Derlenmiş kural setiyle training process tespiti
+
+    Komut satırı değişmediği için kararlar (pid, create_time) başına
+    saklanır; host genelindeki tarama sadece yeni process'leri sınıflandırır.
+    CUDA kütüphaneleri process başladıktan sonra yüklenebildiğinden
+    yorumlayıcılar için negatif kararlar NEGATIVE_TTL sonra yeniden kontrol
+    edilir. GPU process index'inde görünen process her zaman training sayılır.
+    """
+
+    NEGATIVE_TTL = 30.0
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None,
+                 proc_root: str = '/proc'):
+        """
+        Args:
+            rules: Kural seti; verilmezse TRAINING_RULES_FILE, o da yoksa DEFAULT_RULES
+            proc_root: procfs kökü
+        """
+        self.rules = rules if rules is not None else self.load_rules()
+        self.proc_root = proc_root
+        self._compile(self.rules)
+        self._verdicts: Dict[ProcessKey, Verdict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load_rules(path: Optional[str] = None) -> Dict[str, List[str]]:
+        """JSON kural dosyasını oku; verilmeyen anahtarlar varsayılandan gelir"""
+        path = path or os.environ.get('TRAINING_RULES_FILE')
+        if not path:
+            return DEFAULT_RULES
+        try:
+            with open(path) as f:
+                return {**DEFAULT_RULES, **json.load(f)}
+        except (OSError, ValueError) as e:
+            print(f"Training kuralları okunamadı ({path}): {e}")
+            return DEFAULT_RULES
+
+    def _compile(self, rules: Dict[str, List[str]]):
+        """Her kural türünü tek regex'e derle (boş tür: None)"""
+        def compile_text(key: str, flags: int = 0) -> Optional[re.Pattern]:
+            patterns = rules.get(key) or []
+            return re.compile(_alternation(patterns), flags) if patterns else None
+
+        def compile_bytes(patterns: List[str]) -> Optional[re.Pattern]:
+            return re.compile(_alternation(patterns).encode()) if patterns else None
+
+        self._cmdline = compile_text('cmdline', re.IGNORECASE)
+        self._exe = compile_text('exe')
+        self._exclude = compile_text('exclude', re.IGNORECASE)
+        self._interpreters = compile_text('interpreters')
+        self._cuda_libs = compile_bytes(rules.get('cuda_libs') or [])
+        env_names = [re.escape(name) for name in rules.get('env') or []]
+        self._env = compile_bytes([rf'(?:^|\x00)(?:{_alternation(env_names)})='] if env_names else [])
+
+    # ---------- sınıflandırma ----------
+
+    def classify(self, proc: psutil.Process, create_time: float,
+                 gpu_processes: Optional[GPUProcessIndex] = None) -> Verdict:
+        """
+        Process'i sınıflandır (cache'li)
+
+        Raises:
+            psutil.NoSuchProcess: Process çıktı
+        """
+        key = (proc.pid, create_time)
+        now = time.monotonic()
+        verdict = self._verdicts.get(key)
+
+        if verdict is None:
+            verdict = self._classify_static(proc, now)
+        elif (not verdict.is_training and verdict.reason != 'exclude'
+              and self._is_interpreter(verdict.name)
+              and now - verdict.checked_at >= self.NEGATIVE_TTL):
+            verdict.checked_at = now
+            reason = self._runtime_reason(proc.pid)
+            if reason:
+                verdict.is_training, verdict.reason = True, reason
+
+        # GPU'da compute process olarak görünmek exclude kuralını da ezer
+        if (not verdict.is_training
+                and gpu_processes is not None and gpu_processes.by_pid.get(proc.pid)):
+            verdict.is_training, verdict.reason = True, 'gpu'
+
+        with self._lock:
+            self._verdicts[key] = verdict
+        return verdict
+
+    def _classify_static(self, proc: psutil.Process, now: float) -> Verdict:
+        """İlk görülen process: komut satırı, exe, sonra maps/environ"""
+        name = proc.name()
+        try:
+            argv = proc.cmdline()
+        except psutil.AccessDenied:
+            argv = []
+        cmdline = ' '.join(argv)
+
+        def verdict(is_training: bool, reason: str) -> Verdict:
+            return Verdict(is_training, reason, name, cmdline, now)
+
+        # "/opt/conda/bin/python train.py --report_to tensorboard" exclude'a takılmamalı
+        if self._exclude is not None and self._exclude.search(self._program(argv, name)):
+            return verdict(False, 'exclude')
+        if self._cmdline is not None and self._cmdline.search(cmdline):
+            return verdict(True, 'cmdline')
+        if self._exe is not None:
+            try:
+                exe = proc.exe()
+            except psutil.AccessDenied:
+                exe = ''
+            if exe and self._exe.search(exe):
+                return verdict(True, 'exe')
+        if self._is_interpreter(name):
+            reason = self._runtime_reason(proc.pid)
+            if reason:
+                return verdict(True, reason)
+        return verdict(False, '')
+
+    # Değer alan yorumlayıcı seçenekleri (python -W ignore train.py)
+    _OPTIONS_WITH_VALUE = ('-W', '-X', '-Q')
+
+    def _program(self, argv: List[str], name: str) -> str:
+        """
+        Çalıştırılan program: argv[0]'ın adı, yorumlayıcıda ek olarak script
+        adı veya -m modülü (ör. "python3 jupyter-lab", "python -m ipykernel_launcher")
+        """
+        if not argv:
+            return name
+        program = os.path.basename(argv[0])
+        if not self._is_interpreter(program):
+            return program
+        args = iter(argv[1:])
+        for arg in args:
+            if arg == '-m':
+                return f'{program} -m {next(args, "")}'
+            if arg.startswith('-m'):
+                return f'{program} -m {arg[2:]}'
+            if arg == '-c':
+                break
+            if arg in self._OPTIONS_WITH_VALUE:
+                next(args, None)
+            elif not arg.startswith('-'):
+                return f'{program} {os.path.basename(arg)}'
+        return program
+
+    def _is_interpreter(self, name: str) -> bool:
+        return self._interpreters is not None and bool(self._interpreters.search(name))
+
+    def _runtime_reason(self, pid: int) -> str:
+        """Yüklü CUDA kütüphaneleri ve ortam değişkenleri (okunamazsa "")"""
+        if self._cuda_libs is not None:
+            maps = self._read(pid, 'maps')
+            if maps and self._cuda_libs.search(maps):
+                return 'cuda_libs'
+        if self._env is not None:
+            environ = self._read(pid, 'environ')
+            if environ and self._env.search(environ):
+                return 'env'
+        return ''
+
+    def _read(self, pid: int, name: str) -> bytes:
+        try:
+            with open(f'{self.proc_root}/{pid}/{name}', 'rb') as f:
+                return f.read()
+        except OSError:
+            return b''
+
+    # ---------- cache ----------
+
+    def retain(self, alive: Iterable[ProcessKey]):
+        """Verilen anahtarlar dışındaki (çıkmış) process kararlarını bırak"""
+        alive = set(alive)
+        with self._lock:
+            for key in [key for key in self._verdicts if key not in alive]:
+                del self._verdicts[key]
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Cache boyutu ve pozitif karar sayısı"""
+        with self._lock:
+            return {
+                'size': len(self._verdicts),
+                'training': sum(1 for v in self._verdicts.values() if v.is_training),
+            }
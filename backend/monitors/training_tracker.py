@@ -4,11 +4,14 @@ GPU training process'lerini takip et
 """
 
 import psutil
-import subprocess
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
-import re
+
+from .gpu_monitor import GPUMonitor
+from .gpu_process_index import GPUProcessIndex
+from .process_cache import ProcessCache
+from .training_classifier import TrainingClassifier
 
 
 @dataclass
@@ -27,100 +30,91 @@ class TrainingJob:
     threads: int
     io_read_mb: float  # MB
     io_write_mb: float  # MB
+    io_read_mb_s: float = 0.0  # MB/s, önceki turdan bu yana
+    io_write_mb_s: float = 0.0  # MB/s
+    create_time: float = 0.0  # psutil create_time, pid ile birlikte job anahtarı
+    detected_by: str = ''  # Eşleşen sınıflandırma kuralı
+    # JobEnergyAccountant tarafından doldurulur
+    power_w: float = 0.0
+    energy_wh: float = 0.0
+    energy_cost: float = 0.0  # TL
+    cost_per_hour: float = 0.0  # TL, anlık güçle
+    # LogTailer tarafından doldurulur (JobProgress)
+    progress: Optional[Any] = None
 
 
 class TrainingTracker:
     """Training Job Tracking"""
     
-    # Training framework'leri tanı
-    TRAINING_FRAMEWORKS = [
-        'python', 'pytorch', 'tensorflow', 'torch', 'cuda',
-        'train', 'training', 'model', 'fit', 'learn'
-    ]
+    # GPU process index'i bu yaştan eskiyse yeniden sorgulanır (saniye)
+    GPU_INDEX_MAX_AGE = 2.0
     
-    def __init__(self):
+    def __init__(self, gpu_monitor: Optional[GPUMonitor] = None,
+                 classifier: Optional[TrainingClassifier] = None):
+        """
+        Args:
+            gpu_monitor: GPU process index'ini paylaşan monitor; verilmezse
+                         kendi GPUMonitor'ını oluşturur
+            classifier: Training process sınıflandırıcısı; verilmezse
+                        varsayılan kurallarla oluşturulur
+        """
         self.training_jobs: Dict[int, TrainingJob] = {}
+        self.gpu_monitor = gpu_monitor if gpu_monitor is not None else GPUMonitor()
+        self.process_cache = ProcessCache()
+        self.classifier = classifier if classifier is not None else TrainingClassifier()
     
     def detect_training_processes(self) -> List[TrainingJob]:
         """Training process'lerini tespit et"""
         training_jobs = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'status']):
+        # Tüm job'lar için tek GPU process index'i (process başına fork yok)
+        gpu_processes = self.gpu_monitor.get_process_index(self.GPU_INDEX_MAX_AGE)
+        
+        # Sadece pid ve create_time; ad ve komut satırı yalnızca yeni
+        # process'ler için sınıflandırıcıda okunur
+        alive = []
+        for proc in psutil.process_iter(['create_time']):
             try:
-                pid = proc.pid
-                name = proc.name()
-                cmdline = ' '.join(proc.cmdline()) if proc.cmdline() else ''
-                status = proc.status()
+                create_time = proc.info['create_time']
+                alive.append((proc.pid, create_time))
+                verdict = self.classifier.classify(proc, create_time, gpu_processes)
+                if not verdict.is_training:
+                    continue
                 
-                # Training process mi?
-                if self._is_training_process(name, cmdline):
-                    job = self._create_training_job(proc, name, cmdline, status)
-                    if job:
-                        training_jobs.append(job)
-                        self.training_jobs[pid] = job
+                job = self._create_training_job(
+                    proc.pid, create_time, verdict.name, verdict.cmdline,
+                    proc.status(), gpu_processes
+                )
+                if job:
+                    job.detected_by = verdict.reason
+                    training_jobs.append(job)
             
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
         
-        # Kayıtlı işleri kontrol et (silinen işleri kaldır)
-        dead_pids = [pid for pid in self.training_jobs if pid not in [j.pid for j in training_jobs]]
-        for pid in dead_pids:
-            del self.training_jobs[pid]
+        # Kayıtlı işleri güncelle, çıkan process'leri cache'lerden bırak
+        self.training_jobs = {job.pid: job for job in training_jobs}
+        self.process_cache.retain((job.pid, job.create_time) for job in training_jobs)
+        self.classifier.retain(alive)
         
         return training_jobs
     
-    def _is_training_process(self, name: str, cmdline: str) -> bool:
-        """Process'in training işi olup olmadığını kontrol et"""
-        combined = (name + ' ' + cmdline).lower()
-        
-        # Python script'leri ve training framework'lerini ara
-        if 'python' in combined:
-            for keyword in self.TRAINING_FRAMEWORKS:
-                if keyword in combined:
-                    return True
-        
-        # Doğrudan training framework komutları
-        for keyword in ['pytorch', 'tensorflow', 'torch']:
-            if keyword in combined:
-                return True
-        
-        return False
-    
-    def _create_training_job(self, proc: psutil.Process, name: str, 
-                           cmdline: str, status: str) -> Optional[TrainingJob]:
+    def _create_training_job(self, pid: int, create_time: float, name: str,
+                           cmdline: str, status: str,
+                           gpu_processes: GPUProcessIndex) -> Optional[TrainingJob]:
         """Training Job nesnesi oluştur"""
         try:
-            # Temel bilgiler
-            pid = proc.pid
-            
-            # CPU ve Memory
+            # CPU, bellek, thread ve I/O: cache'li Process, tek oneshot, bekleme yok
             try:
-                cpu_percent = proc.cpu_percent(interval=0.1)
-                memory_info = proc.memory_info()
-                memory_mb = memory_info.rss / (1024 * 1024)
-                memory_percent = proc.memory_percent()
-            except:
-                cpu_percent = 0
-                memory_mb = 0
-                memory_percent = 0
-            
-            # GPU Memory (nvidia-smi'dan)
-            gpu_index, gpu_memory_mb = self._get_gpu_memory_for_process(pid)
+                sample = self.process_cache.sample(pid, create_time)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                return None  # Tarama sırasında çıktı
+            except psutil.AccessDenied:
+                sample = None
             
-            # Thread sayısı
-            try:
-                threads = proc.num_threads()
-            except:
-                threads = 0
-            
-            # I/O istatistikleri
-            try:
-                io_counters = proc.io_counters()
-                io_read_mb = io_counters.read_bytes / (1024 * 1024)
-                io_write_mb = io_counters.write_bytes / (1024 * 1024)
-            except:
-                io_read_mb = 0
-                io_write_mb = 0
+            # GPU Memory (turun process index'inden)
+            gpu_proc = gpu_processes.lookup(pid)
+            gpu_memory_mb = gpu_proc.used_memory_mb if gpu_proc else 0.0
             
             # Status map
             status_map = {
@@ -136,82 +130,24 @@ class TrainingTracker:
                 process_name=name,
                 command=cmdline,
                 status=status_map.get(status, status),
-                start_time=datetime.fromtimestamp(proc.create_time()).isoformat(),
-                cpu_percent=cpu_percent,
-                memory_mb=memory_mb,
-                memory_percent=memory_percent,
-                gpu_index=gpu_index,
+                start_time=datetime.fromtimestamp(create_time).isoformat(),
+                cpu_percent=sample.cpu_percent if sample else 0.0,
+                memory_mb=sample.memory_mb if sample else 0.0,
+                memory_percent=sample.memory_percent if sample else 0.0,
+                gpu_index=gpu_proc.gpu_index if gpu_proc else None,
                 gpu_memory_mb=gpu_memory_mb,
-                threads=threads,
-                io_read_mb=io_read_mb,
-                io_write_mb=io_write_mb,
+                threads=sample.threads if sample else 0,
+                io_read_mb=sample.io_read_mb if sample else 0.0,
+                io_write_mb=sample.io_write_mb if sample else 0.0,
+                io_read_mb_s=sample.io_read_mb_s if sample else 0.0,
+                io_write_mb_s=sample.io_write_mb_s if sample else 0.0,
+                create_time=create_time,
             )
         
         except Exception as e:
             print(f"Training job oluşturulamadı: {e}")
             return None
     
-    def _get_gpu_memory_for_process(self, pid: int) -> tuple[Optional[int], float]:
-        """Process'in GPU memory kullanımını al"""
-        try:
-            result = subprocess.run([
-                'nvidia-smi',
-                '--query-compute-apps=pid,gpu_uuid,used_memory',
-                '--format=csv,noheader,nounits'
-            ], capture_output=True, text=True, check=True)
-            
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 3:
-                    try:
-                        proc_pid = int(parts[0])
-                        gpu_uuid = parts[1]
-                        memory_mb = float(parts[2])
-                        
-                        if proc_pid == pid:
-                            # GPU UUID'den index'i bul
-                            gpu_index = self._get_gpu_index_from_uuid(gpu_uuid)
-                            return gpu_index, memory_mb
-                    except ValueError:
-                        pass
-        
-        except Exception as e:
-            print(f"GPU memory alınamadı: {e}")
-        
-        return None, 0.0
-    
-    def _get_gpu_index_from_uuid(self, gpu_uuid: str) -> Optional[int]:
-        """GPU UUID'den index'i bul"""
-        try:
-            result = subprocess.run([
-                'nvidia-smi',
-                '--query-gpu=index,gpu_uuid',
-                '--format=csv,noheader'
-            ], capture_output=True, text=True, check=True)
-            
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 2:
-                    try:
-                        index = int(parts[0])
-                        uuid = parts[1]
-                        
-                        if uuid == gpu_uuid:
-                            return index
-                    except ValueError:
-                        pass
-        
-        except Exception:
-            pass
-        
-        return None
-    
     def get_job_by_pid(self, pid: int) -> Optional[TrainingJob]:
         """PID'den training job'ı al"""
         return self.training_jobs.get(pid)
@@ -258,6 +194,7 @@ class TrainingTracker:
                     'command': job.command,
                     'status': job.status,
                     'start_time': job.start_time,
+                    'detected_by': job.detected_by,
                     'cpu': {
                         'percent': round(job.cpu_percent, 2)
                     },
@@ -272,7 +209,16 @@ class TrainingTracker:
                     'threads': job.threads,
                     'io': {
                         'read_mb': round(job.io_read_mb, 2),
-                        'write_mb': round(job.io_write_mb, 2)
+                        'write_mb': round(job.io_write_mb, 2),
+                        'read_mb_s': round(job.io_read_mb_s, 2),
+                        'write_mb_s': round(job.io_write_mb_s, 2)
+                    },
+                    'progress': job.progress.to_dict() if job.progress else None,
+                    'energy': {
+                        'power_w': round(job.power_w, 2),
+                        'energy_kwh': round(job.energy_wh / 1000, 4),
+                        'cost_try': round(job.energy_cost, 2),
+                        'cost_per_hour_try': round(job.cost_per_hour, 2)
                     }
                 } for job in jobs
             ]
@@ -0,0 +1,22 @@
+"""
+Servisler Paketi
+"""
+
+from .scheduler import CollectorScheduler, Snapshot
+from .history import MetricsHistory
+from .tsdb import TimeSeriesStore
+from .broadcast_hub import BroadcastHub
+from .wire import WireResponse
+from .response_cache import ResponseCache
+from .perf import PerfRegistry
+
+__all__ = [
+    'CollectorScheduler',
+    'Snapshot',
+    'MetricsHistory',
+    'TimeSeriesStore',
+    'BroadcastHub',
+    'WireResponse',
+    'ResponseCache',
+    'PerfRegistry',
+]
@@ -0,0 +1,389 @@
+"""
+WebSocket Yayın Modülü
+Topic bazlı pub/sub: her topic'in payload'ı tur başına bir kez serialize
+edilir ve aynı frame tüm abonelere dağıtılır. Her client'ın sınırlı bir
+kuyruğu vardır; yavaş client'larda en eski frame düşer.
+
+Stream modunda abone önce tam keyframe, sonra sadece değişen yolları içeren
+delta frame'leri alır. Frame'lerdeki seq ile client boşluk fark ederse
+"resync" ister; kuyrukta frame düşen client'a sunucu kendiliğinden keyframe
+gönderir.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .json_delta import diff
+from .perf import registry as perf
+from .scheduler import Snapshot
+from .wire import JSON, Frame, encode_frame
+
+
+# Topic -> kaynak snapshot
+TOPIC_SOURCES = {
+    'system': 'system',
+    'gpu': 'system',
+    'energy': 'energy',
+    'ports': 'ports',
+    'training': 'training',
+    'network': 'network',
+}
+TOPICS = tuple(TOPIC_SOURCES)
+
+# Composite ("all" / "periodic") mesajındaki snapshot'lar
+COMPOSITE_SOURCES = ('system', 'energy', 'ports', 'training', 'network')
+
+
+def _topic_payload(topic: str, snapshot: Snapshot) -> Any:
+    """Snapshot'tan topic payload'ı"""
+    if topic == 'gpu':
+        return {
+            'timestamp': snapshot.data.get('timestamp'),
+            'gpus': snapshot.data.get('gpus', []),
+        }
+    return snapshot.data
+
+
+class _DeltaState:
+    """Stream modundaki bir topic'in son gönderilen hali"""
+
+    __slots__ = ('version', 'seq', 'payload', 'ops', 'delta', 'keyframe')
+
+    def __init__(self, version: int, seq: int, payload: Any, ops: Optional[List[Dict[str, Any]]]):
+        self.version = version
+        self.seq = seq
+        self.payload = payload
+        self.ops = ops  # None: bu seq'te herkese keyframe gider
+        self.delta: Dict[str, Frame] = {}  # media type -> frame
+        self.keyframe: Dict[str, Frame] = {}
+
+
+class Subscriber:
+    """Tek bağlantı: abonelikler, sınırlı kuyruk ve gönderici task"""
+
+    def __init__(self, send: Callable[[Frame], Awaitable[None]], queue_size: int,
+                 media_type: str = JSON):
+        self.send = send
+        self.media_type = media_type  # Bağlantıda anlaşılan wire formatı
+        self.topics: Set[str] = set()
+        self.streams: Set[str] = set()  # Delta modundaki topic'ler
+        self.stale: Set[str] = set()  # Sıradaki turda keyframe bekleyen stream'ler
+        self.queue: deque = deque(maxlen=queue_size)
+        self.dropped = 0
+        self.sent = 0
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def offer(self, frame: Frame, topic: Optional[str] = None):
+        """Frame'i kuyruğa ekle; kuyruk doluysa en eskisi düşer"""
+        if len(self.queue) == self.queue.maxlen:
+            dropped_topic, _ = self.queue[0]
+            if dropped_topic in self.streams:
+                # Delta zinciri koptu, bir sonraki frame keyframe olmalı
+                self.stale.add(dropped_topic)
+            self.dropped += 1
+        self.queue.append((topic, frame))
+        self._ready.set()
+
+    async def _run(self):
+        """Kuyruktaki frame'leri sırayla gönder"""
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                _, frame = self.queue.popleft()
+                await self.send(frame)
+                self.sent += 1
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name='ws-sender')
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def failed(self) -> Optional[BaseException]:
+        """Gönderici task hata ile bittiyse hatası (bağlantı koptu)"""
+        if self._task is not None and self._task.done() and not self._task.cancelled():
+            return self._task.exception()
+        return None
+
+
+class BroadcastHub:
+    """Topic bazlı yayın merkezi"""
+
+    # Client başına kuyrukta bekleyebilecek frame sayısı
+    QUEUE_SIZE = 32
+    # Stream modunda her N değişiklikte bir delta yerine keyframe gönderilir
+    KEYFRAME_EVERY = 60
+    # Composite frame'in ilk snapshot'ları bekleyeceği en uzun süre (saniye)
+    COMPOSITE_DEADLINE = 2.0
+
+    def __init__(self, scheduler, queue_size: Optional[int] = None):
+        """
+        Args:
+            scheduler: Snapshot kaynağı (CollectorScheduler)
+            queue_size: Client başına kuyruk boyutu
+        """
+        self.scheduler = scheduler
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.subscribers: Set[Subscriber] = set()
+        self._by_topic: Dict[str, Set[Subscriber]] = {topic: set() for topic in TOPICS}
+        self._streamers: Dict[str, Set[Subscriber]] = {topic: set() for topic in TOPICS}
+        self._deltas: Dict[str, _DeltaState] = {}
+        # topic -> (snapshot versiyonu, {media type: serialize edilmiş frame})
+        self._frames: Dict[str, Tuple[int, Dict[str, Frame]]] = {}
+        self._composite: Dict[Tuple[str, str], Tuple[Tuple, Frame]] = {}
+
+    # ---------- serialize (versiyon başına bir kez) ----------
+
+    def topic_frame(self, topic: str, media_type: str = JSON) -> Optional[Frame]:
+        """Topic'in son snapshot'ının frame'i (henüz snapshot yoksa None)"""
+        snapshot = self.scheduler.get(TOPIC_SOURCES[topic])
+        if snapshot is None:
+            return None
+        cached = self._frames.get(topic)
+        if cached is None or cached[0] != snapshot.version:
+            cached = self._frames[topic] = (snapshot.version, {})
+        frame = cached[1].get(media_type)
+        if frame is None:
+            frame = cached[1][media_type] = encode_frame({
+                'type': topic,
+                'version': snapshot.version,
+                'data': _topic_payload(topic, snapshot),
+            }, media_type)
+        return frame
+
+    async def composite_frame(self, message_type: str, media_type: str = JSON) -> Frame:
+        """
+        Tüm snapshot'ları içeren frame ("all", "periodic")
+
+        COMPOSITE_DEADLINE içinde ilk snapshot'ı gelmeyen bölüm None olur ve
+        frame "partial" işaretlenir; "meta" her bölümün stale / hata
+        durumunu taşır. Yavaş bir collector yanıtı bekletmez.
+        """
+        snapshots = await self.scheduler.gather(COMPOSITE_SOURCES, self.COMPOSITE_DEADLINE)
+        meta = {}
+        for name in COMPOSITE_SOURCES:
+            status = self.scheduler.status(name)
+            meta[name] = {'version': status['version'], 'stale': status['stale'], 'error': status['error']}
+        key = (message_type, media_type)
+        versions = tuple((item['version'], item['stale'], item['error']) for item in meta.values())
+        cached = self._composite.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        frame = encode_frame({
+            'type': message_type,
+            'data': {name: snapshot.data if snapshot is not None else None
+                     for name, snapshot in snapshots.items()},
+            'partial': any(snapshot is None for snapshot in snapshots.values()),
+            'meta': meta,
+        }, media_type)
+        self._composite[key] = (versions, frame)
+        return frame
+
+    # ---------- delta stream ----------
+
+    def _advance(self, topic: str) -> Optional[_DeltaState]:
+        """
+        Topic'in delta durumunu son snapshot'a ilerlet
+
+        Payload değişmediyse seq artmaz ve ops boş kalır; ilk durumda, her
+        KEYFRAME_EVERY değişiklikte ve delta keyframe'den büyükse ops None
+        olur (keyframe turu).
+        """
+        snapshot = self.scheduler.get(TOPIC_SOURCES[topic])
+        if snapshot is None:
+            return None
+        state = self._deltas.get(topic)
+        if state is not None and state.version == snapshot.version:
+            return state
+        payload = _topic_payload(topic, snapshot)
+        if state is None:
+            state = _DeltaState(snapshot.version, 1, payload, None)
+        else:
+            started = time.perf_counter()
+            ops = diff(state.payload, payload)
+            perf.observe('delta', topic, time.perf_counter() - started)
+            if not ops:
+                state.version = snapshot.version
+                state.ops = []
+                return state
+            seq = state.seq + 1
+            state = _DeltaState(snapshot.version, seq, payload,
+                                None if seq % self.KEYFRAME_EVERY == 0 else ops)
+            # Neredeyse her alanı değişen payload'da delta keyframe'den büyük olabilir
+            if state.ops is not None and len(self._delta(topic, state)) >= len(self._keyframe(topic, state)):
+                state.ops = None
+        self._deltas[topic] = state
+        return state
+
+    def _keyframe(self, topic: str, state: _DeltaState, media_type: str = JSON) -> Frame:
+        frame = state.keyframe.get(media_type)
+        if frame is None:
+            frame = state.keyframe[media_type] = encode_frame({
+                'type': 'keyframe',
+                'topic': topic,
+                'seq': state.seq,
+                'version': state.version,
+                'data': state.payload,
+            }, media_type)
+        return frame
+
+    def _delta(self, topic: str, state: _DeltaState, media_type: str = JSON) -> Frame:
+        frame = state.delta.get(media_type)
+        if frame is None:
+            frame = state.delta[media_type] = encode_frame({
+                'type': 'delta',
+                'topic': topic,
+                'seq': state.seq,
+                'version': state.version,
+                'ops': state.ops,
+            }, media_type)
+        return frame
+
+    def _publish_stream(self, topic: str):
+        """Stream abonelerine delta (veya gerekiyorsa keyframe) gönder"""
+        state = self._advance(topic)
+        if state is None:
+            return
+        for subscriber in self._streamers[topic]:
+            if topic in subscriber.stale or state.ops is None:
+                subscriber.stale.discard(topic)
+                subscriber.offer(self._keyframe(topic, state, subscriber.media_type), topic)
+            elif state.ops:
+                subscriber.offer(self._delta(topic, state, subscriber.media_type), topic)
+
+    # ---------- yayın ----------
+
+    def on_snapshot(self, snapshot: Snapshot):
+        """Scheduler listener'ı: snapshot'a bağlı topic'leri abonelere dağıt"""
+        for topic, source in TOPIC_SOURCES.items():
+            if source != snapshot.name:
+                continue
+            if self._streamers[topic]:
+                self._publish_stream(topic)
+            subscribers = self._by_topic[topic]
+            if not subscribers:
+                continue  # Abonesi olmayan topic serialize edilmez
+            for subscriber in subscribers:
+                # Her format tur başına bir kez serialize edilir (topic_frame cache'i)
+                subscriber.offer(self.topic_frame(topic, subscriber.media_type), topic)
+
+    # ---------- bağlantılar ----------
+
+    def connect(self, send: Callable[[Frame], Awaitable[None]], media_type: str = JSON) -> Subscriber:
+        """Yeni bağlantı için subscriber oluştur ve gönderici task'ı başlat"""
+        subscriber = Subscriber(send, self.queue_size, media_type)
+        subscriber.start()
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    async def disconnect(self, subscriber: Subscriber):
+        """Bağlantıyı tüm topic'lerden çıkar"""
+        self.unsubscribe(subscriber, TOPICS)
+        self.subscribers.discard(subscriber)
+        await subscriber.stop()
+
+    @staticmethod
+    def _check_topics(topics: Iterable[str]) -> List[str]:
+        """
+        Raises:
+            ValueError: Bilinmeyen topic
+        """
+        topics = list(topics)
+        unknown = [topic for topic in topics if topic not in TOPIC_SOURCES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen topic: {', '.join(unknown)}")
+        return topics
+
+    def subscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> List[str]:
+        """
+        Topic'lere tam frame modunda abone et; son frame hemen gönderilir
+
+        Raises:
+            ValueError: Bilinmeyen topic
+        """
+        for topic in self._check_topics(topics):
+            if topic in subscriber.topics:
+                continue
+            self._remove_stream(subscriber, topic)
+            subscriber.topics.add(topic)
+            self._by_topic[topic].add(subscriber)
+            frame = self.topic_frame(topic, subscriber.media_type)
+            if frame is not None:
+                subscriber.offer(frame, topic)
+        return sorted(subscriber.topics | subscriber.streams)
+
+    def stream(self, subscriber: Subscriber, topics: Iterable[str]) -> List[str]:
+        """
+        Topic'lere delta modunda abone et; önce keyframe gönderilir
+
+        Raises:
+            ValueError: Bilinmeyen topic
+        """
+        for topic in self._check_topics(topics):
+            if topic in subscriber.streams:
+                continue
+            subscriber.topics.discard(topic)
+            self._by_topic[topic].discard(subscriber)
+            subscriber.streams.add(topic)
+            self._streamers[topic].add(subscriber)
+            self.resync(subscriber, [topic])
+        return sorted(subscriber.topics | subscriber.streams)
+
+    def resync(self, subscriber: Subscriber, topics: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Stream topic'leri için güncel keyframe'i hemen gönder
+
+        Args:
+            topics: Verilmezse client'ın tüm stream'leri
+        """
+        topics = subscriber.streams if topics is None else self._check_topics(topics)
+        resynced = []
+        for topic in topics:
+            if topic not in subscriber.streams:
+                continue
+            state = self._advance(topic)
+            if state is None:
+                subscriber.stale.add(topic)  # İlk snapshot'ta keyframe gider
+            else:
+                subscriber.stale.discard(topic)
+                subscriber.offer(self._keyframe(topic, state, subscriber.media_type), topic)
+            resynced.append(topic)
+        return sorted(resynced)
+
+    def _remove_stream(self, subscriber: Subscriber, topic: str):
+        subscriber.streams.discard(topic)
+        subscriber.stale.discard(topic)
+        self._streamers[topic].discard(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> List[str]:
+        """Topic aboneliklerini (tam frame ve stream) kaldır"""
+        for topic in topics:
+            if topic not in TOPIC_SOURCES:
+                continue
+            subscriber.topics.discard(topic)
+            self._by_topic[topic].discard(subscriber)
+            self._remove_stream(subscriber, topic)
+        return sorted(subscriber.topics | subscriber.streams)
+
+    def stats(self) -> Dict[str, Any]:
+        """Bağlantı, abone ve kuyruk istatistikleri"""
+        depths = [len(sub.queue) for sub in self.subscribers]
+        return {
+            'connections': len(self.subscribers),
+            'subscribers': {topic: len(subs) for topic, subs in self._by_topic.items()},
+            'streams': {topic: len(subs) for topic, subs in self._streamers.items()},
+            'seq': {topic: state.seq for topic, state in self._deltas.items()},
+            'queued': sum(depths),
+            'max_queued': max(depths, default=0),
+            'queue_size': self.queue_size,
+            'sent': sum(sub.sent for sub in self.subscribers),
+            'dropped': sum(sub.dropped for sub in self.subscribers),
+        }
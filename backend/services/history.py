@@ -0,0 +1,196 @@
+"""
+Metrik Geçmişi Modülü
+Sabit boyutlu ring buffer'larda çok çözünürlüklü (1s, 10s, 1m, 10m)
+min/max/ortalama geçmişi tutar; bellek kullanımı çalışma süresinden bağımsızdır
+"""
+
+import math
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RollupTier:
+    """
+    Tek çözünürlük katmanı
+
+    Her slot bir zaman kovasıdır; slot indeksi kova numarasının mod'u olduğu
+    için eski veriler kendiliğinden üzerine yazılır. Her kovanın hangi zamana
+    ait olduğu ayrı tutulur, böylece boş kalan kovalar okunurken atlanır.
+    """
+
+    def __init__(self, step: int, size: int):
+        self.step = step
+        self.size = size
+        self.buckets = array('q', [-1]) * size  # kova numarası (ts // step)
+        self.mins = array('f', [0.0]) * size
+        self.maxs = array('f', [0.0]) * size
+        self.sums = array('d', [0.0]) * size
+        self.counts = array('H', [0]) * size
+
+    @property
+    def span(self) -> int:
+        """Katmanın kapsadığı süre (saniye)"""
+        return self.step * self.size
+
+    def add(self, timestamp: float, value: float):
+        """Değeri ilgili kovaya ekle (O(1))"""
+        bucket = int(timestamp // self.step)
+        i = bucket % self.size
+        if self.buckets[i] != bucket:
+            self.buckets[i] = bucket
+            self.mins[i] = value
+            self.maxs[i] = value
+            self.sums[i] = value
+            self.counts[i] = 1
+            return
+
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+        self.sums[i] += value
+        if self.counts[i] < 0xFFFF:
+            self.counts[i] += 1
+
+    def read(self, start: float, end: float):
+        """[start, end) aralığındaki dolu kovaları üret: (kova başı, min, max, sum, count)"""
+        first = int(start // self.step)
+        last = int(end // self.step)
+        # Ring buffer'dan eski olan kısmı okumaya gerek yok
+        first = max(first, last - self.size + 1)
+        for bucket in range(first, last + 1):
+            i = bucket % self.size
+            if self.buckets[i] == bucket and self.counts[i]:
+                yield bucket * self.step, self.mins[i], self.maxs[i], self.sums[i], self.counts[i]
+
+
+class MetricSeries:
+    """Tek metriğin tüm katmanları"""
+
+    def __init__(self, tiers: Tuple[Tuple[int, int], ...]):
+        self.tiers = [RollupTier(step, size) for step, size in tiers]
+        self.first_timestamp: Optional[float] = None
+
+    def add(self, timestamp: float, value: float):
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        for tier in self.tiers:
+            tier.add(timestamp, value)
+
+
+class MetricsHistory:
+    """Bellek içi, sabit boyutlu metrik geçmişi"""
+
+    # (adım saniye, slot sayısı): 1s x 1 saat, 10s x 6 saat, 1dk x 2 gün, 10dk x 30 gün
+    TIERS = ((1, 3600), (10, 2160), (60, 2880), (600, 4320))
+
+    # Yeni metrik oluşturma sınırı (bellek üst sınırı için)
+    MAX_METRICS = 256
+
+    # step verilmezse hedeflenen nokta sayısı
+    DEFAULT_POINTS = 300
+    # Tek sorguda dönülecek en fazla nokta
+    MAX_POINTS = 5000
+
+    def __init__(self, tiers: Tuple[Tuple[int, int], ...] = None):
+        self.tier_spec = tiers or self.TIERS
+        self.series: Dict[str, MetricSeries] = {}
+
+    def record(self, timestamp: float, values: Dict[str, float]):
+        """Bir örnekteki tüm metrikleri kaydet"""
+        for name, value in values.items():
+            if value is None or math.isnan(value):
+                continue
+            series = self.series.get(name)
+            if series is None:
+                if len(self.series) >= self.MAX_METRICS:
+                    continue
+                series = self.series[name] = MetricSeries(self.tier_spec)
+            series.add(timestamp, float(value))
+
+    def metrics(self) -> List[str]:
+        """Kayıtlı metrik adları"""
+        return sorted(self.series)
+
+    def covers(self, metric: str, range_s: float, now: Optional[float] = None) -> bool:
+        """İstenen aralığın tamamı bu süreç çalışırken mi kaydedildi"""
+        series = self.series.get(metric)
+        if series is None or series.first_timestamp is None:
+            return False
+        now = now if now is not None else time.time()
+        return series.first_timestamp <= now - range_s
+
+    def _pick_tier(self, series: MetricSeries, range_s: float,
+                   step_s: Optional[float]) -> RollupTier:
+        """Aralığı kapsayan ve adımı aşmayan en kaba katmanı seç"""
+        covering = [tier for tier in series.tiers if tier.span >= range_s] or [series.tiers[-1]]
+        if step_s is None:
+            step_s = range_s / self.DEFAULT_POINTS
+        fitting = [tier for tier in covering if tier.step <= step_s]
+        return fitting[-1] if fitting else covering[0]
+
+    def query(self, metric: str, range_s: float = 3600, step_s: Optional[float] = None,
+              now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Grafiğe hazır seri döndür
+
+        Args:
+            metric: Metrik adı (ör. "cpu.percent", "gpu.0.temperature")
+            range_s: Geriye doğru süre (saniye)
+            step_s: Nokta aralığı (saniye); verilmezse ~300 noktaya göre seçilir
+            now: Bitiş zamanı (varsayılan şimdi)
+
+        Returns:
+            Sütunsal seri: t, min, max, avg listeleri (boş kovalar None)
+        """
+        series = self.series.get(metric)
+        if series is None:
+            raise KeyError(metric)
+
+        now = now if now is not None else time.time()
+        tier = self._pick_tier(series, range_s, step_s)
+
+        # Çıkış adımı katman adımının katı olmalı, nokta sayısı sınırlı
+        target = step_s if step_s is not None else range_s / self.DEFAULT_POINTS
+        target = max(target, range_s / self.MAX_POINTS)
+        step = max(tier.step, int(math.ceil(target / tier.step)) * tier.step)
+
+        start = (int((now - range_s) // step) + 1) * step
+        points = int((now - start) // step) + 1
+        mins: List[Optional[float]] = [None] * points
+        maxs: List[Optional[float]] = [None] * points
+        sums = [0.0] * points
+        counts = [0] * points
+
+        for bucket_start, bmin, bmax, bsum, bcount in tier.read(start, now):
+            i = int((bucket_start - start) // step)
+            if i < 0 or i >= points:
+                continue
+            if mins[i] is None or bmin < mins[i]:
+                mins[i] = bmin
+            if maxs[i] is None or bmax > maxs[i]:
+                maxs[i] = bmax
+            sums[i] += bsum
+            counts[i] += bcount
+
+        return {
+            'metric': metric,
+            'step': step,
+            'resolution': tier.step,
+            'start': start,
+            'end': now,
+            't': [start + i * step for i in range(points)],
+            'avg': [round(sums[i] / counts[i], 3) if counts[i] else None for i in range(points)],
+            'min': [round(m, 3) if m is not None else None for m in mins],
+            'max': [round(m, 3) if m is not None else None for m in maxs],
+        }
+
+    def memory_bytes(self) -> int:
+        """Ring buffer'ların toplam boyutu"""
+        total = 0
+        for series in self.series.values():
+            for tier in series.tiers:
+                for arr in (tier.buckets, tier.mins, tier.maxs, tier.sums, tier.counts):
+                    total += arr.itemsize * len(arr)
+        return total
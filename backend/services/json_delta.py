@@ -0,0 +1,83 @@
+"""
+JSON Delta Modülü
+İki JSON ağacı arasındaki farkı JSON-Patch (RFC 6902) biçiminde
+add / remove / replace işlemleri olarak çıkarır
+"""
+
+from typing import Any, Dict, List
+
+
+def _escape(key: Any) -> str:
+    """JSON Pointer token'ı (RFC 6901)"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def diff(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    old'u new'e çeviren patch işlemleri
+
+    Dict'ler anahtar bazında, listeler indeks bazında karşılaştırılır; liste
+    kısalırsa sondaki elemanlar sondan başa doğru silinir, uzarsa eklenir.
+    Değişmez snapshot'larda aynı nesneye işaret eden dallar hiç gezilmez.
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, '', ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]):
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            child = f'{path}/{_escape(key)}'
+            if key in old:
+                _diff(old[key], value, child, ops)
+            else:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            _diff(old[index], new[index], f'{path}/{index}', ops)
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append({'op': 'remove', 'path': f'{path}/{index}'})
+        for index in range(common, len(new)):
+            ops.append({'op': 'add', 'path': f'{path}/{index}', 'value': new[index]})
+    elif type(old) is not type(new) or old != new:
+        # bool/int/float ayrımı korunur (True == 1 eşit sayılmaz)
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def apply(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """
+    Patch işlemlerini belgeye uygula (yerinde; kök değişirse yeni kök döner)
+
+    Raises:
+        KeyError, IndexError: Patch belgeye uymuyor
+    """
+    for op in ops:
+        path = op['path']
+        if path == '':
+            document = op['value']
+            continue
+        tokens = [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = int(last)
+            if op['op'] == 'add':
+                parent.insert(index, op['value'])
+            elif op['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = op['value']
+        elif op['op'] == 'remove':
+            del parent[last]
+        else:
+            parent[last] = op['value']
+    return document
@@ -0,0 +1,337 @@
+"""
+OpenMetrics Modülü
+Son snapshot'ları Prometheus'un okuyacağı OpenMetrics metin biçimine
+çevirir. Her snapshot'ın metin bloğu versiyonu başına bir kez üretilir;
+değişmeyen bloklar sonraki scrape'lerde aynen kullanılır.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .scheduler import Snapshot
+
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+# Accept'te OpenMetrics istemeyen (eski) scraper'lar için; charset'i Starlette ekler
+CONTENT_TYPE_TEXT = 'text/plain; version=0.0.4'
+
+_GB = 1024 ** 3
+_MB = 1024 ** 2
+
+# Aile adı -> (tip, birim, açıklama); sıralama çıktıdaki sıradır
+FAMILIES: Dict[str, Tuple[str, Optional[str], str]] = {
+    # system
+    'system_cpu_usage_percent': ('gauge', None, 'Toplam CPU kullanımı'),
+    'system_cpu_core_usage_percent': ('gauge', None, 'Çekirdek başına CPU kullanımı'),
+    'system_cpu_mode_percent': ('gauge', None, 'CPU zamanının moda göre dağılımı'),
+    'system_cpu_frequency_hertz': ('gauge', 'hertz', 'Anlık CPU frekansı'),
+    'system_cpu_temperature_celsius': ('gauge', 'celsius', 'CPU sıcaklığı'),
+    'system_memory_total_bytes': ('gauge', 'bytes', 'Toplam RAM'),
+    'system_memory_used_bytes': ('gauge', 'bytes', 'Kullanılan RAM'),
+    'system_memory_usage_percent': ('gauge', None, 'RAM kullanımı'),
+    'system_disk_total_bytes': ('gauge', 'bytes', 'Kök dosya sistemi boyutu'),
+    'system_disk_used_bytes': ('gauge', 'bytes', 'Kök dosya sisteminde kullanılan'),
+    'system_disk_usage_percent': ('gauge', None, 'Kök dosya sistemi kullanımı'),
+    'gpu': ('info', None, 'GPU kimliği (gpu etiketiyle diğer serilere bağlanır)'),
+    'gpu_utilization_percent': ('gauge', None, 'GPU kullanımı'),
+    'gpu_temperature_celsius': ('gauge', 'celsius', 'GPU sıcaklığı'),
+    'gpu_power_watts': ('gauge', 'watts', 'GPU güç tüketimi'),
+    'gpu_power_limit_watts': ('gauge', 'watts', 'GPU güç limiti'),
+    'gpu_memory_total_bytes': ('gauge', 'bytes', 'GPU belleği'),
+    'gpu_memory_used_bytes': ('gauge', 'bytes', 'Kullanılan GPU belleği'),
+    'gpu_compute_processes': ('gauge', None, 'GPU üzerindeki compute process sayısı'),
+    # energy
+    'energy_power_watts': ('gauge', 'watts', 'Tahmini toplam güç'),
+    'energy_price_try_per_kwh': ('gauge', None, 'Geçerli elektrik fiyatı (TL/kWh)'),
+    'energy_tariff': ('info', None, 'Aktif tarife'),
+    'energy_consumed_kwh': ('counter', None, 'Ölçülen toplam tüketim (kWh)'),
+    'energy_component_consumed_kwh': ('counter', None, 'Bileşen başına ölçülen tüketim (kWh)'),
+    'energy_cost_try': ('counter', None, 'Ölçülen toplam maliyet (TL)'),
+    'energy_period_consumed_kwh': ('gauge', None, 'Dönem içi tüketim (kWh)'),
+    'energy_period_cost_try': ('gauge', None, 'Dönem içi maliyet (TL)'),
+    # ports
+    'ports_listening': ('gauge', None, 'Dinlemedeki port sayısı'),
+    'ports_established': ('gauge', None, 'Kurulu bağlantı sayısı'),
+    'ports_foreign': ('gauge', None, 'Yerel ağ dışından bağlantı sayısı'),
+    'ports_foreign_alert': ('gauge', None, 'Yabancı bağlantı uyarısı (0/1)'),
+    'ports_connections': ('gauge', None, 'Karşı taraf kategorisine göre kurulu bağlantılar'),
+    # network
+    'network_receive_bytes_per_second': ('gauge', None, 'Arayüz alma hızı'),
+    'network_transmit_bytes_per_second': ('gauge', None, 'Arayüz gönderme hızı'),
+    'network_receive_bytes': ('counter', 'bytes', 'Arayüzden alınan toplam'),
+    'network_transmit_bytes': ('counter', 'bytes', 'Arayüzden gönderilen toplam'),
+    'network_receive_errors': ('counter', None, 'Alma hataları'),
+    'network_transmit_errors': ('counter', None, 'Gönderme hataları'),
+    # training
+    'training_jobs': ('gauge', None, 'Tespit edilen training job sayısı'),
+    'training_job_series_omitted': ('gauge', None, 'Seri sınırı nedeniyle yayınlanmayan job sayısı'),
+    'training_job_cpu_percent': ('gauge', None, 'Job CPU kullanımı'),
+    'training_job_memory_bytes': ('gauge', 'bytes', 'Job RSS belleği'),
+    'training_job_gpu_memory_bytes': ('gauge', 'bytes', 'Job GPU belleği'),
+    'training_job_power_watts': ('gauge', 'watts', 'Job payına düşen güç'),
+    'training_job_energy_kwh': ('counter', None, 'Job başlangıcından beri tüketim (kWh)'),
+    'training_job_cost_try': ('counter', None, 'Job başlangıcından beri maliyet (TL)'),
+    'training_job_io_read_bytes_per_second': ('gauge', None, 'Job disk okuma hızı'),
+    'training_job_io_write_bytes_per_second': ('gauge', None, 'Job disk yazma hızı'),
+    'training_job_step': ('gauge', None, 'Loglardan okunan son adım'),
+    'training_job_loss': ('gauge', None, 'Loglardan okunan son loss'),
+    'training_job_samples_per_second': ('gauge', None, 'Loglardan okunan örnek hızı (samples/s)'),
+    'training_job_steps_per_second': ('gauge', None, 'Adım (batch) hızı: logdaki it/s veya step artışı'),
+    # collector'lar
+    'system_monitor_snapshot_timestamp_seconds': ('gauge', 'seconds', 'Son snapshot zamanı (Unix)'),
+    'system_monitor_snapshot_version': ('gauge', None, 'Son snapshot versiyonu'),
+}
+
+
+_SAMPLE_SUFFIX = {'counter': '_total', 'info': '_info'}
+
+
+def _headers(openmetrics: bool) -> Dict[str, str]:
+    """
+    Aile başına TYPE / UNIT / HELP satırları
+
+    Prometheus 0.0.4 metninde UNIT ve info tipi yoktur; TYPE satırı örnek
+    adını (ör. *_total) taşır, info aileleri gauge olarak yazılır.
+    """
+    headers = {}
+    for name, (kind, unit, help_text) in FAMILIES.items():
+        if openmetrics:
+            lines = [f'# TYPE {name} {kind}']
+            if unit:
+                lines.append(f'# UNIT {name} {unit}')
+            lines.append(f'# HELP {name} {help_text}')
+        else:
+            sample_name = name + _SAMPLE_SUFFIX.get(kind, '')
+            lines = [
+                f'# HELP {sample_name} {help_text}',
+                f'# TYPE {sample_name} {"gauge" if kind == "info" else kind}',
+            ]
+        headers[name] = '\n'.join(lines) + '\n'
+    return headers
+
+
+# Sabit metadata satırları (şablon): format başına bir kez üretilir
+_HEADERS = {True: _headers(True), False: _headers(False)}
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+class _Block:
+    """Bir snapshot'tan üretilen aileler (her aile örnekleri bitişik)"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[str]] = {}
+        self._rendered: Dict[bool, str] = {}
+
+    def add(self, family: str, value: Any, labels: Optional[Dict[str, Any]] = None):
+        """Örnek ekle (değer None ise atlanır)"""
+        if value is None:
+            return
+        kind = FAMILIES[family][0]
+        name = family + _SAMPLE_SUFFIX.get(kind, '')
+        if labels:
+            label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            name = f'{name}{{{label_text}}}'
+        self._samples.setdefault(family, []).append(f'{name} {_format(value)}\n')
+
+    def render(self, openmetrics: bool = True) -> str:
+        text = self._rendered.get(openmetrics)
+        if text is None:
+            headers = _HEADERS[openmetrics]
+            parts = []
+            for family in FAMILIES:
+                samples = self._samples.get(family)
+                if samples:
+                    parts.append(headers[family])
+                    parts.extend(samples)
+            text = self._rendered[openmetrics] = ''.join(parts)
+        return text
+
+
+class OpenMetricsExporter:
+    """Scheduler snapshot'larından /metrics çıktısı"""
+
+    SOURCES = ('system', 'energy', 'ports', 'network', 'training')
+    # Etiket kardinalitesi sınırları
+    MAX_JOB_SERIES = 20
+    MAX_INTERFACES = 32
+
+    def __init__(self, scheduler):
+        """
+        Args:
+            scheduler: Snapshot kaynağı (CollectorScheduler)
+        """
+        self.scheduler = scheduler
+        self._blocks: Dict[str, Tuple[int, _Block]] = {}  # kaynak -> (versiyon, blok)
+        self._pages: Dict[bool, Tuple[Tuple[int, ...], bytes]] = {}  # format -> (versiyonlar, çıktı)
+
+    def render(self, openmetrics: bool = True) -> bytes:
+        """
+        Tüm metrikler; hiçbir snapshot değişmediyse önceki çıktı aynen döner
+
+        Args:
+            openmetrics: False ise Prometheus 0.0.4 metin formatı
+        """
+        snapshots = [self.scheduler.get(name) for name in self.SOURCES]
+        versions = tuple(snapshot.version if snapshot is not None else 0 for snapshot in snapshots)
+        cached_page = self._pages.get(openmetrics)
+        if cached_page is not None and cached_page[0] == versions:
+            return cached_page[1]
+
+        parts = []
+        for snapshot in snapshots:
+            if snapshot is None:
+                continue
+            cached = self._blocks.get(snapshot.name)
+            if cached is None or cached[0] != snapshot.version:
+                block = _Block()
+                getattr(self, f'_{snapshot.name}')(block, snapshot.data)
+                cached = self._blocks[snapshot.name] = (snapshot.version, block)
+            parts.append(cached[1].render(openmetrics))
+        parts.append(self._collectors(snapshots).render(openmetrics))
+        if openmetrics:
+            parts.append('# EOF\n')
+
+        page = ''.join(parts).encode('utf-8')
+        self._pages[openmetrics] = (versions, page)
+        return page
+
+    def _collectors(self, snapshots: Iterable[Optional[Snapshot]]) -> _Block:
+        block = _Block()
+        for snapshot in snapshots:
+            if snapshot is not None:
+                block.add('system_monitor_snapshot_timestamp_seconds', snapshot.timestamp,
+                          {'collector': snapshot.name})
+        for snapshot in snapshots:
+            if snapshot is not None:
+                block.add('system_monitor_snapshot_version', snapshot.version,
+                          {'collector': snapshot.name})
+        return block
+
+    # ---------- kaynaklar ----------
+
+    def _system(self, block: _Block, data: Dict[str, Any]):
+        cpu = data.get('cpu')
+        if cpu:
+            block.add('system_cpu_usage_percent', cpu['percent'])
+            for core, percent in enumerate(cpu.get('per_core', [])):
+                block.add('system_cpu_core_usage_percent', percent, {'core': core})
+            for mode, percent in cpu.get('modes', {}).items():
+                block.add('system_cpu_mode_percent', percent, {'mode': mode})
+            block.add('system_cpu_frequency_hertz', cpu['freq_ghz'] * 1e9)
+            if cpu.get('temp_c'):
+                block.add('system_cpu_temperature_celsius', cpu['temp_c'])
+        ram = data.get('ram')
+        if ram:
+            block.add('system_memory_total_bytes', round(ram['total_gb'] * _GB))
+            block.add('system_memory_used_bytes', round(ram['used_gb'] * _GB))
+            block.add('system_memory_usage_percent', ram['percent'])
+        disk = data.get('disk')
+        if disk:
+            block.add('system_disk_total_bytes', round(disk['total_gb'] * _GB))
+            block.add('system_disk_used_bytes', round(disk['used_gb'] * _GB))
+            block.add('system_disk_usage_percent', disk['percent'])
+        for gpu in data.get('gpus', []):
+            labels = {'gpu': gpu['index']}
+            block.add('gpu', 1, {'gpu': gpu['index'], 'uuid': gpu['uuid'], 'name': gpu['name']})
+            block.add('gpu_utilization_percent', gpu['utilization_percent'], labels)
+            block.add('gpu_temperature_celsius', gpu['temperature_c'], labels)
+            block.add('gpu_power_watts', gpu['power']['draw_w'], labels)
+            block.add('gpu_power_limit_watts', gpu['power']['limit_w'], labels)
+            block.add('gpu_memory_total_bytes', round(gpu['memory']['total_mb'] * _MB), labels)
+            block.add('gpu_memory_used_bytes', round(gpu['memory']['used_mb'] * _MB), labels)
+            block.add('gpu_compute_processes', len(gpu.get('compute_processes', [])), labels)
+
+    def _energy(self, block: _Block, data: Dict[str, Any]):
+        block.add('energy_power_watts', data.get('total_power_w'))
+        block.add('energy_price_try_per_kwh', data.get('electricity_price_per_kwh'))
+        if data.get('tariff'):
+            block.add('energy_tariff', 1, {'tariff': data['tariff']})
+        measured = data.get('measured') or {}
+        total = measured.get('total')
+        if total:
+            block.add('energy_consumed_kwh', total['kwh'])
+            block.add('energy_cost_try', total['cost_try'])
+            for component, kwh in total.get('components_kwh', {}).items():
+                block.add('energy_component_consumed_kwh', kwh, {'component': component})
+        for period in ('today', 'month', 'since_boot'):
+            bucket = measured.get(period)
+            if bucket:
+                block.add('energy_period_consumed_kwh', bucket['kwh'], {'period': period})
+                block.add('energy_period_cost_try', bucket['cost_try'], {'period': period})
+
+    def _ports(self, block: _Block, data: Dict[str, Any]):
+        block.add('ports_listening', data.get('total_listening'))
+        block.add('ports_established', data.get('total_established'))
+        block.add('ports_foreign', len(data.get('foreign_connections', [])))
+        block.add('ports_foreign_alert', bool(data.get('foreign_alert')))
+        categories: Dict[str, int] = {}
+        for connection in data.get('established_connections', []):
+            category = connection.get('remote_category') or 'unknown'
+            categories[category] = categories.get(category, 0) + 1
+        for category, count in sorted(categories.items()):
+            block.add('ports_connections', count, {'category': category})
+
+    def _network(self, block: _Block, data: Dict[str, Any]):
+        interfaces = sorted(
+            data.get('interfaces', []),
+            key=lambda item: item['rx']['total_bytes'] + item['tx']['total_bytes'],
+            reverse=True
+        )[:self.MAX_INTERFACES]
+        for family, direction, field in (
+            ('network_receive_bytes_per_second', 'rx', 'bytes_per_s'),
+            ('network_transmit_bytes_per_second', 'tx', 'bytes_per_s'),
+            ('network_receive_bytes', 'rx', 'total_bytes'),
+            ('network_transmit_bytes', 'tx', 'total_bytes'),
+            ('network_receive_errors', 'rx', 'errors'),
+            ('network_transmit_errors', 'tx', 'errors'),
+        ):
+            for interface in interfaces:
+                block.add(family, interface[direction][field], {'interface': interface['name']})
+
+    def _training(self, block: _Block, data: Dict[str, Any]):
+        jobs = data.get('jobs', [])
+        block.add('training_jobs', data.get('total_jobs', len(jobs)))
+        # pid etiketi kardinaliteyi büyütür: en çok güç / CPU kullanan N job
+        jobs = sorted(
+            jobs,
+            key=lambda job: (job['energy']['power_w'], job['cpu']['percent']),
+            reverse=True
+        )
+        block.add('training_job_series_omitted', max(0, len(jobs) - self.MAX_JOB_SERIES))
+        for job in jobs[:self.MAX_JOB_SERIES]:
+            gpu = job.get('gpu')
+            labels = {
+                'pid': job['pid'],
+                'name': job['process_name'],
+                'gpu': gpu['index'] if gpu else '',
+            }
+            progress = job.get('progress') or {}
+            block.add('training_job_cpu_percent', job['cpu']['percent'], labels)
+            block.add('training_job_memory_bytes', round(job['memory']['used_mb'] * _MB), labels)
+            if gpu:
+                block.add('training_job_gpu_memory_bytes', round(gpu['memory_mb'] * _MB), labels)
+            block.add('training_job_power_watts', job['energy']['power_w'], labels)
+            block.add('training_job_energy_kwh', job['energy']['energy_kwh'], labels)
+            block.add('training_job_cost_try', job['energy']['cost_try'], labels)
+            block.add('training_job_io_read_bytes_per_second', job['io']['read_mb_s'] * _MB, labels)
+            block.add('training_job_io_write_bytes_per_second', job['io']['write_mb_s'] * _MB, labels)
+            block.add('training_job_step', progress.get('step'), labels)
+            block.add('training_job_loss', progress.get('loss'), labels)
+            block.add('training_job_samples_per_second', progress.get('samples_per_s'), labels)
+            block.add('training_job_steps_per_second', progress.get('steps_per_s'), labels)
@@ -0,0 +1,224 @@
+"""
+Performans Ölçüm Modülü
+Collector, endpoint ve encode sürelerini sabit bucket'lı histogramlarda,
+hata ve subprocess (fork) sayılarını sayaçlarda, event loop gecikmesini
+periyodik bir probe ile toplar. Kayıt O(1)'dir; yüzdelikler sadece
+/api/debug/perf okunurken hesaplanır.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Histogram:
+    """Sabit bucket'lı süre histogramı (saniye)"""
+
+    # Üst sınırlar (saniye); son bucket sınırsız
+    BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+               0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    __slots__ = ('counts', 'count', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Bucket içinde doğrusal yaklaşımla q. yüzdelik (saniye)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.BUCKETS[index - 1] if index > 0 else 0.0
+                upper = self.BUCKETS[index] if index < len(self.BUCKETS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Özet (milisaniye)"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'p50_ms': ms(self.quantile(0.5)),
+            'p95_ms': ms(self.quantile(0.95)),
+            'p99_ms': ms(self.quantile(0.99)),
+            'max_ms': ms(self.max),
+            'last_ms': ms(self.last),
+        }
+
+
+class PerfRegistry:
+    """
+    Süreç genelinde performans sayaçları
+
+    Histogramlar (grup, ad) ile anahtarlanır: ör. ("collector", "ports"),
+    ("endpoint", "GET /api/system"), ("encode", "application/json").
+    Subprocess sayımı sys.addaudithook ile yapılır; hook kaldırılamadığı
+    için süreç başına bir kez kurulur.
+    """
+
+    # Sayılan audit olayları (subprocess.Popen, fork/exec yapan çağrılar)
+    SPAWN_EVENTS = frozenset(('subprocess.Popen', 'os.system', 'os.posix_spawn', 'os.fork'))
+    # Event loop probe periyodu (saniye)
+    LOOP_PROBE_INTERVAL = 0.5
+
+    def __init__(self):
+        self.started = time.time()
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.spawns: Dict[str, int] = {}  # çalıştırılan program -> sayı
+        self._spawn_lock = threading.Lock()
+        self._audit_installed = False
+        self._probe: Optional[asyncio.Task] = None
+
+    def observe(self, group: str, name: str, seconds: float):
+        """Süre kaydet"""
+        histogram = self.histograms.get((group, name))
+        if histogram is None:
+            histogram = self.histograms[(group, name)] = Histogram()
+        histogram.observe(seconds)
+
+    def error(self, group: str, name: str):
+        """Hata sayacını artır"""
+        key = (group, name)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    # ---- Subprocess sayımı ----
+
+    def install_audit_hook(self):
+        """subprocess / fork çağrılarını saymaya başla"""
+        if self._audit_installed:
+            return
+        self._audit_installed = True
+        sys.addaudithook(self._audit)
+
+    def _audit(self, event: str, args: Tuple):
+        # Her audit olayında (open, import...) çağrılır; ilk kontrol ucuz olmalı
+        if event not in self.SPAWN_EVENTS:
+            return
+        if event == 'subprocess.Popen':
+            executable, argv = args[0], args[1]
+            if not executable and argv:
+                executable = argv if isinstance(argv, (str, bytes)) else argv[0]
+            program = os.path.basename(os.fsdecode(executable)).split()[0] if executable else '?'
+        elif event == 'os.posix_spawn':
+            program = os.path.basename(os.fsdecode(args[0]))
+        else:
+            program = event
+        with self._spawn_lock:
+            self.spawns[program] = self.spawns.get(program, 0) + 1
+
+    # ---- Event loop gecikmesi ----
+
+    def start(self):
+        """Event loop probe'unu başlat (event loop içinden çağrılmalı)"""
+        if self._probe is None:
+            self._probe = asyncio.create_task(self._probe_loop(), name='perf:loop-lag')
+
+    async def stop(self):
+        if self._probe is not None:
+            self._probe.cancel()
+            await asyncio.gather(self._probe, return_exceptions=True)
+            self._probe = None
+
+    async def _probe_loop(self):
+        """Uyanma gecikmesi = event loop'u bloklayan iş"""
+        interval = self.LOOP_PROBE_INTERVAL
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self.observe('loop', 'lag', max(0.0, time.perf_counter() - expected))
+
+    # ---- Rapor ----
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Tüm ölçümler; gruplar altında ada göre"""
+        timings: Dict[str, Dict[str, Any]] = {}
+        for (group, name), histogram in sorted(self.histograms.items()):
+            timings.setdefault(group, {})[name] = histogram.to_dict()
+        errors: Dict[str, Dict[str, int]] = {}
+        for (group, name), count in sorted(self.errors.items()):
+            errors.setdefault(group, {})[name] = count
+        with self._spawn_lock:
+            spawns = dict(sorted(self.spawns.items(), key=lambda item: -item[1]))
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'timings': timings,
+            'errors': errors,
+            'subprocesses': {
+                'tracking': self._audit_installed,
+                'total': sum(spawns.values()),
+                'by_program': spawns,
+            },
+        }
+
+
+# Süreç genelinde tek kayıt (audit hook da süreç geneli)
+registry = PerfRegistry()
+
+
+class PerfMiddleware:
+    """HTTP isteklerinin süresini route şablonu başına ölçen ASGI middleware"""
+
+    def __init__(self, app, perf: Optional[PerfRegistry] = None):
+        self.app = app
+        self.perf = perf or registry
+        self._routes: Dict[Any, str] = {}  # endpoint -> route yolu
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        status: List[int] = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Router, eşleşen endpoint'i scope'a yazar
+            name = f"{scope['method']} {self._route_path(scope)}"
+            self.perf.observe('endpoint', name, time.perf_counter() - started)
+            if status[0] >= 500:
+                self.perf.error('endpoint', name)
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return '(eşleşmedi)'
+        path = self._routes.get(endpoint)
+        if path is None:
+            path = getattr(endpoint, '__name__', '?')
+            for route in getattr(scope.get('app'), 'routes', ()):
+                if getattr(route, 'endpoint', None) is endpoint:
+                    path = route.path
+                    break
+            self._routes[endpoint] = path
+        return path
@@ -0,0 +1,103 @@
+"""
+Alan Projeksiyonu Modülü
+?fields=cpu.percent,gpus.*.temperature_c biçimindeki istekle yanıtın
+"data" kısmından sadece istenen alanları seçer
+"""
+
+import contextvars
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+# Alan ağacı: anahtar -> alt ağaç; boş ağaç değerin tamamı demektir
+FieldTree = Dict[str, 'FieldTree']
+
+WILDCARD = '*'
+
+# HTTP isteği boyunca istenen alanlar (FieldsMiddleware ayarlar)
+_requested: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('projection_fields', default=None)
+
+
+def requested_fields() -> Optional[str]:
+    """Bu HTTP isteğinin ?fields= değeri (normalize edilmiş, yoksa None)"""
+    return _requested.get()
+
+
+def normalize(spec: Optional[str]) -> Optional[str]:
+    """Boşlukları ve tekrarları at, sırala (cache anahtarı olarak kullanılır)"""
+    if not spec:
+        return None
+    paths = sorted({path.strip() for path in spec.split(',') if path.strip()})
+    return ','.join(paths) or None
+
+
+def parse(spec: str) -> FieldTree:
+    """
+    "a.b,c.*.d" -> {'a': {'b': {}}, 'c': {'*': {'d': {}}}}
+
+    Bir yol diğerinin önekiyse (ör. "cpu" ve "cpu.percent") geniş olan kazanır.
+    """
+    tree: FieldTree = {}
+    for path in spec.split(','):
+        parts = [part for part in path.strip().split('.') if part]
+        if not parts:
+            continue
+        node = tree
+        for depth, part in enumerate(parts):
+            if part in node and not node[part]:
+                break  # Üst yol zaten tamamını istiyor
+            is_leaf = depth == len(parts) - 1
+            if is_leaf:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """
+    Değerden ağaçtaki alanları seç
+
+    Dict'lerde "*" tüm anahtarlar demektir. Listelerde "*" (veya doğrudan
+    alan adı) her elemana uygulanır. Bulunmayan alanlar sessizce atlanır.
+    """
+    if not tree:
+        return value
+    if isinstance(value, dict):
+        result = {}
+        wildcard = tree.get(WILDCARD)
+        for key, item in value.items():
+            subtree = tree.get(key)
+            if subtree is None:
+                subtree = wildcard
+            if subtree is not None:
+                result[key] = project(item, subtree)
+        return result
+    if isinstance(value, list):
+        subtree = tree.get(WILDCARD, tree)
+        return [project(item, subtree) for item in value]
+    return value
+
+
+def project_response(content: Any, spec: Optional[str]) -> Any:
+    """{"status", "data", ...} yanıtında sadece "data"ya projeksiyon uygula"""
+    if spec is None or not isinstance(content, dict) or 'data' not in content:
+        return content
+    return {**content, 'data': project(content['data'], parse(spec))}
+
+
+class FieldsMiddleware:
+    """HTTP isteğinin ?fields= parametresini okuyan ASGI middleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or b'fields=' not in scope.get('query_string', b''):
+            await self.app(scope, receive, send)
+            return
+        query = parse_qs(scope['query_string'].decode('latin-1'))
+        token = _requested.set(normalize(','.join(query.get('fields', []))))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _requested.reset(token)
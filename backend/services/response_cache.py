@@ -0,0 +1,148 @@
+"""
+Response Cache Modülü
+Snapshot'tan üretilen GET yanıtlarının gövdesini (ve gzip/brotli
+sıkıştırılmış hallerini) snapshot versiyonu başına bir kez üretir.
+ETag snapshot versiyonundan türetilir; If-None-Match tutarsa gövde hiç
+üretilmeden 304 döner. ?fields= projeksiyonu her alan seti için ayrı
+temsil olarak saklanır.
+"""
+
+import gzip
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from . import wire
+from .perf import registry as perf
+from .projection import project_response, requested_fields
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+Version = Union[int, Tuple[int, ...]]
+
+# Media type -> ETag soneki (farklı temsiller farklı ETag alır)
+_MEDIA_SUFFIX = {
+    wire.JSON: 'json',
+    wire.MSGPACK: 'msgpack',
+    wire.CBOR: 'cbor',
+}
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Accept-Encoding'den "br", "gzip" veya "identity" seç (q=0 reddedilir)"""
+    if not accept_encoding:
+        return 'identity'
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    wildcard = accepted.get('*', 0.0)
+    if brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return 'identity'
+
+
+class _Entry:
+    """Bir endpoint + media type için son versiyonun gövdeleri"""
+
+    __slots__ = ('version', 'bodies')
+
+    def __init__(self, version: Version):
+        self.version = version
+        self.bodies: Dict[str, bytes] = {}  # content-encoding -> gövde
+
+
+class ResponseCache:
+    """Snapshot versiyonu başına encode + sıkıştırma cache'i"""
+
+    # Bundan küçük gövdeler sıkıştırılmaz
+    MIN_COMPRESS_SIZE = 1024
+    # Saklanan (endpoint, format, alan seti) temsil sayısı; en eski kullanılan düşer
+    MAX_ENTRIES = 256
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5
+
+    def __init__(self):
+        self._entries: 'OrderedDict[Tuple[str, str, Optional[str]], _Entry]' = OrderedDict()
+        # Snapshot versiyonları yeniden başlatmada 1'den başlar; ETag'ler süreç başına ayrışır
+        self._epoch = format(int(time.time()), 'x')
+
+    def etag(self, key: str, version: Version, media_type: str,
+             fields: Optional[str] = None) -> str:
+        """Zayıf ETag: sıkıştırmadan bağımsız, temsil (media type, alan seti) başına"""
+        if isinstance(version, tuple):
+            version = '.'.join(str(part) for part in version)
+        tag = f'{key}-{self._epoch}.{version}-{_MEDIA_SUFFIX.get(media_type, "bin")}'
+        if fields is not None:
+            tag += f'-{zlib.crc32(fields.encode()):08x}'
+        return f'W/"{tag}"'
+
+    def respond(self, request: Request, key: str, version: Version,
+                build: Callable[[], Any]) -> Response:
+        """
+        Snapshot yanıtı üret
+
+        Args:
+            request: HTTP isteği (If-None-Match, Accept-Encoding)
+            key: Endpoint anahtarı (ör. "ports/listening")
+            version: Yanıtın dayandığı snapshot versiyon(lar)ı
+            build: Gövde içeriğini üreten fonksiyon; versiyon başına bir kez çağrılır
+        """
+        media_type = wire.negotiated()
+        fields = requested_fields()
+        etag = self.etag(key, version, media_type, fields)
+        headers = {'ETag': etag, 'Vary': 'Accept, Accept-Encoding', 'Cache-Control': 'no-cache'}
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and (if_none_match.strip() == '*'
+                              or etag in (tag.strip() for tag in if_none_match.split(','))):
+            return Response(status_code=304, headers=headers)
+
+        cache_key = (key, media_type, fields)
+        entry = self._entries.get(cache_key)
+        if entry is None or entry.version != version:
+            entry = self._entries[cache_key] = _Entry(version)
+            if len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(cache_key)
+        identity = entry.bodies.get('identity')
+        if identity is None:
+            # Sadece istenen alanlar serialize edilir
+            identity = entry.bodies['identity'] = wire.encode(project_response(build(), fields), media_type)
+
+        encoding = 'identity'
+        if len(identity) >= self.MIN_COMPRESS_SIZE:
+            encoding = negotiate_encoding(request.headers.get('accept-encoding'))
+        body = entry.bodies.get(encoding)
+        if body is None:
+            body = entry.bodies[encoding] = self._compress(identity, encoding)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        started = time.perf_counter()
+        if encoding == 'br':
+            body = brotli.compress(body, quality=self.BROTLI_QUALITY)
+        else:
+            body = gzip.compress(body, compresslevel=self.GZIP_LEVEL, mtime=0)
+        perf.observe('compress', encoding, time.perf_counter() - started)
+        return body
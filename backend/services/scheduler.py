@@ -0,0 +1,226 @@
+"""
+Collector Scheduler Modülü
+Her collector'ı kendi periyodunda arka planda çalıştırır ve
+sürümlenmiş, değişmez snapshot'lar yayınlar
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .perf import registry as perf
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Bir collector'ın yayınladığı değişmez veri"""
+    name: str
+    version: int
+    timestamp: float  # time.time()
+    data: Any  # Yayınlandıktan sonra asla yerinde değiştirilmez
+
+    @property
+    def age(self) -> float:
+        """Snapshot'ın yaşı (saniye)"""
+        return time.time() - self.timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot meta bilgisini dict'e çevir"""
+        return {
+            'name': self.name,
+            'version': self.version,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'age_s': round(self.age, 3),
+        }
+
+
+@dataclass
+class Collector:
+    """Periyodik çalışan veri toplayıcı"""
+    name: str
+    func: Callable[[], Any]
+    interval: float  # saniye
+    timeout: float  # Tek çalıştırma için süre sınırı (saniye)
+    version: int = 0
+    snapshot: Optional[Snapshot] = None
+    last_error: Optional[str] = None
+    timeouts: int = 0
+    running: bool = False  # Thread'de çalışan bir tur var (süre aşımında da)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def stale(self) -> bool:
+        """Snapshot yok, son tur başarısız ya da beklenenden eski"""
+        if self.snapshot is None or self.last_error is not None:
+            return True
+        return self.snapshot.age > self.interval * CollectorScheduler.STALE_FACTOR + self.timeout
+
+    def status(self) -> Dict[str, Any]:
+        """Collector'ın durumu (composite yanıtlar ve sağlık kontrolü için)"""
+        return {
+            'version': self.version,
+            'age_s': round(self.snapshot.age, 3) if self.snapshot is not None else None,
+            'stale': self.stale,
+            'running': self.running,
+            'error': self.last_error,
+            'timeouts': self.timeouts,
+        }
+
+
+class CollectorScheduler:
+    """
+    Collector'ları arka planda periyodik çalıştır
+
+    Collector'lar sınırlı bir thread havuzunda eşzamanlı çalışır. Süresini
+    aşan tur hata olarak işaretlenir (snapshot stale görünür); takılan
+    thread bitene kadar o collector yeni tur başlatmaz, böylece havuz
+    takılan çağrılarla dolmaz.
+    """
+
+    # Varsayılan tur süre sınırı: max(DEFAULT_TIMEOUT, interval)
+    DEFAULT_TIMEOUT = 10.0
+    # Snapshot interval * STALE_FACTOR + timeout'tan eskiyse stale sayılır
+    STALE_FACTOR = 3
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Args:
+            max_workers: Collector thread havuzu boyutu
+        """
+        self.collectors: Dict[str, Collector] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._listeners: List[Callable[[Snapshot], None]] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='collector')
+
+    def register(self, name: str, func: Callable[[], Any], interval: float,
+                 timeout: Optional[float] = None):
+        """
+        Collector ekle
+
+        Args:
+            name: Snapshot adı (ör. "system", "ports")
+            func: Bloklayan toplama fonksiyonu, thread'de çalıştırılır.
+                None dönerse snapshot yayınlanmaz
+            interval: Çalıştırma periyodu (saniye)
+            timeout: Tek tur için süre sınırı (saniye)
+        """
+        if name in self.collectors:
+            raise ValueError(f"Collector zaten kayıtlı: {name}")
+        if timeout is None:
+            timeout = max(self.DEFAULT_TIMEOUT, interval)
+        self.collectors[name] = Collector(name=name, func=func, interval=interval, timeout=timeout)
+
+    def add_listener(self, callback: Callable[[Snapshot], None]):
+        """
+        Her yeni snapshot'ta çağrılacak fonksiyon ekle
+
+        Callback event loop üzerinde çalışır, hızlı olmalıdır.
+        """
+        self._listeners.append(callback)
+
+    def start(self):
+        """Tüm collector'ları başlat (event loop içinden çağrılmalı)"""
+        for collector in self.collectors.values():
+            task = asyncio.create_task(self._run(collector), name=f"collector:{collector.name}")
+            self._tasks.append(task)
+
+    async def stop(self):
+        """Tüm collector'ları durdur"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # Takılı kalmış thread'ler beklenmez
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, collector: Collector):
+        """Tek bir collector'ın döngüsü"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = time.monotonic()
+            future = loop.run_in_executor(self._executor, collector.func)
+            collector.running = True
+            try:
+                try:
+                    data = await asyncio.wait_for(asyncio.shield(future), collector.timeout)
+                except asyncio.TimeoutError:
+                    collector.timeouts += 1
+                    collector.last_error = f"Süre aşımı ({collector.timeout:g} s)"
+                    perf.error('collector_timeout', collector.name)
+                    print(f"Collector süre aşımı ({collector.name}): {collector.timeout:g} s")
+                    # Thread iptal edilemez; bitmesini bekle, geç gelen veri yine yayınlanır
+                    data = await future
+                perf.observe('collector', collector.name, time.monotonic() - started)
+                if data is not None:
+                    self._publish(collector, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                collector.last_error = str(e)
+                perf.error('collector', collector.name)
+                print(f"Collector hatası ({collector.name}): {e}")
+            finally:
+                collector.running = False
+
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, collector.interval - elapsed))
+
+    def _publish(self, collector: Collector, data: Any):
+        """Yeni snapshot yayınla"""
+        collector.version += 1
+        collector.snapshot = Snapshot(
+            name=collector.name,
+            version=collector.version,
+            timestamp=time.time(),
+            data=data,
+        )
+        collector.last_error = None
+        collector.ready.set()
+
+        for callback in self._listeners:
+            try:
+                callback(collector.snapshot)
+            except Exception as e:
+                perf.error('listener', collector.name)
+                print(f"Snapshot listener hatası ({collector.name}): {e}")
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        """En son snapshot'ı al (henüz yoksa None)"""
+        return self.collectors[name].snapshot
+
+    async def latest(self, name: str, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """
+        En son snapshot'ı al, ilk yayın yapılmadıysa bekle
+
+        Args:
+            timeout: En fazla bekleme (saniye); dolarsa None döner
+        """
+        collector = self.collectors[name]
+        if collector.snapshot is None:
+            if timeout is None:
+                await collector.ready.wait()
+            else:
+                try:
+                    await asyncio.wait_for(collector.ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+        return collector.snapshot
+
+    async def gather(self, names: Iterable[str], deadline: float) -> Dict[str, Optional[Snapshot]]:
+        """
+        Birden fazla snapshot'ı ortak bir süre sınırıyla al
+
+        Hazır olanlar hemen döner; süre içinde ilk yayını gelmeyenler None olur.
+        """
+        names = list(names)
+        snapshots = await asyncio.gather(*(self.latest(name, deadline) for name in names))
+        return dict(zip(names, snapshots))
+
+    def status(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Tek collector'ın (veya tümünün) durumu"""
+        if name is not None:
+            return self.collectors[name].status()
+        return {name: collector.status() for name, collector in self.collectors.items()}
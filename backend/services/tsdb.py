@@ -0,0 +1,492 @@
+"""
+Kalıcı Zaman Serisi Modülü
+Örneklenen metrikleri append-only, sütunsal segment dosyalarına yazar ve
+mmap ile okur; servis yeniden başlasa da geçmiş kaybolmaz
+
+Segment dosya düzeni:
+    [header][timestamp sütunu: capacity x f8][metrik 0: capacity x f8]...
+
+Dosya tam kapasiteyle (sparse) oluşturulur, böylece her sütunun yeri
+sabittir ve bir batch her sütun için tek pwrite ile yazılır. Kapanan
+segmentler gerçek satır sayısına göre sıkıştırılır.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from operator import add, and_, eq, mul, sub
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MAGIC = b'TSD1'
+VERSION = 1
+PAGE_SIZE = 4096
+
+# magic, version, header_size, column sayısı, capacity, rows, start_ts, end_ts, names uzunluğu
+_HEADER = struct.Struct('=4sHxxIIIIddI')
+
+NAN = float('nan')
+
+
+def _trapezoid(timestamps: array, values: array, max_gap: float) -> Tuple[float, float]:
+    """
+    Ardışık örnek çiftlerinin trapez toplamı (değer x saniye) ve kapsanan süre
+
+    Döngüler map/compress ile C'de döner; max_gap'i aşan veya boş değer
+    (NaN) içeren aralıklar sayılmaz.
+    """
+    elapsed = list(map(sub, timestamps[1:], timestamps[:-1]))
+    terms = list(map(mul, map(add, values[:-1], values[1:]), elapsed))
+    keep = list(map(and_, map(float(max_gap).__ge__, elapsed), map(eq, terms, terms)))
+    return sum(compress(terms, keep)) / 2, sum(compress(elapsed, keep))
+
+
+def _page_align(size: int) -> int:
+    return (size + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+class Segment:
+    """Tek segment dosyası"""
+
+    # Seyrek zaman index'i: her INDEX_STRIDE satırda bir timestamp (bir sayfa)
+    INDEX_STRIDE = PAGE_SIZE // 8
+
+    def __init__(self, path: str, fd: int, columns: List[str], capacity: int,
+                 rows: int, start_ts: float, end_ts: float, header_size: int):
+        self.path = path
+        self.columns = columns
+        self.column_index = {name: i for i, name in enumerate(columns)}
+        self.capacity = capacity
+        self.rows = rows
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.header_size = header_size
+        self._fd = fd
+        self._mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        self._index = array('d')
+        self._rebuild_index()
+
+    # ---------- oluşturma / açma ----------
+
+    @classmethod
+    def create(cls, path: str, columns: List[str], capacity: int, start_ts: float) -> 'Segment':
+        """Yeni, tam kapasiteli (sparse) segment oluştur"""
+        names = json.dumps(columns).encode()
+        header_size = _page_align(_HEADER.size + len(names))
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        os.ftruncate(fd, header_size + (len(columns) + 1) * capacity * 8)
+        os.pwrite(fd, _HEADER.pack(MAGIC, VERSION, header_size, len(columns), capacity,
+                                   0, start_ts, start_ts, len(names)) + names, 0)
+        return cls(path, fd, columns, capacity, 0, start_ts, start_ts, header_size)
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> 'Segment':
+        """Var olan segmenti aç"""
+        fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            head = os.pread(fd, _HEADER.size, 0)
+            magic, version, header_size, ncols, capacity, rows, start_ts, end_ts, names_len = \
+                _HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Geçersiz segment: {path}")
+            columns = json.loads(os.pread(fd, names_len, _HEADER.size))
+            if len(columns) != ncols:
+                raise ValueError(f"Bozuk segment başlığı: {path}")
+        except Exception:
+            os.close(fd)
+            raise
+        return cls(path, fd, columns, capacity, rows, start_ts, end_ts, header_size)
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+    # ---------- yazma ----------
+
+    @property
+    def full(self) -> bool:
+        return self.rows >= self.capacity
+
+    def _column_offset(self, column: int) -> int:
+        """column -1 timestamp sütunudur"""
+        return self.header_size + (column + 1) * self.capacity * 8
+
+    def append_rows(self, rows: List[Tuple[float, Dict[str, float]]]) -> int:
+        """
+        Satırları sonuna ekle
+
+        Returns:
+            Yazılan satır sayısı (kapasite dolarsa eksik yazılır)
+        """
+        count = min(len(rows), self.capacity - self.rows)
+        if count <= 0:
+            return 0
+        batch = rows[:count]
+        start_row = self.rows
+
+        os.pwrite(self._fd, array('d', [ts for ts, _ in batch]).tobytes(),
+                  self._column_offset(-1) + start_row * 8)
+        for name, column in self.column_index.items():
+            values = array('d', [values.get(name, NAN) for _, values in batch])
+            os.pwrite(self._fd, values.tobytes(), self._column_offset(column) + start_row * 8)
+
+        self.rows += count
+        self.end_ts = batch[-1][0]
+        self._write_header()
+
+        for row in range(start_row, self.rows):
+            if row % self.INDEX_STRIDE == 0:
+                self._index.append(batch[row - start_row][0])
+        return count
+
+    def _write_header(self):
+        names = json.dumps(self.columns).encode()
+        os.pwrite(self._fd, _HEADER.pack(MAGIC, VERSION, self.header_size, len(self.columns),
+                                         self.capacity, self.rows, self.start_ts, self.end_ts,
+                                         len(names)), 0)
+
+    # ---------- okuma ----------
+
+    def _rebuild_index(self):
+        """Her INDEX_STRIDE satırın timestamp'ini oku (sayfa başına bir okuma)"""
+        self._index = array('d')
+        offset = self._column_offset(-1)
+        for row in range(0, self.rows, self.INDEX_STRIDE):
+            self._index.append(struct.unpack_from('=d', self._mm, offset + row * 8)[0])
+
+    def _timestamp(self, row: int) -> float:
+        return struct.unpack_from('=d', self._mm, self._column_offset(-1) + row * 8)[0]
+
+    def find_row(self, timestamp: float, inclusive: bool = False) -> int:
+        """
+        timestamp'ten büyük/eşit ilk satır (seyrek index + blok içi ikili arama)
+
+        inclusive=True ise timestamp'e eşit satırlar da atlanır (aralık sonu için)
+        """
+        block = (bisect_right if inclusive else bisect_left)(self._index, timestamp)
+        lo = max(0, (block - 1) * self.INDEX_STRIDE)
+        hi = min(self.rows, block * self.INDEX_STRIDE + 1)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._timestamp(mid)
+            if value < timestamp or (inclusive and value == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def read(self, column: Optional[str], start_row: int, end_row: int) -> array:
+        """Sütunun [start_row, end_row) satırlarını kopyala (None: timestamp)"""
+        index = -1 if column is None else self.column_index[column]
+        offset = self._column_offset(index)
+        values = array('d')
+        values.frombytes(self._mm[offset + start_row * 8:offset + end_row * 8])
+        return values
+
+    # ---------- sıkıştırma ----------
+
+    def compact(self) -> 'Segment':
+        """Kullanılmayan kapasiteyi atarak segmenti yeniden yaz"""
+        if self.rows >= self.capacity or self.rows == 0:
+            return self
+        tmp_path = self.path + '.compact'
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        compacted = Segment.create(tmp_path, self.columns, self.rows, self.start_ts)
+        try:
+            for column in [None] + self.columns:
+                index = -1 if column is None else self.column_index[column]
+                os.pwrite(compacted._fd, self.read(column, 0, self.rows).tobytes(),
+                          compacted._column_offset(index))
+            compacted.rows = self.rows
+            compacted.end_ts = self.end_ts
+            compacted._write_header()
+            os.fsync(compacted._fd)
+        finally:
+            compacted.close()
+        self.close()
+        os.replace(tmp_path, self.path)
+        return Segment.open(self.path)
+
+
+class TimeSeriesStore:
+    """Segment dosyalarından oluşan kalıcı metrik deposu"""
+
+    # 1 sn örneklemede bir segment ~1 gün
+    SEGMENT_CAPACITY = 86400
+
+    # Retention kontrolü en fazla bu sıklıkta (saniye)
+    RETENTION_CHECK_INTERVAL = 3600
+
+    # step verilmezse hedeflenen / izin verilen en fazla nokta sayısı
+    DEFAULT_POINTS = 300
+    MAX_POINTS = 5000
+
+    def __init__(self, directory: str, retention_days: float = 30,
+                 segment_capacity: int = None):
+        self.directory = directory
+        self.retention_s = retention_days * 86400
+        self.segment_capacity = segment_capacity or self.SEGMENT_CAPACITY
+        self.segments: List[Segment] = []
+        self._active: Optional[Segment] = None
+        self._pending: List[Tuple[float, Dict[str, float]]] = []
+        self._pending_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._last_retention_check = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Diskteki segmentleri aç; son segment yazılabilir kalır"""
+        paths = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith('seg-') and name.endswith('.tsd')
+        )
+        for path in paths:
+            try:
+                self.segments.append(Segment.open(path, writable=path == paths[-1]))
+            except (OSError, ValueError) as e:
+                print(f"Segment açılamadı ({path}): {e}")
+        self.segments.sort(key=lambda segment: segment.start_ts)
+        if self.segments and not self.segments[-1].full:
+            self._active = self.segments[-1]
+
+    # ---------- yazma ----------
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        """Satırı bekleyen batch'e ekle (event loop'ta çağrılır, disk I/O yok)"""
+        with self._pending_lock:
+            self._pending.append((timestamp, dict(values)))
+
+    def flush(self):
+        """Bekleyen satırları diske yaz (thread'de çağrılmalı)"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+
+        with self._lock:
+            while pending:
+                columns = sorted(pending[0][1])
+                segment = self._active
+                if segment is None or segment.full or not set(pending[0][1]) <= set(segment.columns):
+                    # Metrik kümesi değişti (ör. yeni GPU) veya segment doldu
+                    segment = self._rotate(columns, pending[0][0])
+
+                # Aynı sütun kümesine uyan ardışık satırlar tek batch
+                allowed = set(segment.columns)
+                batch_end = 1
+                while batch_end < len(pending) and set(pending[batch_end][1]) <= allowed:
+                    batch_end += 1
+                written = segment.append_rows(pending[:batch_end])
+                pending = pending[written:]
+
+            now = time.time()
+            if now - self._last_retention_check >= self.RETENTION_CHECK_INTERVAL:
+                self._last_retention_check = now
+                self._enforce_retention(now)
+
+    def _rotate(self, columns: List[str], start_ts: float) -> Segment:
+        """Aktif segmenti kapatıp sıkıştır, yenisini aç"""
+        if self._active is not None:
+            position = self.segments.index(self._active)
+            self.segments[position] = self._active.compact()
+        path = os.path.join(self.directory, f'seg-{int(start_ts * 1000):015d}.tsd')
+        self._active = Segment.create(path, columns, self.segment_capacity, start_ts)
+        self.segments.append(self._active)
+        return self._active
+
+    def _enforce_retention(self, now: float):
+        """Retention süresini aşan segmentleri sil"""
+        cutoff = now - self.retention_s
+        for segment in list(self.segments):
+            if segment is not self._active and segment.end_ts < cutoff:
+                self.segments.remove(segment)
+                segment.close()
+                os.unlink(segment.path)
+
+    def close(self):
+        """Bekleyenleri yaz ve dosyaları kapat"""
+        self.flush()
+        with self._lock:
+            for segment in self.segments:
+                segment.close()
+            self.segments.clear()
+            self._active = None
+
+    # ---------- okuma ----------
+
+    def metrics(self) -> List[str]:
+        """Diskte bulunan metrik adları"""
+        with self._lock:
+            names = set()
+            for segment in self.segments:
+                names.update(segment.columns)
+        return sorted(names)
+
+    def _aggregate(self, metric: str, first: float, end: float, step: float):
+        """
+        [first, end] aralığını first'ten başlayan step'lik kovalara topla
+
+        Returns:
+            (mins, maxs, sums, counts) listeleri; boş kovalarda min/max None
+
+        Raises:
+            KeyError: Metrik hiçbir segmentte yok
+        """
+        points = int((end - first) // step) + 1
+        mins: List[Optional[float]] = [None] * points
+        maxs: List[Optional[float]] = [None] * points
+        sums = [0.0] * points
+        counts = [0] * points
+        found = False
+
+        with self._lock:
+            for segment in self.segments:
+                if segment.rows == 0 or segment.end_ts < first or segment.start_ts > end:
+                    continue
+                if metric not in segment.column_index:
+                    continue
+                found = True
+                lo = segment.find_row(first)
+                hi = segment.find_row(end, inclusive=True)
+                if lo >= hi:
+                    continue
+                timestamps = segment.read(None, lo, hi)
+                values = segment.read(metric, lo, hi)
+
+                # Kova sınırlarını timestamp dizisinde ikili aramayla bul,
+                # her kovanın değerleri tek dilimde toplanır
+                row = 0
+                while row < len(timestamps):
+                    i = int((timestamps[row] - first) // step)
+                    bucket_end = first + (i + 1) * step
+                    next_row = bisect_left(timestamps, bucket_end, row)
+                    chunk = values[row:next_row]
+                    total = sum(chunk)
+                    if total != total:  # NaN var, boş değerleri ayıkla
+                        chunk = [v for v in chunk if v == v]
+                        total = sum(chunk)
+                    if chunk and 0 <= i < points:
+                        low, high = min(chunk), max(chunk)
+                        mins[i] = low if mins[i] is None else min(mins[i], low)
+                        maxs[i] = high if maxs[i] is None else max(maxs[i], high)
+                        sums[i] += total
+                        counts[i] += len(chunk)
+                    row = next_row
+
+        if not found:
+            raise KeyError(metric)
+        return mins, maxs, sums, counts
+
+    def integrate(self, metric: str, first: float, end: float, step: float,
+                  max_gap: float) -> Tuple[List[float], List[float], float]:
+        """
+        Kova başına zaman integrali (değer x saniye), gerçek örnek zamanlarıyla
+
+        Ardışık iki örnek arasındaki aralık trapez yöntemiyle başladığı kovaya
+        yazılır. max_gap'ten uzun aralıklar (servis kapalı, collector süre
+        aşımı) ve boş değerler sayılmaz; bilinmeyen değer tahmin edilmez.
+
+        Args:
+            first: İlk kovanın başlangıcı (hizalama çağırana ait, ör. yerel saat başı)
+            end: Aralık sonu
+            step: Kova genişliği (saniye)
+            max_gap: Entegre edilecek en uzun örnek aralığı (saniye)
+
+        Returns:
+            (kova başlangıçları, integraller, kapsanan toplam süre)
+
+        Raises:
+            KeyError: Metrik hiçbir segmentte yok
+        """
+        points = int((end - first) // step) + 1
+        integrals = [0.0] * points
+        covered = 0.0
+        found = False
+        prev_ts: Optional[float] = None
+        prev_value = 0.0
+
+        with self._lock:
+            # Segmentler zamana göre sıralı; aralık segment sınırını geçebilir
+            for segment in self.segments:
+                if segment.rows == 0 or segment.end_ts < first or segment.start_ts > end:
+                    continue
+                if metric not in segment.column_index:
+                    prev_ts = None
+                    continue
+                found = True
+                lo = segment.find_row(first)
+                hi = segment.find_row(end, inclusive=True)
+                if lo >= hi:
+                    continue
+                timestamps = segment.read(None, lo, hi)
+                values = segment.read(metric, lo, hi)
+
+                # Önceki segmentin son örneğinden bu segmentin ilkine olan aralık
+                if prev_ts is not None:
+                    elapsed = timestamps[0] - prev_ts
+                    i = int((prev_ts - first) // step)
+                    term = (prev_value + values[0]) / 2 * elapsed
+                    if 0 < elapsed <= max_gap and term == term and 0 <= i < points:
+                        integrals[i] += term
+                        covered += elapsed
+
+                # Kova başına tek dilim; dilim bir sonraki kovanın ilk örneğini de
+                # içerir, böylece sınırı geçen aralık başladığı kovaya yazılır
+                row = 0
+                while row < len(timestamps):
+                    i = int((timestamps[row] - first) // step)
+                    next_row = max(bisect_left(timestamps, first + (i + 1) * step, row), row + 1)
+                    if 0 <= i < points:
+                        area, seconds = _trapezoid(timestamps[row:next_row + 1],
+                                                   values[row:next_row + 1], max_gap)
+                        integrals[i] += area
+                        covered += seconds
+                    row = next_row
+                prev_ts, prev_value = timestamps[-1], values[-1]
+
+        if not found:
+            raise KeyError(metric)
+        return [first + i * step for i in range(points)], integrals, covered
+
+    def query(self, metric: str, start: float, end: float,
+              step: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Zaman aralığındaki değerleri kovalara toplayarak döndür
+
+        Args:
+            metric: Metrik adı
+            start, end: Aralık (unix zamanı)
+            step: Kova genişliği (saniye); verilmezse ~DEFAULT_POINTS kova
+
+        Returns:
+            MetricsHistory.query ile aynı sütunsal biçim
+        """
+        span = end - start
+        step = max(step or span / self.DEFAULT_POINTS, span / self.MAX_POINTS, 1)
+        step = int(math.ceil(step))
+        first = int(start // step) * step
+        mins, maxs, sums, counts = self._aggregate(metric, first, end, step)
+        points = len(counts)
+        avgs: List[Optional[float]] = [None] * points
+        for i in range(points):
+            if counts[i]:
+                avgs[i] = round(sums[i] / counts[i], 3)
+        return {
+            'metric': metric,
+            'step': step,
+            'resolution': None,
+            'start': first,
+            'end': end,
+            't': [first + i * step for i in range(points)],
+            'avg': avgs,
+            'min': [round(m, 3) if m is not None else None for m in mins],
+            'max': [round(m, 3) if m is not None else None for m in maxs],
+        }
@@ -0,0 +1,188 @@
+"""
+Wire Format Modülü
+Client başına içerik anlaşması: HTTP'de Accept başlığı, WebSocket'te
+subprotocol ile JSON, MessagePack veya CBOR seçilir. orjson kuruluysa JSON
+onunla üretilir. Bulunmayan kütüphanelerin formatı ilan edilmez.
+"""
+
+import contextvars
+import json
+import time
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import Response
+
+from .perf import registry as perf
+from .projection import project_response, requested_fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+# Accept başlığında görülen eş anlamlı media type'lar
+_ALIASES = {
+    'application/x-msgpack': MSGPACK,
+    'application/vnd.msgpack': MSGPACK,
+}
+
+# WebSocket subprotocol adı -> media type
+SUBPROTOCOLS = {
+    'json': JSON,
+    'msgpack': MSGPACK,
+    'cbor': CBOR,
+}
+
+# HTTP isteği boyunca anlaşılan format (NegotiationMiddleware ayarlar)
+_negotiated: contextvars.ContextVar[str] = contextvars.ContextVar('wire_media_type', default=JSON)
+
+Frame = Union[str, bytes]
+
+
+def negotiated() -> str:
+    """Bu HTTP isteği için anlaşılan media type"""
+    return _negotiated.get()
+
+
+def available() -> List[str]:
+    """Bu kurulumda üretilebilen media type'lar"""
+    types = [JSON]
+    if msgpack is not None:
+        types.append(MSGPACK)
+    if cbor2 is not None:
+        types.append(CBOR)
+    return types
+
+
+def _fallback(value: Any) -> Any:
+    """Native olmayan tipler (datetime, dataclass vb.) FastAPI'nin kurallarıyla"""
+    return jsonable_encoder(value)
+
+
+def dumps_json(data: Any) -> bytes:
+    """Kompakt JSON (orjson varsa onunla)"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_fallback, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_fallback, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def encode(data: Any, media_type: str = JSON) -> bytes:
+    """Veriyi verilen formatta byte'lara çevir (süre media type başına ölçülür)"""
+    started = time.perf_counter()
+    if media_type == MSGPACK:
+        body = msgpack.packb(data, default=_fallback, use_bin_type=True)
+    elif media_type == CBOR:
+        body = cbor2.dumps(data, default=lambda encoder, value: encoder.encode(_fallback(value)))
+    else:
+        body = dumps_json(data)
+    perf.observe('encode', media_type, time.perf_counter() - started)
+    return body
+
+
+def encode_frame(message: Dict[str, Any], media_type: str = JSON) -> Frame:
+    """WebSocket frame'i: JSON text frame (str), diğerleri binary (bytes)"""
+    if media_type == JSON:
+        return encode(message).decode('utf-8')
+    return encode(message, media_type)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Accept başlığından desteklenen en tercih edilen media type
+
+    q değerleri dikkate alınır, eşitlikte başlıktaki sıra korunur;
+    uygun bir tür yoksa JSON döner.
+    """
+    if not accept:
+        return JSON
+    supported = available()
+    candidates = []
+    for position, part in enumerate(accept.split(',')):
+        media_type, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = _ALIASES.get(media_type.lower(), media_type.lower())
+        if quality > 0:
+            candidates.append((-quality, position, media_type))
+    for _, _, media_type in sorted(candidates):
+        if media_type in supported:
+            return media_type
+        if media_type in ('*/*', 'application/*'):
+            return JSON
+    return JSON
+
+
+def negotiate_subprotocol(offered: List[str]) -> Optional[str]:
+    """Client'ın önerdiği subprotocol'lerden desteklenen ilki (yoksa None: JSON)"""
+    supported = available()
+    for name in offered:
+        if SUBPROTOCOLS.get(name) in supported:
+            return name
+    return None
+
+
+class WireResponse(Response):
+    """
+    Anlaşılan formatta gövde üreten response
+
+    Uygulamanın default_response_class'ı olarak kullanılır; endpoint'ler
+    büyük payload'ları doğrudan WireResponse(...) olarak döndürerek FastAPI'nin
+    jsonable_encoder geçişini de atlayabilir. İstekte ?fields= varsa "data"
+    kısmına projeksiyon uygulanır.
+    """
+
+    media_type = JSON
+
+    def __init__(self, content: Any, status_code: int = 200,
+                 headers: Optional[Mapping[str, str]] = None, **kwargs):
+        headers = {**(headers or {}), 'Vary': 'Accept'}
+        super().__init__(content, status_code=status_code, headers=headers, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        self.media_type = negotiated()
+        return encode(project_response(content, requested_fields()), self.media_type)
+
+
+class NegotiationMiddleware:
+    """HTTP isteğinin Accept başlığını okuyup WireResponse formatını ayarlayan ASGI middleware"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope['headers']:
+            if name == b'accept':
+                accept = value.decode('latin-1')
+                break
+        token = _negotiated.set(negotiate(accept))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _negotiated.reset(token)
@@ -0,0 +1,128 @@
+"""
+GPU backend testleri: sahte backend ile SystemMonitor yolu ve NVML'in
+hata / eksik fonksiyon davranışı (GPU gerektirmez)
+"""
+
+import types
+from collections import namedtuple
+
+import pytest
+
+from monitors import gpu_backends
+from monitors.gpu_backends import (
+    FakeGPUBackend, GPUProcess, NVMLBackend, NvidiaSmiBackend, create_gpu_backend
+)
+from monitors.gpu_monitor import SystemMonitor
+
+
+_Memory = namedtuple('_Memory', 'total used free')
+_Utilization = namedtuple('_Utilization', 'gpu memory')
+_Process = namedtuple('_Process', 'pid usedGpuMemory')
+_Sample = namedtuple('_Sample', 'pid timeStamp smUtil')
+
+MB = 1024 * 1024
+
+
+class _NVMLError(Exception):
+    pass
+
+
+def _fake_pynvml(device_count=1, with_process_utilization=False, unsupported=()):
+    """pynvml yerine geçen modül; unsupported'taki fonksiyonlar NVMLError atar"""
+    def unsupported_call(*args):
+        raise _NVMLError('Not Supported')
+
+    functions = {
+        'nvmlInit': lambda: None,
+        'nvmlShutdown': lambda: None,
+        'nvmlDeviceGetCount': lambda: device_count,
+        'nvmlDeviceGetHandleByIndex': lambda index: index,
+        'nvmlDeviceGetUUID': lambda handle: f'GPU-test-{handle}'.encode(),
+        'nvmlDeviceGetName': lambda handle: b'Test GPU',
+        'nvmlDeviceGetMemoryInfo': lambda handle: _Memory(8192 * MB, 2048 * MB, 6144 * MB),
+        'nvmlDeviceGetUtilizationRates': lambda handle: _Utilization(75, 20),
+        'nvmlDeviceGetTemperature': lambda handle, sensor: 61,
+        'nvmlDeviceGetPowerUsage': lambda handle: 180000,  # mW
+        'nvmlDeviceGetEnforcedPowerLimit': lambda handle: 300000,
+        'nvmlDeviceGetComputeRunningProcesses': lambda handle: [_Process(1000 + handle, 512 * MB)],
+        'nvmlSystemGetProcessName': lambda pid: b'python',
+    }
+    if with_process_utilization:
+        functions['nvmlDeviceGetProcessUtilization'] = (
+            lambda handle, since: [_Sample(1000 + handle, since + 1, 42)]
+        )
+    for name in unsupported:
+        functions[name] = unsupported_call
+    return types.SimpleNamespace(NVMLError=_NVMLError, NVML_TEMPERATURE_GPU=0, **functions)
+
+
+def test_fake_backend_from_environment(monkeypatch):
+    monkeypatch.setenv('GPU_BACKEND', 'fake')
+    monkeypatch.setenv('GPU_FAKE_COUNT', '3')
+    backend = create_gpu_backend()
+    assert isinstance(backend, FakeGPUBackend)
+
+    backend.set_processes([
+        GPUProcess(pid=42, name='train.py', gpu_uuid='GPU-fake-0001', gpu_index=1, used_memory_mb=4096.0),
+    ])
+    gpus = SystemMonitor(backend).gpu_monitor.get_gpu_info()
+
+    assert [gpu.index for gpu in gpus] == [0, 1, 2]
+    assert gpus[1].uuid == 'GPU-fake-0001'
+    assert gpus[1].memory_used == 4096.0
+    assert gpus[1].compute_processes == [{'pid': 42, 'name': 'train.py', 'memory_mb': 4096.0}]
+    assert gpus[0].compute_processes == []
+    for gpu in gpus:
+        assert 0 <= gpu.utilization <= 100
+        assert 0 < gpu.power_draw <= gpu.power_limit
+
+
+def test_no_backend(monkeypatch):
+    monkeypatch.setenv('GPU_BACKEND', 'none')
+    monitor = SystemMonitor()
+    assert not monitor.gpu_monitor.has_nvidia
+    assert monitor.gpu_monitor.get_gpu_info() == []
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_gpu_backend('cuda')
+
+
+def test_nvml_without_process_utilization(monkeypatch):
+    # nvidia-ml-py3 7.352.0'da nvmlDeviceGetProcessUtilization yok
+    monkeypatch.setattr(gpu_backends, 'pynvml', _fake_pynvml(device_count=2))
+    backend = NVMLBackend()
+    assert backend.available()
+
+    gpus = SystemMonitor(backend).gpu_monitor.get_gpu_info()
+    assert len(gpus) == 2
+    assert gpus[0].power_draw == 180.0
+    assert gpus[1].compute_processes == [{'pid': 1001, 'name': 'python', 'memory_mb': 512.0}]
+    assert all(proc.sm_utilization is None for proc in backend.get_compute_processes())
+
+
+def test_nvml_process_utilization(monkeypatch):
+    monkeypatch.setattr(gpu_backends, 'pynvml', _fake_pynvml(with_process_utilization=True))
+    backend = NVMLBackend()
+    assert backend.available()
+    assert [proc.sm_utilization for proc in backend.get_compute_processes()] == [42.0]
+
+
+def test_nvml_unsupported_fields_use_defaults(monkeypatch):
+    monkeypatch.setattr(gpu_backends, 'pynvml', _fake_pynvml(unsupported=(
+        'nvmlDeviceGetPowerUsage', 'nvmlDeviceGetEnforcedPowerLimit', 'nvmlDeviceGetMemoryInfo',
+    )))
+    backend = NVMLBackend()
+    assert backend.available()
+    gpus = SystemMonitor(backend).gpu_monitor.get_gpu_info()
+    assert len(gpus) == 1
+    assert gpus[0].power_draw == 0.0
+    assert gpus[0].memory_total == 0.0
+    assert gpus[0].temperature == 61.0
+
+
+def test_auto_falls_back_to_nvidia_smi(monkeypatch):
+    monkeypatch.setattr(gpu_backends, 'pynvml', _fake_pynvml(unsupported=('nvmlInit',)))
+    monkeypatch.setattr(NvidiaSmiBackend, 'available', lambda self: True)
+    assert isinstance(create_gpu_backend('auto'), NvidiaSmiBackend)
@@ -0,0 +1,57 @@
+"""
+Training sınıflandırma testleri: exclude kuralı sadece çalıştırılan programa bakar
+"""
+
+import pytest
+
+from monitors.training_classifier import TrainingClassifier
+
+
+class _Process:
+    """psutil.Process yerine geçen sabit process"""
+
+    def __init__(self, argv, exe='', pid=4242):
+        self.pid = pid
+        self._argv = argv
+        self._exe = exe or argv[0]
+
+    def name(self):
+        return self._argv[0].rsplit('/', 1)[-1]
+
+    def cmdline(self):
+        return list(self._argv)
+
+    def exe(self):
+        return self._exe
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    # Boş procfs: maps / environ okunamaz, sadece statik kurallar çalışır
+    return TrainingClassifier(proc_root=str(tmp_path))
+
+
+@pytest.mark.parametrize('argv', [
+    ['/opt/conda/bin/python', 'train.py'],
+    ['/home/user/miniconda3/envs/llm/bin/python3.11', 'train_lora.py', '--epochs', '3'],
+    ['python', 'train.py', '--report_to', 'tensorboard'],
+    ['python', '-W', 'ignore', 'finetune.py', '--logging_dir', 'runs/tensorboard', '--max_steps', '100'],
+    ['/opt/conda/bin/torchrun', '--nproc_per_node=2', 'main.py', '--pip-cache', '/tmp'],
+])
+def test_training_with_excluded_words_in_arguments(classifier, argv):
+    verdict = classifier.classify(_Process(argv), create_time=1.0)
+    assert verdict.is_training
+    assert verdict.reason in ('cmdline', 'exe')
+
+
+@pytest.mark.parametrize('argv', [
+    ['/opt/conda/bin/python', '/opt/conda/bin/jupyter-lab', '--port', '8888'],
+    ['python', '-m', 'ipykernel_launcher', '-f', '/tmp/kernel.json'],
+    ['/usr/bin/python3', '-mpip', 'install', 'torch'],
+    ['tensorboard', '--logdir', 'runs/train_1'],
+    ['/opt/conda/bin/conda', 'install', 'pytorch'],
+])
+def test_excluded_programs(classifier, argv):
+    verdict = classifier.classify(_Process(argv), create_time=1.0)
+    assert not verdict.is_training
+    assert verdict.reason == 'exclude'
@@ -0,0 +1,36 @@
+"""TimeSeriesStore.integrate testleri"""
+
+import math
+
+import pytest
+
+from services.tsdb import TimeSeriesStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeSeriesStore(str(tmp_path))
+
+
+def test_integrate_matches_hand_computed_window(store):
+    # (zaman, watt); 1011 -> 1020 aralığı max_gap'i (5 s) aşar, 1022 boştur
+    samples = [(1000, 10.0), (1002, 20.0), (1004, 20.0), (1008, 40.0), (1011, 40.0),
+               (1020, 0.0), (1022, math.nan), (1024, 10.0), (1026, 10.0)]
+    for timestamp, watts in samples:
+        store.append(timestamp, {'power.total_w': watts})
+    store.flush()
+
+    starts, integrals, covered = store.integrate('power.total_w', 1000, 1029, 10, 5)
+
+    assert starts == [1000, 1010, 1020]
+    # Kova 0: 15*2 + 20*2 + 30*4 + 40*3 (1008 -> 1011 başladığı kovaya yazılır)
+    # Kova 1: tek aralık boşluk; kova 2: NaN'a komşu aralıklar atlanır, 10*2
+    assert integrals == pytest.approx([310.0, 0.0, 20.0])
+    assert covered == pytest.approx(2 + 2 + 4 + 3 + 2)
+
+
+def test_integrate_unknown_metric_raises(store):
+    store.append(1000, {'power.total_w': 1.0})
+    store.flush()
+    with pytest.raises(KeyError):
+        store.integrate('power.gpu_w', 1000, 1010, 10, 5)